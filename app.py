@@ -8,7 +8,6 @@ dan Ctrl+C ditangani dengan rapi.
 
 import os
 import sys
-import subprocess
 import signal
 import termios
 import tty
@@ -46,6 +45,14 @@ def main():
     os.chdir(PROJECT_PATH)
     args = sys.argv[1:] if len(sys.argv) > 1 else ["--help"]
 
+    # Completion jalan in-process: tanpa terminal lock dan tanpa interpreter kedua
+    if args[0] == "__complete":
+        sys.path.insert(0, str(PROJECT_PATH))
+        from core.completion import complete_main
+        return complete_main(args[1:])
+
+    import subprocess
+
     # Tangani Ctrl+C dengan rapi
     def handle_sigint(sig, frame):
         print(f"{PREFIX_INFO} Dihentikan oleh user (Ctrl+C)")
@@ -8,101 +8,48 @@ Modular application using the helpers package to manage Docker templates.
 from __future__ import annotations
 
 import argparse
+import importlib
 import sys
-from typing import List
-
-# Import semua helpers
-from core import (
-    # YAML operations
-    load_honeypot_yaml_by_filename,
-    find_honeypot_yaml_path,
-    set_honeypot_enabled,
-    is_honeypot_enabled,
-
-    # Docker operations
-    is_honeypot_running,
-    run_compose_action,
-    up_honeypot,
-    down_honeypot,
-    shell_honeypot,
-    cleanup_global_images,
-    cleanup_global_volumes,
-
-    # Configuration handling
-    parse_ports,
-    parse_volumes,
-    parse_env,
-    normalize_host_path,
-    generate_env_file,
-    ensure_volume_directories,
-    rewrite_compose_with_env,
-
-    # Utility functions
-    to_var_prefix,
-    _format_table
-)
-from core.argaparse import build_arg_parser, format_full_help
-
-from scripts import (
-    # List commands
-    list_honeypots,
-    list_enabled_honeypot_ids,
-    list_all_enabled_honeypot_ids,
-    list_imported_honeypot_ids,
-    resolve_honeypot_dir_id,
-
-    # Display commands
-    inspect_honeypot,
-
-    # Import commands
-    import_honeypot,
-
-    # File operations
-    ensure_destination_dir,
-    find_template_dir,
-    copy_template_to_destination,
-    remove_honeypot,
-
-    # Dependency checker
-    require_dependencies,
-
-    # Logs
-    logs_main,
-
-    # Clean
-    clean_main,
-
-    # Up
-    up_main,
-
-    # edit
-    edit_main,
-
-    # web
-    web_main
-)
-
-# Import questionary for interactive prompts
-try:
-    import questionary
-except ImportError:
-    print("Error: questionary library not installed. Run: pip install questionary", file=sys.stderr)
-    sys.exit(1)
-
-from core.utils import PREFIX_OK, PREFIX_ERROR, PREFIX_WARN
-from test import run_import_self_test
-
-# Import konfigurasi ALWAYS_IMPORT
-try:
-    from config import ALWAYS_IMPORT
-except ImportError:
-    ALWAYS_IMPORT = True
+from typing import Callable, Dict, List, Optional
+
+from core.utils import PREFIX_ERROR, PREFIX_WARN
+
+# Subcommand handlers as "module:function". A handler takes the parsed args and
+# returns the exit code; its module is only imported when that command runs, so
+# e.g. `hpone list` never loads questionary, the logs viewer or the self-test.
+COMMANDS: Dict[str, str] = {
+    "check": "scripts.check:check_main",
+    "import": "scripts.import_cmd:import_main",
+    "update": "scripts.import_cmd:update_main",
+    "list": "scripts.list:list_main",
+    "clean": "scripts.clean:clean_main",
+    "inspect": "scripts.inspect:inspect_main",
+    "enable": "scripts.enable:enable_main",
+    "disable": "scripts.enable:disable_main",
+    "up": "scripts.up:up_main",
+    "down": "scripts.down:down_main",
+    "shell": "scripts.shell:shell_main",
+    "logs": "scripts.logs:logs_main",
+    "web": "scripts.web:web_main",
+    "status": "scripts.status:status_main",
+    "edit": "scripts.edit:edit_main",
+    "daemon": "scripts.daemon:daemon_main",
+}
+
+
+def load_command(command: str) -> Optional[Callable[[argparse.Namespace], int]]:
+    """Import and return the handler of a subcommand, or None if unknown."""
+    target = COMMANDS.get(command)
+    if target is None:
+        return None
+    module_name, _, func_name = target.partition(":")
+    return getattr(importlib.import_module(module_name), func_name)
 
 def check_permissions(args):
     """Check Docker and honeypots directory permissions for commands that need them."""
     # Docker commands that require permission checks
     docker_commands = [
-        "up", "down", "status", "shell", "logs", "clean", "inspect", "list"
+        "up", "down", "status", "shell", "logs", "clean", "inspect", "list", "daemon"
     ]
 
     # Commands that need honeypots directory write access
@@ -140,8 +87,53 @@ def check_permissions(args):
         print(f"{PREFIX_WARN} Error checking permissions: {e}. Continuing...", file=sys.stderr)
         return True
 
+def run_in_daemon(args, argv: List[str]) -> Optional[int]:
+    """
+    Let a running `hpone daemon` execute the command and relay its output.
+
+    Returns the exit code, or None when the command is not served by the daemon
+    or no daemon is running (the caller then runs it in-process).
+    """
+    from core.daemon_client import DAEMON_COMMANDS, DaemonError, DaemonUnavailable, daemon_call
+
+    if args.command not in DAEMON_COMMANDS:
+        return None
+    if args.command == "up" and not getattr(args, "all", False):
+        try:
+            from config import ALWAYS_IMPORT
+        except ImportError:
+            ALWAYS_IMPORT = True
+        # Without ALWAYS_IMPORT, `up <id>` may ask interactively whether to import
+        if not ALWAYS_IMPORT:
+            return None
+
+    def relay(stream: str, text: str) -> None:
+        out = sys.stderr if stream == "stderr" else sys.stdout
+        out.write(text)
+        out.flush()
+
+    try:
+        result = daemon_call("command", {"argv": argv}, timeout=None, on_output=relay)
+    except DaemonUnavailable:
+        return None
+    except DaemonError as exc:
+        print(f"{PREFIX_ERROR} Daemon failed to run '{args.command}': {exc}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        # Closing the connection cancels the job in the daemon
+        print(f"\n{PREFIX_WARN} Cancelled '{args.command}'", file=sys.stderr)
+        return 130
+    return int(result.get("code") or 0)
+
 def main(argv: List[str]) -> int:
     """Main entrypoint for the application."""
+    # Shell completion backend: manifest index only, no checks, no Docker
+    if argv[:1] == ["__complete"]:
+        from core.completion import complete_main
+        return complete_main(argv[1:])
+
+    from core.argaparse import build_arg_parser, format_full_help
+
     parser = build_arg_parser()
     # If only -h/--help is requested, print the full help that includes all subcommands
     if any(arg in ("-h", "--help") for arg in argv):
@@ -154,201 +146,36 @@ def main(argv: List[str]) -> int:
 
     args = parser.parse_args(argv)
 
-    # Run permission checks before any command execution
-    if not check_permissions(args):
-        return 1
+    # A running daemon already passed the checks below and has warm caches
+    code = run_in_daemon(args, argv)
+    if code is not None:
+        return code
 
-    # Check dependencies command
-    if args.command == "check":
-        try:
-            # Run import self-tests first
-            if not run_import_self_test():
-                return 1
-            from scripts import print_dependency_status
-            print_dependency_status()
-        except Exception as exc:
-            print(f"{PREFIX_ERROR} Failed to check dependencies: {exc}", file=sys.stderr)
-            return 1
-        return 0
+    # `daemon --status/--stop` only talk to the socket
+    if args.command == "daemon" and (args.status or args.stop):
+        return load_command("daemon")(args)
 
-    # Check dependencies before running other commands (except 'check')
-    try:
-        require_dependencies()
-    except SystemExit:
-        return 1
-    except Exception as exc:
-        print(f"{PREFIX_ERROR} Failed to check dependencies: {exc}", file=sys.stderr)
+    # Run permission checks before any command execution
+    if not check_permissions(args):
         return 1
 
-    # Import command
-    if args.command == "import":
-        if ALWAYS_IMPORT:
-            pass; return 1
-
-        try:
-            if getattr(args, "all", False):
-                # Import all enabled honeypots
-                honeypot_ids = list_all_enabled_honeypot_ids()
-                if not honeypot_ids:
-                    print("No enabled honeypots.")
-                    return 0
-                print(f"Importing {len(honeypot_ids)} enabled honeypots...")
-                for t in honeypot_ids:
-                    try:
-                        dest = import_honeypot(t, force=bool(args.force))
-                        print(f"{PREFIX_OK}: Imported '{t}'")
-                    except Exception as exc:
-                        print(f"{PREFIX_ERROR} Failed to import '{t}': {exc}", file=sys.stderr)
-                        continue
-            else:
-                if not args.honeypot:
-                    print("You must specify a honeypot or use --all", file=sys.stderr)
-                    return 2
-                dest = import_honeypot(args.honeypot, force=bool(args.force))
-                print(f"{PREFIX_OK}: Imported '{args.honeypot}'")
-        except Exception as exc:
-            print(f"{PREFIX_ERROR} Failed to import: {exc}", file=sys.stderr)
-            return 1
-        return 0
-
-    # Update command
-    if args.command == "update":
-        if ALWAYS_IMPORT:
-            pass; return 1
-
-        try:
-            honeypot_ids = list_imported_honeypot_ids()
-            if not honeypot_ids:
-                print("No imported honeypots.")
-                return 0
-            print(f"Updating {len(honeypot_ids)} imported honeypots...")
-            for t in honeypot_ids:
-                try:
-                    dest = import_honeypot(t, force=True)
-                    print(f"{PREFIX_OK}: Updated '{t}'")
-                except Exception as exc:
-                    print(f"{PREFIX_ERROR} Failed to update '{t}': {exc}", file=sys.stderr)
-                    continue
-        except Exception as exc:
-            print(f"{PREFIX_ERROR} Failed to update: {exc}", file=sys.stderr)
-            return 1
-        return 0
-
-    # List command
-    if args.command == "list":
-        try:
-            list_honeypots(detailed=bool(args.a))
-        except Exception as exc:
-            print(f"{PREFIX_ERROR} Failed to list honeypots: {exc}", file=sys.stderr)
-            return 1
-        return 0
-
-    # Clean command
-    if args.command == "clean":
-        return clean_main(args)
-
-    # Inspect command
-    if args.command == "inspect":
-        try:
-            inspect_honeypot(args.honeypot)
-        except Exception as exc:
-            print(f"{PREFIX_ERROR} Failed to inspect '{args.honeypot}': {exc}", file=sys.stderr)
-            return 1
-        return 0
-
-    # Enable command
-    if args.command == "enable":
-        try:
-            # Handle multiple honeypots
-            for honeypot in args.honeypot:
-                set_honeypot_enabled(honeypot, True)
-                print(f"{PREFIX_OK}: Honeypot '{honeypot}' enabled.")
-        except Exception as exc:
-            print(f"{PREFIX_ERROR} Failed to enable honeypots: {exc}", file=sys.stderr)
-            return 1
-        return 0
-
-    # Disable command
-    if args.command == "disable":
-        try:
-            # Handle multiple honeypots
-            for honeypot in args.honeypot:
-                set_honeypot_enabled(honeypot, False)
-                print(f"{PREFIX_OK}: Honeypot '{honeypot}' disabled.")
-        except Exception as exc:
-            print(f"{PREFIX_ERROR} Failed to disable honeypots: {exc}", file=sys.stderr)
-            return 1
-        return 0
-
-    # Up command
-    if args.command == "up":
-        return up_main(args)
-
-    # Down command
-    if args.command == "down":
+    # 'check' runs its own dependency report
+    if args.command != "check":
+        # Check dependencies before running other commands
         try:
-            if getattr(args, "all", False):
-                honeypot_ids = list_imported_honeypot_ids()
-                if not honeypot_ids:
-                    print("No imported honeypots.")
-                for t in honeypot_ids:
-                    down_honeypot(t)
-            else:
-                if not args.honeypot:
-                    print("You must specify a honeypot or use --all", file=sys.stderr)
-                    return 2
-                down_honeypot(args.honeypot)
-        except Exception as exc:
-            print(f"{PREFIX_ERROR} Failed to stop: {exc}", file=sys.stderr)
-            return 1
-        return 0
-
-    # Shell command
-    if args.command == "shell":
-        try:
-            shell_honeypot(args.honeypot)
-        except Exception as exc:
-            print(f"{PREFIX_ERROR} Failed to open shell in '{args.honeypot}': {exc}", file=sys.stderr)
-            return 1
-        return 0
-
-    # Logs command
-    if args.command == "logs":
-        try:
-            logs_main(args.honeypot)
-        except Exception as exc:
-            print(f"{PREFIX_ERROR} Failed to show logs for '{args.honeypot}': {exc}", file=sys.stderr)
-            return 1
-        return 0
-
-    # Web command
-    if args.command == "web":
-        try:
-            return web_main()
-        except Exception as exc:
-            print(f"{PREFIX_ERROR} Failed to start HPone Web: {exc}", file=sys.stderr)
-            return 1
-
-    # Status command
-    if args.command == "status":
-        try:
-            from scripts import show_status
-            show_status()
-        except Exception as exc:
-            print(f"{PREFIX_ERROR} Failed to show status: {exc}", file=sys.stderr)
+            from scripts.check import require_dependencies
+            require_dependencies()
+        except SystemExit:
             return 1
-        return 0
-
-    # Edit command
-    if args.command == "edit":
-        try:
-            return edit_main(args)
         except Exception as exc:
-            print(f"{PREFIX_ERROR} Failed to edit: {exc}", file=sys.stderr)
+            print(f"{PREFIX_ERROR} Failed to check dependencies: {exc}", file=sys.stderr)
             return 1
 
-    parser.print_help()
-    return 2
+    handler = load_command(args.command)
+    if handler is None:
+        parser.print_help()
+        return 2
+    return handler(args)
 
 if __name__ == "__main__":
     sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark the build output filter of the ephemeral log runner.
+
+Feeds a recorded `compose up` build log through core.log_filter's compiled
+BUILD_LOG_FILTER and through the keyword-by-keyword filter it replaced,
+checks that both make the same decision for every line and reports their
+throughput. The bundled sample (bench/data/buildkit.log) is repeated with
+shifted BuildKit step numbers up to --lines, like a long multi-stage build.
+
+Record your own log with:
+    docker compose build --progress=plain 2>&1 | tee build.log
+
+Usage (from the hpone directory):
+    python bench/log_filter.py [-n ROUNDS] [--lines N] [--log FILE]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.log_filter import BUILD_LOG_FILTER
+
+SAMPLE_LOG = Path(__file__).resolve().parent / "data" / "buildkit.log"
+
+_STEP = re.compile(r'^#(\d+) ')
+
+
+def legacy_should_show_line(line: str) -> bool:
+    """The per-keyword filter log_runner used before core.log_filter (reference)."""
+    line_lower = line.lower()
+
+    important_keywords = ['error', 'failed', 'fatal', 'exception', 'warn', 'warning']
+    if any(keyword in line_lower for keyword in important_keywords):
+        return True
+
+    skip_patterns = [
+        '#1 ', '#2 ', '#3 ', '#4 ', '#5 ', '#6 ', '#7 ', '#8 ', '#9 ',
+        '#10 ', '#11 ', '#12 ', '#13 ', '#14 ', '#15 ', '#16 ', '#17 ', '#18 ', '#19 ',
+        '#20 ', '#21 ', '#22 ', '#23 ', '#24 ', '#25 ', '#26 ', '#27 ', '#28 ', '#29 ',
+        'transferring dockerfile:', 'transferring context:', 'done',
+        'resolve docker.io', 'sha256:', 'kb / ', 'mb / ', 'gb / ',
+        'kb/s', 'mb/s', 'gb/s', 'done', 'downloading', 'extracting',
+        'verifying checksum', 'download complete',
+        'pulling fs layer', 'waiting', 'downloading [', 'extracting [', 'digest:', 'status:',
+        'building with', 'load build definition', 'load metadata',
+        'load .dockerignore', 'internal', 'transferring',
+        'get:', 'hit:', 'fetched', 'unpacking', 'setting up',
+        'preparing to unpack', 'processing triggers for',
+        'collecting ', 'installing collected packages',
+        'requirement already satisfied',
+        'warning: running pip as the', 'it is recommended to use a virtual environment',
+        'use the --root-user-action option', 'https://pip.pypa.io/warnings/venv',
+        'added ', 'removed ', 'audited ', 'fetchmetadata', 'sill ', 'timing ',
+        'compiling ', 'finished release', 'go: downloading', 'go: extracting',
+        '(reading database', 'files and directories currently installed',
+    ]
+    for pattern in skip_patterns:
+        if pattern in line_lower:
+            return False
+
+    if re.match(r'^#\d+\s+', line.strip()):
+        return False
+
+    if line.strip().startswith('#') and any(word in line_lower for word in ['done', 'transferring', 'warning']):
+        return False
+
+    if any(unit in line for unit in ['kB', 'MB', 'GB', 'B /', 's done', 's DONE']):
+        return False
+
+    return True
+
+
+def load_lines(path: Path, count: int) -> List[str]:
+    """Non-empty stripped lines of `path`, repeated with shifted step numbers up to `count`."""
+    sample = [line.strip() for line in path.read_text(encoding="utf-8", errors="replace").splitlines()]
+    sample = [line for line in sample if line]
+    if not sample:
+        raise SystemExit(f"{path} has no lines")
+    steps = max((int(m.group(1)) for m in map(_STEP.match, sample) if m), default=0) + 1
+    lines: List[str] = []
+    offset = 0
+    while len(lines) < count:
+        lines.extend(_STEP.sub(lambda m: f"#{int(m.group(1)) + offset} ", line) for line in sample)
+        offset += steps
+    return lines[:count]
+
+
+def _time(func: Callable[[str], bool], lines: List[str], rounds: int) -> float:
+    """Best wall time of `rounds` passes over `lines`, in seconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for line in lines:
+            func(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the build log line filter")
+    parser.add_argument("-n", "--rounds", type=int, default=5, help="Rounds per filter (best is reported)")
+    parser.add_argument("--lines", type=int, default=50000, help="Lines to filter per round")
+    parser.add_argument("--log", type=Path, default=SAMPLE_LOG, help="Recorded build log")
+    args = parser.parse_args()
+
+    lines = load_lines(args.log, args.lines)
+    mismatches = [line for line in lines if BUILD_LOG_FILTER(line) != legacy_should_show_line(line)]
+    shown = sum(1 for line in lines if BUILD_LOG_FILTER(line))
+    print(f"{len(lines)} lines from {args.log.name}, {shown} shown")
+
+    results = {
+        "legacy": _time(legacy_should_show_line, lines, args.rounds),
+        "compiled": _time(BUILD_LOG_FILTER, lines, args.rounds),
+    }
+    for name, seconds in results.items():
+        print(f"  {name:<9} {seconds * 1000:8.1f} ms  {len(lines) / seconds / 1000:8.0f}k lines/s")
+    print(f"  speedup   {results['legacy'] / results['compiled']:8.1f}x")
+
+    if mismatches:
+        print(f"{len(mismatches)} lines filtered differently, e.g.:")
+        for line in mismatches[:5]:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
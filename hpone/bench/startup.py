@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Measure CLI startup import cost per subcommand.
+
+For every command in app.COMMANDS this runs a fresh interpreter with
+`python -X importtime`, imports app and loads the command handler (without
+running it), and sums the self time of every module imported on top of a bare
+interpreter. The result is compared against a per-command budget so import
+regressions (e.g. a top-level import of questionary or the Docker helpers in a
+module `list` needs) fail loudly.
+
+Usage (from the hpone directory):
+    python bench/startup.py [-n ROUNDS] [--budget MS] [COMMAND ...]
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+HPONE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(HPONE_DIR))
+
+# Import budget in milliseconds (modules loaded by app + handler, best of ROUNDS).
+# Sized with headroom for slow CI machines; the point is catching a command that
+# suddenly pulls in the Docker/HTTP stack or questionary, not shaving microseconds.
+DEFAULT_BUDGET_MS = 120.0
+BUDGET_MS: Dict[str, float] = {
+    "check": 50.0,
+    "edit": 50.0,
+    "web": 50.0,
+    "list": 60.0,
+    "enable": 80.0,
+    "disable": 80.0,
+}
+
+
+def _import_times(code: str) -> Tuple[Optional[Dict[str, int]], str]:
+    """Run `code` under -X importtime; return {module: self_us} or None plus the error output."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=str(HPONE_DIR),
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    times: Dict[str, int] = {}
+    other: List[str] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            other.append(line)
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        times[parts[2].strip()] = int(parts[0])
+    if proc.returncode != 0:
+        return None, "\n".join(other).strip() or f"exit code {proc.returncode}"
+    return times, ""
+
+
+def measure(command: str, rounds: int, baseline: Dict[str, int]) -> Tuple[Optional[float], int, str]:
+    """Best import time (ms) of loading `command`, number of extra modules, error text."""
+    code = f"import app; app.load_command({command!r})"
+    best: Optional[float] = None
+    modules = 0
+    for _ in range(rounds):
+        times, error = _import_times(code)
+        if times is None:
+            return None, 0, error
+        extra = {name: us for name, us in times.items() if name not in baseline}
+        total_ms = sum(extra.values()) / 1000
+        if best is None or total_ms < best:
+            best, modules = total_ms, len(extra)
+    return best, modules, ""
+
+
+def main() -> int:
+    from app import COMMANDS
+
+    parser = argparse.ArgumentParser(description="Per-command import time of the HPone CLI")
+    parser.add_argument("commands", nargs="*", help="Commands to measure (default: all)")
+    parser.add_argument("-n", "--rounds", type=int, default=5, help="Runs per command (best is reported)")
+    parser.add_argument("--budget", type=float, help="Override the budget (ms) for every command")
+    args = parser.parse_args()
+
+    commands = args.commands or list(COMMANDS)
+    unknown = [c for c in commands if c not in COMMANDS]
+    if unknown:
+        parser.error(f"unknown command(s): {', '.join(unknown)}")
+
+    baseline, error = _import_times("pass")
+    if baseline is None:
+        print(f"Could not measure a bare interpreter: {error}")
+        return 2
+
+    print(f"{'command':<10} {'modules':>7} {'import ms':>10} {'budget':>8}  result")
+    over_budget = 0
+    for command in commands:
+        budget = args.budget if args.budget is not None else BUDGET_MS.get(command, DEFAULT_BUDGET_MS)
+        total_ms, modules, error = measure(command, args.rounds, baseline)
+        if total_ms is None:
+            reason = error.splitlines()[-1] if error else "failed"
+            print(f"{command:<10} {'-':>7} {'-':>10} {budget:>8.0f}  SKIP ({reason})")
+            continue
+        ok = total_ms <= budget
+        over_budget += not ok
+        print(f"{command:<10} {modules:>7} {total_ms:>10.1f} {budget:>8.0f}  {'ok' if ok else 'OVER BUDGET'}")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
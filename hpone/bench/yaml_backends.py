@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark the YAML backends used by core.yaml_io.
+
+Parses every honeypot manifest and every template docker-compose.yml with the
+pure-Python loader and (when available) the libyaml C loader, dumps them back
+with both dumpers and checks that the dumped text is identical.
+
+Usage (from the hpone directory):
+    python bench/yaml_backends.py [-n ROUNDS]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import yaml  # type: ignore
+
+from core.constants import HONEYPOT_MANIFEST_DIR, TEMPLATE_DOCKER_DIR
+
+
+def _backends() -> Dict[str, Tuple[type, type]]:
+    backends = {"python": (yaml.SafeLoader, yaml.SafeDumper)}
+    if getattr(yaml, "__with_libyaml__", False):
+        backends["libyaml"] = (yaml.CSafeLoader, yaml.CSafeDumper)
+    return backends
+
+
+def _time(func: Callable[[], None], rounds: int) -> float:
+    """Best wall time of `rounds` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare PyYAML backends on HPone files")
+    parser.add_argument("-n", "--rounds", type=int, default=20, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    corpora: Dict[str, List[str]] = {
+        "manifests": [p.read_text(encoding="utf-8") for p in sorted(HONEYPOT_MANIFEST_DIR.glob("*.yml"))],
+        "compose": [p.read_text(encoding="utf-8") for p in sorted(TEMPLATE_DOCKER_DIR.glob("*/docker-compose.yml"))],
+    }
+    backends = _backends()
+    if "libyaml" not in backends:
+        print("libyaml is not available; only the pure-Python backend is measured")
+
+    print(f"{'corpus':<10} {'files':>5} {'backend':<8} {'load ms':>9} {'dump ms':>9}")
+    results: Dict[Tuple[str, str], float] = {}
+    for corpus, texts in corpora.items():
+        reference = [yaml.load(t, Loader=yaml.SafeLoader) for t in texts]
+        dumped: Dict[str, List[str]] = {}
+        for backend, (loader, dumper) in backends.items():
+            load_ms = _time(lambda: [yaml.load(t, Loader=loader) for t in texts], args.rounds)
+            dump_ms = _time(lambda: [yaml.dump(d, Dumper=dumper, default_flow_style=False, sort_keys=False)
+                                     for d in reference], args.rounds)
+            dumped[backend] = [yaml.dump(d, Dumper=dumper, default_flow_style=False, sort_keys=False)
+                               for d in reference]
+            results[(corpus, backend)] = load_ms
+            print(f"{corpus:<10} {len(texts):>5} {backend:<8} {load_ms:>9.2f} {dump_ms:>9.2f}")
+        if "libyaml" in dumped and dumped["libyaml"] != dumped["python"]:
+            print(f"  WARNING: {corpus} dump output differs between backends")
+
+    if "libyaml" in backends:
+        for corpus in corpora:
+            python_ms, c_ms = results[(corpus, "python")], results[(corpus, "libyaml")]
+            if c_ms > 0:
+                print(f"{corpus}: libyaml loads {python_ms / c_ms:.1f}x faster")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -53,19 +53,52 @@ _hpone_find_honeypots_dir() {
 # Helper function to get honeypot list dynamically
 _hpone_get_honeypots_dynamic() {
     if command -v hpone >/dev/null 2>&1; then
-        # Use HPone's list command to get available honeypots
-        hpone list 2>/dev/null | grep -E '^[[:space:]]*[a-zA-Z0-9_-]+[[:space:]]*\|' | awk '{print $1}' | grep -v '^$' || echo ""
+        # Ask HPone's completion backend for all honeypot ids
+        hpone __complete 2 hpone inspect "" 2>/dev/null || echo ""
     fi
 }
 
+# Helper function to run HPone's completion backend (`hpone __complete`)
+# It only reads the cached manifest index: no Docker, no dependency checks.
+# Fails when no HPone launcher is found, so the caller can fall back.
+_hpone_complete_backend() {
+    if command -v hpone >/dev/null 2>&1; then
+        hpone __complete "${COMP_CWORD}" "${COMP_WORDS[@]}" 2>/dev/null
+        return
+    fi
+
+    # Development/manual install: launcher next to this script's project
+    local script_dir=""
+    if [[ -n "${BASH_SOURCE[0]}" ]]; then
+        script_dir="$(cd "$(dirname "${BASH_SOURCE[0]}")" 2>/dev/null && pwd)" || script_dir=""
+    fi
+    if [[ -n "${script_dir}" ]]; then
+        local app_dir="$(dirname "$(dirname "${script_dir}")")"
+        if [[ -f "${app_dir}/app.py" ]] && command -v python3 >/dev/null 2>&1; then
+            python3 "${app_dir}/app.py" __complete "${COMP_CWORD}" "${COMP_WORDS[@]}" 2>/dev/null
+            return
+        fi
+    fi
+    return 1
+}
+
 _hpone_completion() {
     local cur prev opts cmds
     COMPREPLY=()
     cur="${COMP_WORDS[COMP_CWORD]}"
     prev="${COMP_WORDS[COMP_CWORD-1]}"
 
+    # Preferred: candidates per subcommand from HPone itself (running
+    # honeypots for shell/logs, enabled for up, imported for clean, ...)
+    local candidates
+    if candidates="$(_hpone_complete_backend)"; then
+        COMPREPLY=( $(compgen -W "${candidates}" -- "${cur}") )
+        return 0
+    fi
+
+    # Fallback: static lists and directory scanning
     # Available commands (hapus import dan update)
-    cmds="check list status web inspect enable disable up down shell logs clean edit"
+    cmds="check list status web inspect enable disable up down shell logs clean edit daemon"
 
     # If this is the first argument (command)
     if [[ ${COMP_CWORD} -eq 1 ]]; then
@@ -136,6 +169,11 @@ _hpone_completion() {
                 COMPREPLY=( $(compgen -W "-a" -- "${cur}") )
             fi
             ;;
+        "daemon")
+            if [[ ${COMP_CWORD} -eq 2 ]]; then
+                COMPREPLY=( $(compgen -W "--status --stop" -- "${cur}") )
+            fi
+            ;;
         "status"|"check"|"web")
             # These commands don't need additional arguments
             ;;
@@ -187,7 +225,7 @@ _hpone_completion() {
                 fi
             elif [[ ${COMP_CWORD} -eq 3 ]]; then
                 if [[ "${prev}" == "--all" ]]; then
-                    COMPREPLY=( $(compgen -W "--force") )
+                    COMPREPLY=( $(compgen -W "--force --jobs" -- "${cur}") )
                 fi
             fi
             ;;
@@ -210,6 +248,8 @@ _hpone_completion() {
                 else
                     COMPREPLY=( $(compgen -W "--all" -- "${cur}") )
                 fi
+            elif [[ ${COMP_CWORD} -eq 3 ]] && [[ "${prev}" == "--all" ]]; then
+                COMPREPLY=( $(compgen -W "--jobs" -- "${cur}") )
             fi
             ;;
         "clean")
@@ -233,7 +273,7 @@ _hpone_completion() {
                 fi
             elif [[ ${COMP_CWORD} -eq 3 ]]; then
                 if [[ "${prev}" == "--all" ]]; then
-                    COMPREPLY=( $(compgen -W "--data --image --volume" -- "${cur}") )
+                    COMPREPLY=( $(compgen -W "--data --image --volume --jobs" -- "${cur}") )
                 else
                     COMPREPLY=( $(compgen -W "--data --image --volume" -- "${cur}") )
                 fi
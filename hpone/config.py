@@ -5,6 +5,7 @@ HPone Configuration File
 This file contains path configurations that can be modified by users.
 """
 
+import os
 from pathlib import Path
 
 # Project root directory location (folder where this file is located)
@@ -12,6 +13,9 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
 # Behavior configuration
 ALWAYS_IMPORT = True          # True: hide import/remove commands, auto-import on up
+FLEET_MODE = False            # True: up --all runs every enabled honeypot as one compose project
+HARDLINK_TEMPLATES = False    # True: hardlink template files into docker/<id> when reflinks are unavailable
+PREFLIGHT_TTL = 300           # Seconds to trust a successful dependency/Docker permission check (0: always probe)
 
 # Honeypots directory location (contains YAML honeypot files)
 HONEYPOT_MANIFEST_DIR = PROJECT_ROOT / "honeypots"
@@ -21,6 +25,10 @@ TEMPLATE_DOCKER_DIR = PROJECT_ROOT / "template" / "docker"
 OUTPUT_DOCKER_DIR = PROJECT_ROOT / "docker"
 # Data directory location for mount (only deleted when clean --data)
 DATA_DIR = PROJECT_ROOT / "data"
+# Cache directory location (render, manifest and preflight cache, safe to delete)
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "hpone"
+# Unix socket of the resident daemon (`hpone daemon`)
+DAEMON_SOCKET = Path(os.environ.get("XDG_RUNTIME_DIR") or CACHE_DIR) / "hponed.sock"
 
 # Configuration for list command
 LIST_BASIC_MAX_WIDTH = 80      # Max width for basic list
@@ -31,3 +39,7 @@ STATUS_TABLE_MAX_WIDTH = 40    # Max width for status table columns
 
 # Logging configuration
 USE_EPHEMERAL_LOGGING = True  # True: use ephemeral logging for up/down commands, False: use simple output
+EPHEMERAL_LOG_LINES = 10      # Latest output lines kept on screen (and in memory) while a command runs
+EPHEMERAL_LOG_FPS = 15        # Max redraws per second of the live output
+SAVE_BUILD_LOG = False        # True: write the full output of `up` to docker/<id>/.last-build.log
+LOG_SEARCH_MAX_MATCHES = 500  # Matches printed per "Search in file" of `hpone logs` (0: no limit)
@@ -4,77 +4,132 @@ HPone Core Package
 Package ini berisi core functionality untuk HPone Docker template manager.
 """
 
-from .yaml import (
-    load_honeypot_yaml_by_filename,
-    find_honeypot_yaml_path,
-    set_honeypot_enabled,
-    is_honeypot_enabled,
-    get_custom_template_dir
-)
-
-from .docker import (
-    is_honeypot_running,
-    run_compose_action,
-    up_honeypot,
-    down_honeypot,
-    shell_honeypot,
-    cleanup_global_images,
-    cleanup_global_volumes
-)
-
-from .config import (
-    parse_ports,
-    parse_ports_with_description,
-    parse_volumes,
-    parse_env,
-    normalize_host_path,
-    generate_env_file,
-    ensure_volume_directories,
-    rewrite_compose_with_env
-)
-
-from .utils import (
-    to_var_prefix,
-    _format_table
-)
-
-from .log_runner import (
-    run_with_ephemeral_logs,
-    run_docker_compose_action
-)
-
-__all__ = [
+import importlib
+from typing import Any, Dict, List
+
+# Exported name -> submodule that defines it. Submodules are imported on first
+# attribute access (PEP 562) so a command only pays for the modules it uses.
+_EXPORTS: Dict[str, str] = {
     # YAML operations
-    'load_honeypot_yaml_by_filename',
-    'find_honeypot_yaml_path',
-    'set_honeypot_enabled',
-    'is_honeypot_enabled',
-    'get_custom_template_dir',
+    'load_honeypot_yaml_by_filename': 'yaml',
+    'find_honeypot_yaml_path': 'yaml',
+    'set_honeypot_enabled': 'yaml',
+    'is_honeypot_enabled': 'yaml',
+    'get_custom_template_dir': 'yaml',
+    'get_honeypot_dependencies': 'yaml',
 
     # Docker operations
-    'is_honeypot_running',
-    'run_compose_action',
-    'up_honeypot',
-    'down_honeypot',
-    'shell_honeypot',
-    'cleanup_global_images',
-    'cleanup_global_volumes',
+    'is_honeypot_running': 'docker',
+    'run_compose_action': 'docker',
+    'up_honeypot': 'docker',
+    'down_honeypot': 'docker',
+    'wait_for_honeypot_stopped': 'docker',
+    'shell_honeypot': 'docker',
+    'cleanup_global_images': 'docker',
+    'cleanup_global_volumes': 'docker',
+
+    # Manifest registry
+    'ManifestRegistry': 'registry',
+    'get_registry': 'registry',
+
+    # Fleet state
+    'FleetState': 'fleet',
+    'ContainerState': 'fleet',
+
+    # Docker Engine API
+    'DockerClient': 'docker_api',
+    'DockerAPIError': 'docker_api',
+    'get_client': 'docker_api',
+
+    # Live state cache
+    'StateCache': 'state_cache',
+    'start_state_cache': 'state_cache',
+    'get_state_cache': 'state_cache',
+    'current_fleet': 'state_cache',
+
+    # Compose backend
+    'ComposeBackend': 'compose_backend',
+    'get_compose_backend': 'compose_backend',
+
+    # Fleet compose mode
+    'render_fleet_compose': 'compose_fleet',
+    'run_fleet_action': 'compose_fleet',
+    'fleet_services': 'compose_fleet',
+    'fleet_honeypot_ids': 'compose_fleet',
+    'fleet_compose_options': 'compose_fleet',
+    'refresh_fleet_compose': 'compose_fleet',
 
     # Configuration handling
-    'parse_ports',
-    'parse_ports_with_description',
-    'parse_volumes',
-    'parse_env',
-    'normalize_host_path',
-    'generate_env_file',
-    'ensure_volume_directories',
-    'rewrite_compose_with_env',
+    'parse_ports': 'config',
+    'parse_ports_with_description': 'config',
+    'parse_volumes': 'config',
+    'parse_env': 'config',
+    'normalize_host_path': 'config',
+    'generate_env_file': 'config',
+    'ensure_volume_directories': 'config',
+    'rewrite_compose_with_env': 'config',
+    'apply_compose_env': 'config',
+    'render_env_file': 'config',
+
+    # Render cache
+    'render_compose': 'render_cache',
+    'render_compose_file': 'render_cache',
+
+    # Preflight cache
+    'cached_preflight': 'preflight',
+    'store_preflight': 'preflight',
+    'clear_preflight': 'preflight',
+
+    # Daemon client
+    'daemon_call': 'daemon_client',
+    'daemon_running': 'daemon_client',
+    'DaemonUnavailable': 'daemon_client',
+    'DaemonError': 'daemon_client',
+
+    # Cooperative job cancellation
+    'CancelToken': 'jobs',
+    'JobCancelled': 'jobs',
+    'check_cancelled': 'jobs',
+    'run_process': 'jobs',
+
+    # Multiplexed container logs
+    'LogSource': 'log_stream',
+    'stream_logs': 'log_stream',
+
+    # Data file viewer
+    'MappedFile': 'mapped_file',
+    'page_file': 'pager',
+    'SearchQuery': 'file_search',
+    'search_file': 'file_search',
+
+    # Machine-readable output
+    'write_records': 'output',
+
+    # Shell completion
+    'complete': 'completion',
+    'load_completion_table': 'completion',
 
     # Utility functions
-    'to_var_prefix',
-    '_format_table',
+    'to_var_prefix': 'utils',
+    '_format_table': 'utils',
 
     # Log runner functions
-    'run_with_ephemeral_logs',
-    'run_docker_compose_action'
-]
+    'run_with_ephemeral_logs': 'log_runner',
+    'LineFilter': 'log_filter',
+    'get_line_filter': 'log_filter',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,5 +1,15 @@
 import argparse
 
+# Keep in sync with core.output.OUTPUT_FORMATS (not imported here to keep startup cheap)
+OUTPUT_FORMATS = ("table", "json", "ndjson", "csv")
+
+
+def _add_output_argument(parser: argparse.ArgumentParser) -> None:
+	"""Add -o/--output for commands that can print machine-readable records."""
+	parser.add_argument("-o", "--output", choices=OUTPUT_FORMATS, default="table",
+		help="Output format: table (default), json, ndjson or csv (no colors, for scripts)")
+
+
 def build_arg_parser() -> argparse.ArgumentParser:
 	"""Build the argument parser for the application."""
 	parser = argparse.ArgumentParser(
@@ -31,9 +41,11 @@ def build_arg_parser() -> argparse.ArgumentParser:
 	# List command
 	p_list = sub.add_parser("list", help="List honeypots based on YAML files in honeypots/")
 	p_list.add_argument("-a", action="store_true", help="Show full details (description and ports)")
+	_add_output_argument(p_list)
 
 	# Status command (running only)
 	p_status = sub.add_parser("status", help="Show port mappings of running honeypots (HOST -> CONTAINER)")
+	_add_output_argument(p_status)
 
 	# Web command
 	p_web = sub.add_parser("web", help="Run HPone Web (Django UI)")
@@ -41,6 +53,7 @@ def build_arg_parser() -> argparse.ArgumentParser:
 	# Inspect command
 	p_inspect = sub.add_parser("inspect", help="Show detailed configuration information for one honeypot")
 	p_inspect.add_argument("honeypot", help="Honeypot name to inspect")
+	_add_output_argument(p_inspect)
 
 	# Enable command
 	p_enable = sub.add_parser("enable", help="Enable honeypot(s) in honeypots/<honeypot>.yml (set enabled: true)")
@@ -61,20 +74,25 @@ def build_arg_parser() -> argparse.ArgumentParser:
 		p_up.add_argument("--update", action="store_true", help="Update templates before starting")
 
 	p_up.add_argument("--force", action="store_true", help="Force start even if not enabled (single honeypot only)")
+	p_up.add_argument("-j", "--jobs", type=int, default=1, metavar="N", help="With --all, import and start up to N honeypots in parallel")
 
 	# Down command
 	p_down = sub.add_parser("down", help="docker compose down for one honeypot or all imported honeypots")
 	group_down = p_down.add_mutually_exclusive_group(required=True)
 	group_down.add_argument("honeypot", nargs="?", help="Honeypot name. If omitted, use --all")
 	group_down.add_argument("--all", action="store_true", help="Run for all imported honeypots")
+	p_down.add_argument("-j", "--jobs", type=int, default=1, metavar="N", help="With --all, stop up to N honeypots in parallel")
 
 	# Shell command
 	p_shell = sub.add_parser("shell", help="Open shell (bash/sh) in running container")
 	p_shell.add_argument("honeypot", help="Honeypot name to open shell in")
 
 	# Logs command
-	p_logs = sub.add_parser("logs", help="Interactive logs viewer for containers and mounted data")
-	p_logs.add_argument("honeypot", help="Honeypot name to view logs for")
+	p_logs = sub.add_parser("logs", help="Interactive logs viewer for one honeypot, or merged container logs (-f, --all)")
+	p_logs.add_argument("honeypot", nargs="*", help="Honeypot name(s); one name without -f/--all opens the interactive viewer")
+	p_logs.add_argument("--all", action="store_true", help="Show logs of every running honeypot")
+	p_logs.add_argument("-f", "--follow", action="store_true", help="Follow new log lines of all selected honeypots, ordered by timestamp")
+	p_logs.add_argument("-n", "--tail", type=int, default=20, metavar="N", help="Lines of history per container (default: 20)")
 
 	# Clean command
 	p_clean = sub.add_parser("clean", help="Stop (down) then delete directory docker/<honeypot>")
@@ -84,6 +102,7 @@ def build_arg_parser() -> argparse.ArgumentParser:
 	# Extra docker compose down options
 	p_clean.add_argument("--image", action="store_true", help="Also remove images (docker compose down --rmi local)")
 	p_clean.add_argument("--volume", action="store_true", help="Also remove volumes (docker compose down -v)")
+	p_clean.add_argument("-j", "--jobs", type=int, default=1, metavar="N", help="With --all, clean up to N honeypots in parallel")
 
 	# Edit command
 	p_edit = sub.add_parser("edit", help="Open honeypot configuration file in preferred editor")
@@ -92,6 +111,12 @@ def build_arg_parser() -> argparse.ArgumentParser:
 	group_edit.add_argument("--config", action="store_true", help="Edit main configuration file (hpone/config.py)")
 	group_edit.add_argument("--completion", action="store_true", help="Edit bash completion script")
 
+	# Daemon command
+	p_daemon = sub.add_parser("daemon", help="Run the resident HPone daemon (list/status/up/down and web become clients)")
+	group_daemon = p_daemon.add_mutually_exclusive_group()
+	group_daemon.add_argument("--status", action="store_true", help="Show whether the daemon is running")
+	group_daemon.add_argument("--stop", action="store_true", help="Stop the running daemon")
+
 	return parser
 
 
@@ -124,7 +149,7 @@ def format_full_help(parser: argparse.ArgumentParser) -> str:
 	# Urutan tampilan yang diinginkan; sisanya mengikuti urutan asli
 	desired_order = [
 		"check", "import", "update", "list", "status", "web",
-		"inspect", "enable", "disable", "up", "down", "shell", "logs", "clean"
+		"inspect", "enable", "disable", "up", "down", "shell", "logs", "clean", "daemon"
 	]
 	names_in_choice = list(choices.keys())
 	ordered_names = [n for n in desired_order if n in names_in_choice] + [
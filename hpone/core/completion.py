@@ -0,0 +1,201 @@
+"""
+Shell completion backend for HPone.
+
+`hpone __complete <cword> <words...>` prints one candidate per line for the
+word at index `cword` of the command line (bash's COMP_CWORD / COMP_WORDS).
+Subcommands and options come from the argument parser, honeypot ids from the
+manifest registry; completion never imports questionary, never runs the
+dependency checks and never asks Docker.
+
+Both are flattened into a small table persisted to CACHE_DIR/completion.bin
+(marshal-encoded) together with stat stamps of everything it was built from:
+the parser and config sources, every manifest, and the docker/ output
+directory. While those are unchanged a completion only stats them and reads
+the table, without importing argparse, the registry or PyYAML. Running
+honeypots are asked from a running `hpone daemon`; without one the imported
+honeypots are offered instead.
+"""
+
+import marshal
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from .constants import CACHE_DIR, DAEMON_SOCKET, HONEYPOT_MANIFEST_DIR, OUTPUT_DOCKER_DIR
+
+COMPLETION_CACHE_FILE = CACHE_DIR / "completion.bin"
+COMPLETION_CACHE_VERSION = 2
+
+# Which honeypots each subcommand takes as positional argument(s)
+HONEYPOT_CANDIDATES: Dict[str, str] = {
+    "import": "all",
+    "inspect": "all",
+    "edit": "all",
+    "up": "enabled",
+    "enable": "disabled",
+    "disable": "enabled",
+    "down": "running",
+    "shell": "running",
+    "logs": "running",
+    "clean": "imported",
+}
+
+# Subcommands that accept several honeypots (nargs="+")
+MULTI_HONEYPOT_COMMANDS = ("enable", "disable", "logs")
+
+# Sources of the parser (commands/options depend on ALWAYS_IMPORT in config.py)
+_PARSER_SOURCES = (
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "argaparse.py"),
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.py"),
+)
+
+
+def _stamp(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _table_stamp() -> list:
+    """Stat-only fingerprint of the parser sources, the manifests and docker/."""
+    manifests = []
+    try:
+        with os.scandir(HONEYPOT_MANIFEST_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith(".yml"):
+                    st = entry.stat()
+                    manifests.append((entry.name, st.st_mtime_ns, st.st_size))
+    except OSError:
+        pass
+    manifests.sort()
+    return [[_stamp(p) for p in _PARSER_SOURCES], manifests, _stamp(str(OUTPUT_DOCKER_DIR))]
+
+
+def _build_table() -> Dict[str, Any]:
+    import argparse
+    from .argaparse import build_arg_parser
+    from .registry import get_registry
+
+    parser = build_arg_parser()
+    subparsers: Dict[str, argparse.ArgumentParser] = {}
+    for action in parser._actions:
+        if isinstance(action, argparse._SubParsersAction):
+            subparsers = dict(action.choices)
+
+    entries = get_registry().entries()
+    ids = [honeypot_id for honeypot_id, _path, _data in entries]
+    enabled = [honeypot_id for honeypot_id, _path, data in entries
+               if isinstance(data, dict) and data.get("enabled") is True]
+    return {
+        "commands": list(subparsers),
+        "options": {
+            name: [opt for action in sub._actions for opt in action.option_strings if opt not in ("-h", "--help")]
+            for name, sub in subparsers.items()
+        },
+        # Options that consume the next word, with their choices (empty: free value)
+        "values": {
+            name: {opt: [str(c) for c in action.choices or ()]
+                   for action in sub._actions if action.option_strings and action.nargs != 0
+                   for opt in action.option_strings}
+            for name, sub in subparsers.items()
+        },
+        "honeypots": {
+            "all": ids,
+            "enabled": enabled,
+            "disabled": [h for h in ids if h not in enabled],
+            "imported": [h for h in ids if (OUTPUT_DOCKER_DIR / h).is_dir()],
+        },
+    }
+
+
+def load_completion_table() -> Dict[str, Any]:
+    """Return the completion table, rebuilding it when any stamped input changed."""
+    stamp = _table_stamp()
+    try:
+        with open(COMPLETION_CACHE_FILE, "rb") as f:
+            data = marshal.load(f)
+        if data.get("version") == COMPLETION_CACHE_VERSION and data.get("stamp") == stamp:
+            return data["table"]
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        pass
+
+    table = _build_table()
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = COMPLETION_CACHE_FILE.with_name(f"{COMPLETION_CACHE_FILE.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            marshal.dump({"version": COMPLETION_CACHE_VERSION, "stamp": stamp, "table": table}, f)
+        os.replace(tmp_path, COMPLETION_CACHE_FILE)
+    except (OSError, ValueError):
+        # Cache is best-effort (e.g. read-only home)
+        pass
+    return table
+
+
+def _running(imported: List[str]) -> List[str]:
+    if not os.path.exists(DAEMON_SOCKET):
+        return imported
+    from .daemon_client import DaemonError, DaemonUnavailable, daemon_call
+    try:
+        running = {state["honeypot_id"] for state in daemon_call("honeypots", timeout=0.5) if state["running"]}
+    except (DaemonUnavailable, DaemonError):
+        return imported
+    return [honeypot_id for honeypot_id in imported if honeypot_id in running]
+
+
+def complete(cword: int, words: List[str]) -> List[str]:
+    """
+    Completion candidates for words[cword].
+
+    Args:
+        cword: Index of the word being completed (0 is the program name)
+        words: The whole command line, program name first
+    """
+    current = words[cword] if cword < len(words) else ""
+    table = load_completion_table()
+
+    if cword <= 1:
+        return [name for name in table["commands"] if name.startswith(current)]
+
+    command = words[1]
+    if command not in table["options"]:
+        return []
+
+    before = words[2:cword]
+    values = table["values"][command]
+    if before and before[-1] in values:
+        return [choice for choice in values[before[-1]] if choice.startswith(current)]
+
+    kind = HONEYPOT_CANDIDATES.get(command)
+    if current.startswith("-") or kind is None:
+        return [opt for opt in table["options"][command] if opt.startswith(current) and opt not in before]
+
+    positionals = [w for i, w in enumerate(before)
+                   if not w.startswith("-") and not (i and before[i - 1] in values)]
+    # --all already names every honeypot (up/down/clean/... --all)
+    if "--all" in before or (positionals and command not in MULTI_HONEYPOT_COMMANDS):
+        return []
+    if kind == "running":
+        candidates = _running(table["honeypots"]["imported"])
+    else:
+        candidates = table["honeypots"][kind]
+    return [h for h in candidates if h.startswith(current) and h not in positionals]
+
+
+def complete_main(argv: List[str]) -> int:
+    """Entry point of `hpone __complete <cword> <words...>`."""
+    try:
+        cword = int(argv[0])
+    except (IndexError, ValueError):
+        print("usage: hpone __complete <cword> <words...>", file=sys.stderr)
+        return 2
+    try:
+        candidates = complete(cword, argv[1:])
+    except Exception:
+        # Completion must never spill tracebacks into the user's prompt
+        return 1
+    if candidates:
+        sys.stdout.write("\n".join(candidates) + "\n")
+    return 0
@@ -0,0 +1,162 @@
+"""
+Compose backend for HPone.
+
+Picks the Docker Compose CLI once per process: the v2 plugin (`docker
+compose`) or standalone v1 (`docker-compose`). The choice is remembered in the
+preflight cache, so later invocations don't probe either. Call sites use the
+typed methods (`up`, `down`, `ps`, `exec`, `logs`; `run` for other actions)
+instead of trying v2 and retrying v1 on every failure, and a non-zero exit is
+reported as the real error it is.
+
+Container state queries that don't need compose (running checks, logs of a
+single container, events) already go through the Engine API socket, see
+core.docker_api.
+"""
+
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from .jobs import run_process
+from .preflight import cached_preflight, store_preflight
+
+_BACKEND_COMMANDS = {
+    "v2": ["docker", "compose"],
+    "v1": ["docker-compose"],
+}
+
+
+class ComposeBackend:
+    """One Docker Compose CLI flavour and the compose actions HPone runs with it."""
+
+    def __init__(self, version: str):
+        if version not in _BACKEND_COMMANDS:
+            raise ValueError(f"Unknown compose backend: {version}")
+        self.version = version
+        self.base = list(_BACKEND_COMMANDS[version])
+
+    def __repr__(self) -> str:
+        return f"ComposeBackend({self.version!r})"
+
+    @property
+    def display_name(self) -> str:
+        return " ".join(self.base)
+
+    def command(self, action: str, *args: str, options: Sequence[str] = ()) -> List[str]:
+        """Full argv: compose binary, global `options` (-p/-f/--env-file), action, args."""
+        return self.base + list(options) + [action] + list(args)
+
+    def run(self, action: str, cwd: Path, args: Sequence[str] = (), options: Sequence[str] = (),
+            label: Optional[str] = None, display=None) -> None:
+        """
+        Run a compose action with HPone's output handling (`up` is always detached).
+
+        Args:
+            action: Docker compose action (up, down, rm, ...)
+            cwd: Working directory (the honeypot or fleet directory)
+            args: Arguments after the action
+            options: Global compose options before the action
+            label: Name shown in the log display (default: the directory name)
+            display: Shared multi-slot display for parallel runs
+
+        Raises:
+            subprocess.CalledProcessError: When the action fails
+        """
+        cmd = self.command(action, *((["-d"] if action == "up" else []) + list(args)), options=options)
+
+        try:
+            from config import USE_EPHEMERAL_LOGGING
+        except ImportError:
+            USE_EPHEMERAL_LOGGING = True
+
+        if USE_EPHEMERAL_LOGGING:
+            from .log_runner import run_with_ephemeral_logs
+            success, _duration = run_with_ephemeral_logs(cmd, label or Path(cwd).name, cwd=cwd,
+                                                         action=action, display=display)
+            if not success:
+                raise subprocess.CalledProcessError(1, f"{self.display_name} {action}")
+            return
+
+        run_process(cmd, cwd=str(cwd), check=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+    def up(self, cwd: Path, args: Sequence[str] = (), **kwargs) -> None:
+        """`up -d` the project in `cwd` (keyword arguments as for run)."""
+        self.run("up", cwd, args, **kwargs)
+
+    def down(self, cwd: Path, args: Sequence[str] = (), **kwargs) -> None:
+        """`down` the project in `cwd` (keyword arguments as for run)."""
+        self.run("down", cwd, args, **kwargs)
+
+    def ps(self, cwd: Path, running_only: bool = True) -> List[str]:
+        """
+        Return the services of the project in `cwd` (only running ones by default).
+
+        Raises:
+            subprocess.CalledProcessError: When compose itself fails
+        """
+        args = ["--services"]
+        if running_only:
+            # v2 spells the filter --status, v1 only knows --filter
+            args += ["--status", "running"] if self.version == "v2" else ["--filter", "status=running"]
+        result = run_process(self.command("ps", *args), cwd=str(cwd), capture_output=True, text=True, check=True)
+        return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+
+    def exec(self, cwd: Path, service: str, command: Sequence[str]) -> None:
+        """Run an interactive command in a service container (raises CalledProcessError on failure)."""
+        subprocess.run(self.command("exec", service, *command), cwd=str(cwd), check=True)
+
+    def logs(self, cwd: Path, services: Sequence[str] = (), follow: bool = False, tail: Optional[int] = None,
+             options: Sequence[str] = ()) -> int:
+        """Stream compose logs to the terminal; returns the exit code."""
+        args: List[str] = []
+        if follow:
+            args.append("-f")
+        if tail is not None:
+            args += ["--tail", str(tail)]
+        return subprocess.call(self.command("logs", *args, *services, options=options), cwd=str(cwd))
+
+
+def detect_compose_backend() -> Optional[str]:
+    """Probe for `docker compose` (v2), then `docker-compose` (v1). Returns the version or None."""
+    if shutil.which("docker"):
+        try:
+            result = subprocess.run(["docker", "compose", "version"], capture_output=True, text=True, timeout=5)
+            if result.returncode == 0:
+                return "v2"
+        except (subprocess.TimeoutExpired, OSError):
+            pass
+    if shutil.which("docker-compose"):
+        try:
+            result = subprocess.run(["docker-compose", "--version"], capture_output=True, text=True, timeout=5)
+            if result.returncode == 0:
+                return "v1"
+        except (subprocess.TimeoutExpired, OSError):
+            pass
+    return None
+
+
+_BACKEND: Optional[ComposeBackend] = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def get_compose_backend() -> ComposeBackend:
+    """
+    Return the compose backend of this host, detected once per process and
+    remembered in the preflight cache.
+
+    Raises:
+        FileNotFoundError: When neither docker compose v2 nor docker-compose v1 is available
+    """
+    global _BACKEND
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            version = cached_preflight("compose_backend")
+            if version not in _BACKEND_COMMANDS:
+                version = detect_compose_backend()
+                if version is None:
+                    raise FileNotFoundError("Docker Compose not found: install the docker compose plugin or docker-compose")
+                store_preflight("compose_backend", version)
+            _BACKEND = ComposeBackend(version)
+        return _BACKEND
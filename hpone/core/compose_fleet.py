@@ -0,0 +1,332 @@
+"""
+Fleet compose mode for HPone.
+
+Merge the per-honeypot compose files under docker/<id>/ into a single
+compose project so `up --all` costs one `docker compose up -d` instead of one
+per honeypot. Services, networks and named volumes are namespaced with the
+honeypot ID; services keep their original name as a network alias so the
+templates still resolve each other by name.
+
+The merged file lives at docker/docker-compose.fleet.yml (a file, so it is
+never mistaken for an imported honeypot) and only exists while the fleet
+project may be running.
+"""
+
+import posixpath
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from . import yaml_io
+
+from .constants import OUTPUT_DOCKER_DIR
+from .fleet import HONEYPOT_ID_LABEL
+
+FLEET_PROJECT_NAME = "hpone"
+FLEET_COMPOSE_FILE = OUTPUT_DOCKER_DIR / "docker-compose.fleet.yml"
+FLEET_ENV_FILE = OUTPUT_DOCKER_DIR / ".fleet.env"
+
+# Serializes writers of the fleet files (parallel `up` of fleet members)
+_FLEET_LOCK = threading.Lock()
+
+
+def _rebase_path(value: Any, honeypot_id: str) -> Any:
+    """Make a path relative to docker/<id>/ relative to docker/ instead."""
+    if not isinstance(value, str):
+        return value
+    if value == "." or value.startswith("./") or value.startswith("../"):
+        return "./" + posixpath.normpath(posixpath.join(honeypot_id, value))
+    return value
+
+
+def _rebase_volume(entry: Any, honeypot_id: str, volume_names: Dict[str, str]) -> Any:
+    if isinstance(entry, str):
+        source, sep, rest = entry.partition(":")
+        if not sep:
+            return entry  # anonymous volume
+        if source in volume_names:
+            return f"{volume_names[source]}:{rest}"
+        return f"{_rebase_path(source, honeypot_id)}:{rest}"
+    if isinstance(entry, dict) and "source" in entry:
+        entry = dict(entry)
+        source = entry["source"]
+        if entry.get("type", "volume") == "volume" and source in volume_names:
+            entry["source"] = volume_names[source]
+        else:
+            entry["source"] = _rebase_path(source, honeypot_id)
+    return entry
+
+
+def namespace_compose(honeypot_id: str, compose_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return the services, networks and volumes of one honeypot compose file
+    renamed into the fleet namespace (`<id>-<service>`, `<id>_<network>`).
+    """
+    services = compose_data.get("services") or {}
+    networks = compose_data.get("networks") or {}
+    volumes = compose_data.get("volumes") or {}
+
+    service_names = {name: f"{honeypot_id}-{name}" for name in services}
+    network_names = {name: f"{honeypot_id}_{name}" for name in networks}
+    volume_names = {name: f"{honeypot_id}_{name}" for name in volumes}
+    default_network = f"{honeypot_id}_default"
+
+    result: Dict[str, Any] = {
+        "services": {},
+        "networks": {network_names[n]: (cfg or {}) for n, cfg in networks.items()},
+        "volumes": {volume_names[v]: (cfg or {}) for v, cfg in volumes.items()},
+    }
+
+    for name, svc in services.items():
+        if not isinstance(svc, dict):
+            continue
+        svc = dict(svc)
+
+        build = svc.get("build")
+        if isinstance(build, str):
+            svc["build"] = _rebase_path(build, honeypot_id)
+        elif isinstance(build, dict) and "context" in build:
+            svc["build"] = dict(build, context=_rebase_path(build["context"], honeypot_id))
+
+        env_file = svc.get("env_file")
+        if isinstance(env_file, str):
+            svc["env_file"] = _rebase_path(env_file, honeypot_id)
+        elif isinstance(env_file, list):
+            svc["env_file"] = [_rebase_path(e, honeypot_id) for e in env_file]
+
+        if isinstance(svc.get("volumes"), list):
+            svc["volumes"] = [_rebase_volume(v, honeypot_id, volume_names) for v in svc["volumes"]]
+
+        depends_on = svc.get("depends_on")
+        if isinstance(depends_on, list):
+            svc["depends_on"] = [service_names.get(d, d) for d in depends_on]
+        elif isinstance(depends_on, dict):
+            svc["depends_on"] = {service_names.get(d, d): cfg for d, cfg in depends_on.items()}
+
+        if isinstance(svc.get("links"), list):
+            links = []
+            for link in svc["links"]:
+                target, _, alias = str(link).partition(":")
+                links.append(f"{service_names.get(target, target)}:{alias or target}")
+            svc["links"] = links
+
+        network_mode = svc.get("network_mode")
+        if isinstance(network_mode, str) and network_mode.startswith("service:"):
+            target = network_mode[len("service:"):]
+            svc["network_mode"] = f"service:{service_names.get(target, target)}"
+        elif not network_mode:
+            # Keep the original service name resolvable on every network it joins
+            svc_networks = svc.get("networks")
+            if isinstance(svc_networks, list):
+                svc_networks = {n: None for n in svc_networks}
+            elif not isinstance(svc_networks, dict) or not svc_networks:
+                svc_networks = {"default": None}
+            renamed: Dict[str, Any] = {}
+            for net, cfg in svc_networks.items():
+                if net == "default":
+                    result["networks"].setdefault(default_network, {})
+                cfg = dict(cfg or {})
+                aliases = list(cfg.get("aliases") or [])
+                if name not in aliases:
+                    aliases.append(name)
+                cfg["aliases"] = aliases
+                renamed[default_network if net == "default" else network_names.get(net, net)] = cfg
+            svc["networks"] = renamed
+
+        labels = svc.get("labels")
+        labels = dict(labels) if isinstance(labels, dict) else {}
+        labels.setdefault(HONEYPOT_ID_LABEL, honeypot_id)
+        svc["labels"] = labels
+
+        result["services"][service_names[name]] = svc
+
+    return result
+
+
+def _add_cross_dependencies(services: Dict[str, Any], owners: Dict[str, List[str]],
+                            graph: Dict[str, Set[str]]) -> None:
+    """Make every service of a honeypot depend on the services of its `depends_on` honeypots."""
+    for honeypot_id, deps in graph.items():
+        required = [svc for dep in sorted(deps) for svc in owners.get(dep, [])]
+        if not required:
+            continue
+        for svc_name in owners.get(honeypot_id, []):
+            svc = services[svc_name]
+            current = svc.get("depends_on")
+            if isinstance(current, dict):
+                for dep_svc in required:
+                    current.setdefault(dep_svc, {"condition": "service_started"})
+            else:
+                current = list(current or [])
+                current.extend(d for d in required if d not in current)
+                svc["depends_on"] = current
+
+
+def render_fleet_compose(honeypot_ids: List[str], graph: Optional[Dict[str, Set[str]]] = None) -> Path:
+    """
+    Merge docker/<id>/docker-compose.yml and docker/<id>/.env of the given
+    (already imported) honeypots into the fleet compose and env files.
+
+    Args:
+        honeypot_ids: Imported honeypots to include
+        graph: Optional honeypot dependency graph, turned into service depends_on
+
+    Returns:
+        Path of the merged compose file
+    """
+    merged: Dict[str, Any] = {"services": {}, "networks": {}, "volumes": {}}
+    owners: Dict[str, List[str]] = {}
+    env_lines: List[str] = ["# Auto-generated by HPone fleet mode"]
+
+    for honeypot_id in honeypot_ids:
+        dest_dir = OUTPUT_DOCKER_DIR / honeypot_id
+        compose_path = dest_dir / "docker-compose.yml"
+        if not compose_path.exists():
+            raise FileNotFoundError(f"docker-compose.yml not found in {dest_dir}")
+        with compose_path.open("r", encoding="utf-8") as f:
+            compose_data = yaml_io.safe_load(f) or {}
+        if not isinstance(compose_data, dict):
+            continue
+
+        part = namespace_compose(honeypot_id, compose_data)
+        owners[honeypot_id] = list(part["services"])
+        for key in ("services", "networks", "volumes"):
+            merged[key].update(part[key])
+
+        # Variables are already namespaced by the honeypot prefix (see generate_env_file)
+        env_path = dest_dir / ".env"
+        if env_path.exists():
+            env_lines.append(f"# {honeypot_id}")
+            for line in env_path.read_text(encoding="utf-8").splitlines():
+                if line.strip() and not line.lstrip().startswith("#"):
+                    env_lines.append(line)
+
+    if graph:
+        _add_cross_dependencies(merged["services"], owners, graph)
+
+    for key in ("networks", "volumes"):
+        if not merged[key]:
+            del merged[key]
+
+    with _FLEET_LOCK:
+        OUTPUT_DOCKER_DIR.mkdir(parents=True, exist_ok=True)
+        FLEET_ENV_FILE.write_text("\n".join(env_lines) + "\n", encoding="utf-8")
+        with FLEET_COMPOSE_FILE.open("w", encoding="utf-8") as f:
+            yaml_io.safe_dump(merged, f)
+    return FLEET_COMPOSE_FILE
+
+
+def remove_fleet_compose() -> None:
+    """Delete the merged files once the fleet project is down."""
+    for path in (FLEET_COMPOSE_FILE, FLEET_ENV_FILE):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _read_fleet_compose() -> Dict[str, Any]:
+    """Parsed fleet compose file, or {} when there is none (or it is unreadable)."""
+    if not FLEET_COMPOSE_FILE.exists():
+        return {}
+    try:
+        with FLEET_COMPOSE_FILE.open("r", encoding="utf-8") as f:
+            data = yaml_io.safe_load(f) or {}
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _owners_of(data: Dict[str, Any]) -> Dict[str, List[str]]:
+    owners: Dict[str, List[str]] = {}
+    for name, svc in (data.get("services") or {}).items():
+        if isinstance(svc, dict):
+            honeypot_id = (svc.get("labels") or {}).get(HONEYPOT_ID_LABEL)
+            if honeypot_id:
+                owners.setdefault(honeypot_id, []).append(name)
+    return owners
+
+
+def _fleet_owners() -> Dict[str, List[str]]:
+    """Map honeypot ID to its services in the current fleet compose file."""
+    return _owners_of(_read_fleet_compose())
+
+
+def _graph_of(data: Dict[str, Any], owners: Dict[str, List[str]]) -> Dict[str, Set[str]]:
+    """Recover the honeypot dependency graph from the cross-honeypot service depends_on."""
+    service_owner = {svc: honeypot_id for honeypot_id, svcs in owners.items() for svc in svcs}
+    services = data.get("services") or {}
+    graph: Dict[str, Set[str]] = {honeypot_id: set() for honeypot_id in owners}
+    for honeypot_id, svcs in owners.items():
+        for svc_name in svcs:
+            depends_on = services[svc_name].get("depends_on") or []
+            for dep_svc in depends_on:
+                owner = service_owner.get(dep_svc)
+                if owner is not None and owner != honeypot_id:
+                    graph[honeypot_id].add(owner)
+    return graph
+
+
+def refresh_fleet_compose() -> Optional[Path]:
+    """
+    Re-render the fleet files from the current docker/<id>/ of their members.
+
+    Called when a member is started on its own (it may have been re-imported
+    since the fleet was rendered) or removed. Members whose docker/<id>/ is
+    gone are dropped, the dependencies between the remaining ones are kept,
+    and the files are deleted once no member is left.
+
+    Returns:
+        Path of the fleet compose file, or None when there is no fleet (anymore)
+    """
+    data = _read_fleet_compose()
+    owners = _owners_of(data)
+    if not owners:
+        return None
+    members = [h for h in owners if (OUTPUT_DOCKER_DIR / h / "docker-compose.yml").exists()]
+    if not members:
+        remove_fleet_compose()
+        return None
+    return render_fleet_compose(members, _graph_of(data, owners))
+
+
+def fleet_honeypot_ids() -> List[str]:
+    """Return the honeypots that are part of the fleet project (empty when fleet mode is not in use)."""
+    return sorted(_fleet_owners())
+
+
+def fleet_services(honeypot_id: str) -> List[str]:
+    """Return the fleet services of a honeypot, or [] when it is not part of the fleet."""
+    return _fleet_owners().get(honeypot_id, [])
+
+
+def fleet_compose_options() -> List[str]:
+    """Global compose options (-p/-f/--env-file) addressing the fleet project."""
+    return ["-p", FLEET_PROJECT_NAME, "-f", str(FLEET_COMPOSE_FILE), "--env-file", str(FLEET_ENV_FILE)]
+
+
+def run_fleet_action(action: str, extra_args: Optional[List[str]] = None, services: Optional[List[str]] = None,
+                     label: str = "fleet", display=None) -> None:
+    """
+    Run a docker compose action against the fleet project.
+
+    Args:
+        action: Docker compose action (up, down, rm, ...)
+        extra_args: Additional arguments for the action
+        services: Limit the action to these fleet services
+        label: Name shown in the log display
+        display: Shared multi-slot display for parallel runs
+    """
+    if not FLEET_COMPOSE_FILE.exists():
+        raise FileNotFoundError(f"Fleet compose file not found: {FLEET_COMPOSE_FILE}")
+
+    from .compose_backend import get_compose_backend
+    backend = get_compose_backend()
+    args = list(extra_args or []) + list(services or [])
+    kwargs = {"options": fleet_compose_options(), "label": label, "display": display}
+    if action == "up":
+        backend.up(OUTPUT_DOCKER_DIR, args, **kwargs)
+    elif action == "down":
+        backend.down(OUTPUT_DOCKER_DIR, args, **kwargs)
+    else:
+        backend.run(action, OUTPUT_DOCKER_DIR, args, **kwargs)
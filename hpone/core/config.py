@@ -9,10 +9,7 @@ import re
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 
-try:
-    import yaml  # type: ignore
-except ImportError:
-    raise ImportError("PyYAML is required for this module")
+from . import yaml_io
 
 # Import constants dan functions dari helpers
 from .constants import PROJECT_ROOT
@@ -122,6 +119,12 @@ def normalize_host_path(path_str: str) -> str:
 
 def generate_env_file(dest_dir: Path, honeypot_name: str, config: Dict[str, Any]) -> None:
     """Create a `.env` file in the destination directory based on YAML config."""
+    env_path = dest_dir / ".env"
+    env_path.write_text(render_env_file(honeypot_name, config), encoding="utf-8")
+
+
+def render_env_file(honeypot_name: str, config: Dict[str, Any]) -> str:
+    """Return the `.env` content for a honeypot based on YAML config."""
     prefix = to_var_prefix(honeypot_name)
 
     lines: List[str] = []
@@ -156,9 +159,7 @@ def generate_env_file(dest_dir: Path, honeypot_name: str, config: Dict[str, Any]
             key_name = re.sub(r"[^A-Z0-9]+", "_", str(k).upper()).strip("_")
             lines.append(f"{prefix}_{key_name}={v}")
 
-    content = "\n".join(lines) + "\n"
-    env_path = dest_dir / ".env"
-    env_path.write_text(content, encoding="utf-8")
+    return "\n".join(lines) + "\n"
 
 
 def ensure_volume_directories(config: Dict[str, Any]) -> None:
@@ -191,14 +192,27 @@ def rewrite_compose_with_env(dest_dir: Path, honeypot_id: str, honeypot_name: st
         return
 
     with compose_path.open("r", encoding="utf-8") as f:
-        compose_data = yaml.safe_load(f) or {}
+        compose_data = yaml_io.safe_load(f) or {}
 
-    if not isinstance(compose_data, dict):
+    if not apply_compose_env(compose_data, honeypot_id, honeypot_name, config):
         return
 
+    # Simpan kembali compose
+    with compose_path.open("w", encoding="utf-8") as f:
+        yaml_io.safe_dump(compose_data, f)
+
+
+def apply_compose_env(compose_data: Any, honeypot_id: str, honeypot_name: str, config: Dict[str, Any]) -> bool:
+    """
+    Apply the `rewrite_compose_with_env` changes to parsed compose data in place.
+    Returns False (data untouched) when it has no services to rewrite.
+    """
+    if not isinstance(compose_data, dict):
+        return False
+
     services = compose_data.get("services")
     if not isinstance(services, dict) or not services:
-        return
+        return False
 
     prefix = to_var_prefix(honeypot_name)
 
@@ -269,7 +283,8 @@ def rewrite_compose_with_env(dest_dir: Path, honeypot_id: str, honeypot_name: st
 
         # Add HPone identification labels
         labels.update({
-            "hpone": "true"
+            "hpone": "true",
+            "hpone.honeypot": honeypot_id
         })
         svc["labels"] = labels
 
@@ -317,11 +332,4 @@ def rewrite_compose_with_env(dest_dir: Path, honeypot_id: str, honeypot_name: st
             if net_config is None:
                 networks[net_name] = {}
 
-    # Simpan kembali compose
-    with compose_path.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(
-            compose_data,
-            f,
-            default_flow_style=False,
-            sort_keys=False,
-        )
+    return True
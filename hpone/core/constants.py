@@ -6,6 +6,7 @@ Sekarang menggunakan konfigurasi dari config.py yang bisa diubah user.
 """
 
 from pathlib import Path
+import os
 import sys
 
 # Tentukan PROJECT_ROOT dengan cara yang lebih robust
@@ -47,3 +48,14 @@ except ImportError:
     TEMPLATE_DOCKER_DIR = PROJECT_ROOT / "template" / "docker"
     OUTPUT_DOCKER_DIR = PROJECT_ROOT / "docker"
     DATA_DIR = PROJECT_ROOT / "data"
+
+# CACHE_DIR is newer than the other paths; older config.py files may not have it
+try:
+    from config import CACHE_DIR
+except ImportError:
+    CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "hpone"
+
+try:
+    from config import DAEMON_SOCKET
+except ImportError:
+    DAEMON_SOCKET = Path(os.environ.get("XDG_RUNTIME_DIR") or CACHE_DIR) / "hponed.sock"
@@ -0,0 +1,108 @@
+"""
+Client side of the HPone daemon API.
+
+`hpone daemon` serves newline-delimited JSON-RPC 2.0 on a unix socket
+(DAEMON_SOCKET). This module only needs the standard library socket and json
+modules, so a CLI command that is answered by the daemon never imports the
+Docker, YAML or state modules. When the socket is missing or nobody listens,
+DaemonUnavailable is raised and callers run the in-process code instead.
+"""
+
+import json
+import os
+import socket
+from itertools import count
+from typing import Any, Callable, Dict, Optional
+
+from .constants import DAEMON_SOCKET
+
+# CLI commands a running daemon answers (output is captured and relayed)
+DAEMON_COMMANDS = ("list", "status", "up", "down")
+
+_REQUEST_IDS = count(1)
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening on DAEMON_SOCKET."""
+
+
+class DaemonError(Exception):
+    """The daemon answered the call with an error."""
+
+    def __init__(self, message: str, error_type: str = ""):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+def daemon_running() -> bool:
+    """Cheap check: is a daemon answering on the socket?"""
+    try:
+        daemon_call("ping", timeout=0.5)
+        return True
+    except (DaemonUnavailable, DaemonError):
+        return False
+
+
+def daemon_call(method: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = 10.0,
+                on_output: Optional[Callable[[str, str], None]] = None) -> Any:
+    """
+    Call one daemon method and return its result.
+
+    Methods that produce output (`command`) send it ahead of the result as
+    `output` notifications ({"stream": "stdout"|"stderr", "data": ...}).
+    Closing the connection early (e.g. Ctrl+C in the client) cancels the job.
+
+    Args:
+        method: API method name (ping, honeypots, command, up, down, ...)
+        params: Keyword parameters of the method
+        timeout: Seconds to wait for the answer (None waits forever, e.g. for `up`)
+        on_output: Called with (stream, text) for every output notification
+
+    Raises:
+        DaemonUnavailable: When no daemon is listening
+        DaemonError: When the method failed in the daemon
+    """
+    socket_path = str(DAEMON_SOCKET)
+    if not os.path.exists(socket_path):
+        raise DaemonUnavailable(f"No daemon socket at {socket_path}")
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(min(timeout, 1.0) if timeout else 1.0)
+        try:
+            sock.connect(socket_path)
+        except OSError as exc:
+            # Stale socket file or daemon not accepting connections
+            raise DaemonUnavailable(f"Daemon not reachable at {socket_path}: {exc}") from exc
+        sock.settimeout(timeout)
+
+        request = {"jsonrpc": "2.0", "id": next(_REQUEST_IDS), "method": method, "params": params or {}}
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+        relayed = False
+        with sock.makefile("rb") as reader:
+            while True:
+                line = reader.readline()
+                if not line:
+                    if relayed:
+                        # The job already ran partly; running it again in-process would repeat it
+                        raise DaemonError("Daemon closed the connection", "ConnectionError")
+                    raise DaemonUnavailable("Daemon closed the connection")
+                response = json.loads(line)
+                if "id" in response:
+                    break
+                # Notification sent while the method runs
+                if response.get("method") == "output" and on_output is not None:
+                    relayed = True
+                    params_out = response.get("params") or {}
+                    on_output(str(params_out.get("stream") or "stdout"), str(params_out.get("data") or ""))
+    except socket.timeout as exc:
+        raise DaemonError(f"Daemon did not answer '{method}' within {timeout}s", "TimeoutError") from exc
+    finally:
+        sock.close()
+
+    error = response.get("error")
+    if error:
+        data = error.get("data") or {}
+        raise DaemonError(str(error.get("message") or "daemon error"), str(data.get("type") or ""))
+    return response.get("result")
@@ -5,16 +5,25 @@ Functions to start and stop Docker containers.
 """
 
 import subprocess
+import time
 from pathlib import Path
 from typing import List, Optional
 
 # Import constants dan functions dari helpers
 from .constants import OUTPUT_DOCKER_DIR
+from .fleet import FleetState
+from .docker_api import get_client, API_ERRORS
+from .compose_backend import get_compose_backend
 from .utils import PREFIX_OK, PREFIX_WARN, COLOR_YELLOW, COLOR_RESET
 # Import di dalam function untuk avoid circular import
 
-def is_honeypot_running(honeypot_id: str) -> bool:
-    """Check if honeypot is running by checking Docker container status."""
+def is_honeypot_running(honeypot_id: str, fleet: Optional[FleetState] = None) -> bool:
+    """
+    Check if honeypot is running by checking Docker container status.
+
+    When a FleetState snapshot is given, answer from it instead of running
+    `docker compose ps` for this honeypot.
+    """
     try:
         # Import di dalam function untuk avoid circular import
         from scripts.list import resolve_honeypot_dir_id
@@ -23,28 +32,23 @@ def is_honeypot_running(honeypot_id: str) -> bool:
         if not dest_dir.exists():
             return False
 
-        # Check if any containers for this honeypot are running
-        cmd = ["docker", "compose", "ps", "--format", "json"]
-        try:
-            result = subprocess.run(cmd, cwd=str(dest_dir), capture_output=True, text=True, check=True)
-            # If output is not empty and contains running containers
-            if result.stdout.strip():
-                return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            # Fallback to docker-compose v1
-            try:
-                cmd_legacy = ["docker-compose", "ps", "--format", "json"]
-                result = subprocess.run(cmd_legacy, cwd=str(dest_dir), capture_output=True, text=True, check=True)
-                if result.stdout.strip():
-                    return True
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                pass
-
-        return False
+        # Prefer the live event cache, then the Engine API socket, over forking `docker compose ps`
+        if fleet is None:
+            from .state_cache import get_state_cache
+            cache = get_state_cache()
+            if cache is not None:
+                return cache.is_running(dir_id)
+        if fleet is None and get_client() is not None:
+            fleet = FleetState.snapshot()
+        if fleet is not None and fleet.available:
+            return fleet.is_running(dir_id)
+
+        # Check if any service of this honeypot is running
+        return bool(get_compose_backend().ps(dest_dir))
     except Exception:
         return False
 
-def run_compose_action(honeypot_dir: Path, action: str, extra_args: Optional[List[str]] = None) -> None:
+def run_compose_action(honeypot_dir: Path, action: str, extra_args: Optional[List[str]] = None, display=None) -> None:
     if not (honeypot_dir / "docker-compose.yml").exists():
         raise FileNotFoundError(f"docker-compose.yml not found in {honeypot_dir}")
 
@@ -52,65 +56,22 @@ def run_compose_action(honeypot_dir: Path, action: str, extra_args: Optional[Lis
     if action in ["up", "start"]:
         try:
             from scripts.error_handlers import auto_fix_permissions
-            auto_fix_permissions()
+            auto_fix_permissions(honeypot_dir.name)
         except Exception:
             # Continue if permission fixing fails
             pass
 
-    # Check if ephemeral logging is enabled
-    try:
-        from config import USE_EPHEMERAL_LOGGING
-    except ImportError:
-        USE_EPHEMERAL_LOGGING = True  # Default to True if config not found
-
-    # Use ephemeral logging when enabled (even with extra args)
-    if USE_EPHEMERAL_LOGGING:
-        # Use ephemeral logging for better UX
-        from .log_runner import run_docker_compose_action_with_args
-
-        # Extract honeypot name from directory
-        honeypot_name = honeypot_dir.name
-
-        success, duration = run_docker_compose_action_with_args(action, honeypot_name, honeypot_dir, extra_args)
-
-        if not success:
-            raise subprocess.CalledProcessError(1, f"docker compose {action}")
+    # Ephemeral or simple output is chosen by the backend (USE_EPHEMERAL_LOGGING)
+    backend = get_compose_backend()
+    if action == "up":
+        backend.up(honeypot_dir, extra_args or (), display=display)
+    elif action == "down":
+        backend.down(honeypot_dir, extra_args or (), display=display)
     else:
-        # Use simple output (original behavior)
-        cmd_dc = ["docker", "compose", action]
-        if action == "up":
-            cmd_dc.append("-d")
-        if extra_args:
-            cmd_dc.extend(extra_args)
+        backend.run(action, honeypot_dir, extra_args or (), display=display)
 
-        try:
-            subprocess.run(
-                cmd_dc,
-                cwd=str(honeypot_dir),
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
-            return
-        except FileNotFoundError:
-            # Fallback ke docker-compose v1
-            cmd_legacy = ["docker-compose", action]
-            if action == "up":
-                cmd_legacy.append("-d")
-            if extra_args:
-                cmd_legacy.extend(extra_args)
-            subprocess.run(
-                cmd_legacy,
-                cwd=str(honeypot_dir),
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
 
-
-def up_honeypot(honeypot_id: str, force: bool = False) -> None:
+def up_honeypot(honeypot_id: str, force: bool = False, display=None) -> None:
     # Import di dalam function untuk avoid circular import
     from scripts.list import resolve_honeypot_dir_id
     dir_id = resolve_honeypot_dir_id(honeypot_id)
@@ -124,15 +85,23 @@ def up_honeypot(honeypot_id: str, force: bool = False) -> None:
         if not is_honeypot_enabled(honeypot_id):
             raise ValueError(f"Tool '{honeypot_id}' is not enabled. Run 'enable {honeypot_id}' first or use --force.")
 
-    # Auto-fix permissions before starting containers
+    # Auto-fix permissions before starting containers (once per command, see auto_fix_permissions)
     try:
         from scripts.error_handlers import auto_fix_permissions
-        auto_fix_permissions()
+        auto_fix_permissions(dir_id)
     except Exception:
         # Continue if permission fixing fails
         pass
 
-    run_compose_action(dest_dir, "up")
+    # Honeypot started as part of the fleet project: address its services there
+    from .compose_fleet import fleet_services, refresh_fleet_compose, run_fleet_action
+    services = fleet_services(dir_id)
+    if services:
+        # docker/<id> may have been re-imported since the fleet file was rendered
+        refresh_fleet_compose()
+        run_fleet_action("up", services=services, label=dir_id, display=display)
+    else:
+        run_compose_action(dest_dir, "up", display=display)
 
     # Show output based on logging mode
     try:
@@ -144,7 +113,7 @@ def up_honeypot(honeypot_id: str, force: bool = False) -> None:
         print(f"{COLOR_YELLOW}[UP]{COLOR_RESET} {dir_id} {PREFIX_OK}")
 
 
-def down_honeypot(honeypot_id: str, remove_volumes: bool = False, remove_images: bool = False) -> None:
+def down_honeypot(honeypot_id: str, remove_volumes: bool = False, remove_images: bool = False, display=None) -> None:
     # Import di dalam function untuk avoid circular import
     from scripts.list import resolve_honeypot_dir_id
     dir_id = resolve_honeypot_dir_id(honeypot_id)
@@ -157,7 +126,15 @@ def down_honeypot(honeypot_id: str, remove_volumes: bool = False, remove_images:
         extra_args.append("-v")
     if remove_images:
         extra_args.extend(["--rmi", "all"])
-    run_compose_action(dest_dir, "down", extra_args=extra_args if extra_args else None)
+
+    from .compose_fleet import fleet_services, run_fleet_action
+    services = fleet_services(dir_id)
+    if services:
+        # `rm` only takes -v; images are left to the global cleanup
+        rm_args = ["--stop", "--force"] + (["-v"] if remove_volumes else [])
+        run_fleet_action("rm", extra_args=rm_args, services=services, label=dir_id, display=display)
+    else:
+        run_compose_action(dest_dir, "down", extra_args=extra_args if extra_args else None, display=display)
 
     # Show output based on logging mode
     try:
@@ -169,6 +146,20 @@ def down_honeypot(honeypot_id: str, remove_volumes: bool = False, remove_images:
         print(f"{COLOR_YELLOW}[DOWN]{COLOR_RESET} {dir_id} {PREFIX_OK}")
 
 
+def wait_for_honeypot_stopped(honeypot_id: str, timeout: float = 10.0, interval: float = 0.2) -> bool:
+    """
+    Wait until no container of the honeypot is running.
+
+    Returns True once stopped, False if still running after `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while is_honeypot_running(honeypot_id):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+    return True
+
+
 def shell_honeypot(honeypot_id: str) -> None:
     """Open shell (bash/sh) in running container."""
     # Import di dalam function untuk avoid circular import
@@ -189,19 +180,11 @@ def shell_honeypot(honeypot_id: str) -> None:
     # Try bash first, then fallback to sh
     shells_to_try = ["bash", "sh"]
 
+    backend = get_compose_backend()
     for shell in shells_to_try:
         try:
-            cmd = ["docker", "compose", "exec", service_name, shell]
-            subprocess.run(cmd, cwd=str(dest_dir), check=True)
+            backend.exec(dest_dir, service_name, [shell])
             return  # Success, exit function
-        except FileNotFoundError:
-            # Fallback to docker-compose v1
-            try:
-                cmd_legacy = ["docker-compose", "exec", service_name, shell]
-                subprocess.run(cmd_legacy, cwd=str(dest_dir), check=True)
-                return  # Success, exit function
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                continue  # Try next shell
         except subprocess.CalledProcessError:
             continue  # Try next shell
 
@@ -222,7 +205,28 @@ def cleanup_global_images() -> None:
     ]
 
     removed_count = 0
-    for pattern in honeypot_patterns:
+    use_cli = True
+    client = get_client()
+    if client is not None:
+        try:
+            for pattern in honeypot_patterns:
+                for image in client.images(filters={"reference": [pattern]}):
+                    for tag in image.get("RepoTags") or []:
+                        if not tag or tag == "<none>:<none>":
+                            continue
+                        try:
+                            client.remove_image(tag)
+                            print(f"{PREFIX_OK}: Removed image {tag}")
+                            removed_count += 1
+                        except API_ERRORS:
+                            # Ignore errors (image might be in use, etc.)
+                            pass
+            use_cli = False
+        except API_ERRORS:
+            # Daemon socket unusable, fall back to the docker CLI
+            pass
+
+    for pattern in (honeypot_patterns if use_cli else []):
         try:
             # Get images matching the pattern
             result = subprocess.run(
@@ -260,6 +264,16 @@ def cleanup_global_volumes() -> None:
     """Remove unused Docker volumes globally."""
     print("Removing unused Docker volumes...")
 
+    client = get_client()
+    if client is not None:
+        try:
+            client.prune_volumes()
+            print(f"{PREFIX_OK}: Removed unused Docker volumes")
+            return
+        except API_ERRORS:
+            # Daemon socket unusable, fall back to the docker CLI
+            pass
+
     try:
         # Use docker volume prune to remove only unused volumes
         result = subprocess.run(
@@ -0,0 +1,327 @@
+"""
+Docker Engine API client for HPone.
+
+Small HTTP-over-unix-socket client that talks to the Docker daemon directly
+instead of forking the `docker` CLI. One keep-alive connection is reused for
+plain requests; streaming endpoints (follow logs, events) get their own.
+Callers fall back to the CLI when `get_client()` returns None or a request
+raises DockerAPIError/OSError.
+"""
+
+import http.client
+import json
+import os
+import socket
+import struct
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+DEFAULT_SOCKET_PATH = "/var/run/docker.sock"
+
+# Stream ids used by the multiplexed log framing
+STREAM_STDIN = 0
+STREAM_STDOUT = 1
+STREAM_STDERR = 2
+
+MULTIPLEXED_CONTENT_TYPE = "application/vnd.docker.multiplexed-stream"
+
+
+class DockerAPIError(Exception):
+    """Raised when the Docker daemon answers with an error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Docker API error {status}: {message}")
+        self.status = status
+        self.message = message
+
+
+# Errors after which callers should fall back to the docker CLI
+API_ERRORS = (OSError, DockerAPIError, http.client.HTTPException)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection that connects to a unix socket instead of TCP."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def socket_path_from_env() -> Optional[str]:
+    """Return the daemon socket path, or None when DOCKER_HOST is not a unix socket."""
+    docker_host = os.environ.get("DOCKER_HOST", "")
+    if not docker_host:
+        return DEFAULT_SOCKET_PATH
+    if docker_host.startswith("unix://"):
+        return docker_host[len("unix://"):]
+    return None
+
+
+def _read_exact(response: http.client.HTTPResponse, size: int) -> bytes:
+    """Read exactly `size` bytes unless the stream ends first."""
+    chunks: List[bytes] = []
+    remaining = size
+    while remaining > 0:
+        chunk = response.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def demux_stream(response: http.client.HTTPResponse) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yield (stream_id, payload) frames from a log/attach response.
+
+    Non-TTY containers use 8-byte frame headers: stream id, three zero bytes
+    and a big-endian payload size. TTY containers send raw bytes, reported
+    here as stdout.
+    """
+    content_type = response.getheader("Content-Type", "") or ""
+    header = _read_exact(response, 8)
+    if not header:
+        return
+    multiplexed = content_type.startswith(MULTIPLEXED_CONTENT_TYPE) or (
+        len(header) == 8 and header[0] in (STREAM_STDIN, STREAM_STDOUT, STREAM_STDERR) and header[1:4] == b"\0\0\0"
+    )
+    if not multiplexed:
+        yield STREAM_STDOUT, header
+        while True:
+            chunk = response.read1(65536) if hasattr(response, "read1") else response.read(65536)
+            if not chunk:
+                return
+            yield STREAM_STDOUT, chunk
+
+    while len(header) == 8:
+        stream_id = header[0]
+        size = struct.unpack(">I", header[4:8])[0]
+        payload = _read_exact(response, size)
+        if payload:
+            yield stream_id, payload
+        if len(payload) < size:
+            return
+        header = _read_exact(response, 8)
+
+
+class EventStream:
+    """
+    Decoded events of an `/events` response, in arrival order.
+
+    close() may be called from another thread: it shuts the socket down so a
+    read blocked on the next event returns, and iteration ends.
+    """
+
+    def __init__(self, conn: _UnixHTTPConnection, response: http.client.HTTPResponse):
+        self._conn = conn
+        self._response = response
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        try:
+            while True:
+                line = self._response.readline()
+                if not line:
+                    return
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        finally:
+            self._conn.close()
+
+    def close(self) -> None:
+        sock = self._conn.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class DockerClient:
+    """Minimal Docker Engine API client over a unix socket."""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 10):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._conn: Optional[_UnixHTTPConnection] = None
+        self._lock = threading.Lock()
+
+    # ---- transport ----------------------------------------------------
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _build_path(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        if not params:
+            return path
+        query: Dict[str, str] = {}
+        for key, value in params.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = "1" if value else "0"
+            elif isinstance(value, dict):
+                value = json.dumps(value)
+            query[key] = str(value)
+        return f"{path}?{urlencode(query)}" if query else path
+
+    @staticmethod
+    def _raise_for_status(response: http.client.HTTPResponse, body: bytes) -> None:
+        if response.status < 400:
+            return
+        message = body.decode("utf-8", "replace").strip()
+        try:
+            message = json.loads(message).get("message", message)
+        except (ValueError, AttributeError):
+            pass
+        raise DockerAPIError(response.status, message)
+
+    def _request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                 body: Optional[Any] = None) -> Tuple[int, bytes]:
+        """Send a request on the shared keep-alive connection and read the full body."""
+        url = self._build_path(path, params)
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        with self._lock:
+            # Retry once when the daemon closed the idle keep-alive connection
+            for attempt in range(2):
+                if self._conn is None:
+                    self._conn = _UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+                try:
+                    self._conn.request(method, url, body=payload, headers=headers)
+                    response = self._conn.getresponse()
+                    data = response.read()
+                    break
+                except (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                        BrokenPipeError, ConnectionResetError):
+                    self._conn.close()
+                    self._conn = None
+                    if attempt:
+                        raise
+                except Exception:
+                    self._conn.close()
+                    self._conn = None
+                    raise
+            if response.will_close:
+                self._conn.close()
+                self._conn = None
+        self._raise_for_status(response, data)
+        return response.status, data
+
+    def _json(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+              body: Optional[Any] = None) -> Any:
+        _status, data = self._request(method, path, params=params, body=body)
+        return json.loads(data) if data else None
+
+    def _stream(self, method: str, path: str, params: Optional[Dict[str, Any]] = None) -> Tuple[_UnixHTTPConnection, http.client.HTTPResponse]:
+        """Open a dedicated connection for a long-running streaming response."""
+        conn = _UnixHTTPConnection(self.socket_path, timeout=None)
+        try:
+            conn.request(method, self._build_path(path, params))
+            response = conn.getresponse()
+            if response.status >= 400:
+                self._raise_for_status(response, response.read())
+        except Exception:
+            conn.close()
+            raise
+        return conn, response
+
+    # ---- system -------------------------------------------------------
+
+    def ping(self) -> bool:
+        try:
+            _status, data = self._request("GET", "/_ping")
+            return data.strip() == b"OK"
+        except API_ERRORS:
+            return False
+
+    def info(self) -> Dict[str, Any]:
+        return self._json("GET", "/info")
+
+    def version(self) -> Dict[str, Any]:
+        return self._json("GET", "/version")
+
+    # ---- containers ---------------------------------------------------
+
+    def containers(self, all: bool = True, filters: Optional[Dict[str, List[str]]] = None) -> List[Dict[str, Any]]:
+        return self._json("GET", "/containers/json", params={"all": all, "filters": filters}) or []
+
+    def inspect_container(self, container: str) -> Dict[str, Any]:
+        return self._json("GET", f"/containers/{quote(container, safe='')}/json")
+
+    def logs(self, container: str, tail: Optional[int] = None, follow: bool = False,
+             timestamps: bool = False, since: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+        """Yield (stream_id, payload) frames of a container's stdout/stderr."""
+        params = {
+            "stdout": True,
+            "stderr": True,
+            "follow": follow,
+            "timestamps": timestamps,
+            "tail": "all" if tail is None else int(tail),
+            "since": since,
+        }
+        conn, response = self._stream("GET", f"/containers/{quote(container, safe='')}/logs", params=params)
+        try:
+            yield from demux_stream(response)
+        finally:
+            conn.close()
+
+    def stats(self, container: str) -> Dict[str, Any]:
+        """Return a single stats sample (no streaming)."""
+        return self._json("GET", f"/containers/{quote(container, safe='')}/stats", params={"stream": False})
+
+    def events(self, filters: Optional[Dict[str, List[str]]] = None, since: Optional[int] = None,
+               until: Optional[int] = None) -> EventStream:
+        """Stream decoded events as the daemon emits them (blocks until `until` or close)."""
+        conn, response = self._stream("GET", "/events", params={"filters": filters, "since": since, "until": until})
+        return EventStream(conn, response)
+
+    # ---- images and volumes -------------------------------------------
+
+    def images(self, filters: Optional[Dict[str, List[str]]] = None) -> List[Dict[str, Any]]:
+        return self._json("GET", "/images/json", params={"filters": filters}) or []
+
+    def remove_image(self, image: str, force: bool = False) -> List[Dict[str, Any]]:
+        return self._json("DELETE", f"/images/{quote(image, safe='/:@')}", params={"force": force}) or []
+
+    def prune_volumes(self, filters: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        return self._json("POST", "/volumes/prune", params={"filters": filters}) or {}
+
+
+_CLIENT: Optional[DockerClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> Optional[DockerClient]:
+    """
+    Return the shared client when the daemon socket exists, else None.
+
+    The socket is only checked for existence here; connection and permission
+    errors surface from the first request so callers can fall back to the CLI.
+    """
+    global _CLIENT
+    socket_path = socket_path_from_env()
+    if not socket_path or not os.path.exists(socket_path):
+        return None
+    with _CLIENT_LOCK:
+        if _CLIENT is None or _CLIENT.socket_path != socket_path:
+            _CLIENT = DockerClient(socket_path)
+        return _CLIENT
@@ -0,0 +1,236 @@
+"""
+Fake Docker daemon for HPone.
+
+Serves a small subset of the Docker Engine API on a temporary unix socket so
+`core.docker_api.DockerClient` can be exercised without a real daemon:
+
+    with FakeDockerDaemon(containers=[...], logs={"cowrie": [(1, b"hi\\n")]}) as fake:
+        client = DockerClient(fake.socket_path)
+        client.containers()
+"""
+
+import json
+import os
+import re
+import socketserver
+import struct
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+
+def _label_matches(labels: Dict[str, str], wanted: List[str]) -> bool:
+    for label in wanted:
+        key, _, value = label.partition("=")
+        if key not in labels or (value and labels[key] != value):
+            return False
+    return True
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.daemon_state.connections += 1
+
+    def address_string(self) -> str:
+        return "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    # ---- helpers ------------------------------------------------------
+
+    def _query(self) -> Tuple[str, Dict[str, str]]:
+        parsed = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        return unquote(parsed.path), query
+
+    def _filters(self, query: Dict[str, str]) -> Dict[str, List[str]]:
+        try:
+            return json.loads(query.get("filters") or "{}")
+        except ValueError:
+            return {}
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: Any) -> None:
+        self._send(status, json.dumps(data).encode("utf-8"))
+
+    def _send_error(self, status: int, message: str) -> None:
+        self._send_json(status, {"message": message})
+
+    def _send_chunked(self, chunks: List[bytes], content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in chunks:
+            self.wfile.write(f"{len(chunk):x}\r\n".encode("ascii") + chunk + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _find_container(self, ref: str) -> Optional[Dict[str, Any]]:
+        for container in self.server.daemon_state.containers:
+            names = [n.lstrip("/") for n in container.get("Names", [])]
+            if ref == container.get("Id") or ref in names:
+                return container
+        return None
+
+    # ---- routes -------------------------------------------------------
+
+    def do_GET(self) -> None:
+        state = self.server.daemon_state
+        path, query = self._query()
+        state.requests.append(("GET", path))
+
+        if path == "/_ping":
+            self._send(200, b"OK", content_type="text/plain")
+        elif path == "/info":
+            self._send_json(200, state.info)
+        elif path == "/version":
+            self._send_json(200, state.version)
+        elif path == "/containers/json":
+            filters = self._filters(query)
+            result = []
+            for container in state.containers:
+                if query.get("all") not in ("1", "true") and container.get("State") != "running":
+                    continue
+                if not _label_matches(container.get("Labels") or {}, filters.get("label", [])):
+                    continue
+                result.append(container)
+            self._send_json(200, result)
+        elif path == "/images/json":
+            filters = self._filters(query)
+            patterns = filters.get("reference", [])
+            result = []
+            for image in state.images:
+                tags = image.get("RepoTags") or []
+                if patterns and not any(self._ref_match(p, t) for p in patterns for t in tags):
+                    continue
+                result.append(image)
+            self._send_json(200, result)
+        elif path == "/events":
+            chunks = [json.dumps(event).encode("utf-8") + b"\n" for event in state.events]
+            self._send_chunked(chunks, "application/json")
+        else:
+            match = re.match(r"^/containers/([^/]+)/(json|logs|stats)$", path)
+            if not match:
+                self._send_error(404, f"page not found: {path}")
+                return
+            container = self._find_container(match.group(1))
+            if container is None:
+                self._send_error(404, f"No such container: {match.group(1)}")
+                return
+            name = container["Names"][0].lstrip("/")
+            if match.group(2) == "json":
+                self._send_json(200, container)
+            elif match.group(2) == "stats":
+                self._send_json(200, state.stats.get(name, {"name": "/" + name}))
+            else:
+                frames = list(state.logs.get(name, []))
+                tail = query.get("tail", "all")
+                if tail != "all":
+                    frames = frames[-int(tail):] if int(tail) > 0 else []
+                body = b"".join(struct.pack(">BxxxI", sid, len(data)) + data for sid, data in frames)
+                size = state.chunk_size or len(body) or 1
+                chunks = [body[i:i + size] for i in range(0, len(body), size)]
+                self._send_chunked(chunks, "application/vnd.docker.multiplexed-stream")
+
+    def do_DELETE(self) -> None:
+        state = self.server.daemon_state
+        path, _query = self._query()
+        state.requests.append(("DELETE", path))
+        if not path.startswith("/images/"):
+            self._send_error(404, f"page not found: {path}")
+            return
+        ref = path[len("/images/"):]
+        for image in list(state.images):
+            if ref in (image.get("RepoTags") or []) or ref == image.get("Id"):
+                state.images.remove(image)
+                self._send_json(200, [{"Untagged": ref}])
+                return
+        self._send_error(404, f"No such image: {ref}")
+
+    def do_POST(self) -> None:
+        state = self.server.daemon_state
+        path, _query = self._query()
+        state.requests.append(("POST", path))
+        if path == "/volumes/prune":
+            removed = [v.get("Name") for v in state.volumes]
+            state.volumes.clear()
+            self._send_json(200, {"VolumesDeleted": removed, "SpaceReclaimed": 0})
+        else:
+            self._send_error(404, f"page not found: {path}")
+
+    @staticmethod
+    def _ref_match(pattern: str, tag: str) -> bool:
+        regex = "^" + re.escape(pattern).replace(r"\*", "[^/]*") + "(:.*)?$"
+        return re.match(regex, tag) is not None
+
+
+class _FakeServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class FakeDockerDaemon:
+    """In-process fake Docker daemon listening on a temporary unix socket."""
+
+    def __init__(self, containers: Optional[List[Dict[str, Any]]] = None,
+                 images: Optional[List[Dict[str, Any]]] = None,
+                 volumes: Optional[List[Dict[str, Any]]] = None,
+                 logs: Optional[Dict[str, List[Tuple[int, bytes]]]] = None,
+                 stats: Optional[Dict[str, Dict[str, Any]]] = None,
+                 events: Optional[List[Dict[str, Any]]] = None,
+                 socket_path: Optional[str] = None, chunk_size: int = 0):
+        self.containers = list(containers or [])
+        self.images = list(images or [])
+        self.volumes = list(volumes or [])
+        self.logs = dict(logs or {})
+        self.stats = dict(stats or {})
+        self.events = list(events or [])
+        # Split log bodies into chunks of this many bytes (0: one chunk) so
+        # frame headers straddle chunk boundaries
+        self.chunk_size = chunk_size
+        self.info = {"Name": "fake-docker", "Containers": len(self.containers)}
+        self.version = {"Version": "0.0.0-fake", "ApiVersion": "1.41"}
+        self.connections = 0
+        self.requests: List[Tuple[str, str]] = []
+        self._tmpdir: Optional[str] = None
+        if socket_path is None:
+            self._tmpdir = tempfile.mkdtemp(prefix="hpone-fake-docker-")
+            socket_path = os.path.join(self._tmpdir, "docker.sock")
+        self.socket_path = socket_path
+        self._server: Optional[_FakeServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "FakeDockerDaemon":
+        self._server = _FakeServer(self.socket_path, _FakeHandler)
+        self._server.daemon_state = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        if self._tmpdir:
+            os.rmdir(self._tmpdir)
+            self._tmpdir = None
+
+    def __enter__(self) -> "FakeDockerDaemon":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
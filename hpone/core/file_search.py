@@ -0,0 +1,262 @@
+"""
+In-process search over honeypot data files.
+
+Replaces the `grep`/`findstr` subprocess of the logs browser. Files are read
+through MappedFile in SEARCH_CHUNK ranges aligned to line starts, each range
+is scanned for matching lines and the matches are yielded as soon as their
+range is done, in file order, until `max_matches`.
+
+Modes:
+  literal  plain substring (default)
+  regex    Python regular expression, matched per line (re.MULTILINE)
+  field    JSON-lines records by field: `src_ip=1.2.3.4` (equal) or
+           `input~wget` (contains); several conditions separated by spaces
+           must all hold, nested keys use dots (`payload.user=root`)
+
+Files above PARALLEL_THRESHOLD are scanned by a thread pool. The ranges are
+read with os.pread, which releases the GIL, so disk reads overlap with the
+scanning; on a free-threaded interpreter the scanning itself runs in parallel.
+"""
+
+import json
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Iterator, List, Optional, Tuple, Union
+
+from .mapped_file import MappedFile
+
+SEARCH_MODES = ("literal", "regex", "field")
+SEARCH_CHUNK = 8 * 1024 * 1024           # Bytes scanned per range
+PARALLEL_THRESHOLD = 64 * 1024 * 1024    # Files at least this large are scanned by threads
+DEFAULT_MAX_MATCHES = 500
+
+_FIELD_CONDITION = re.compile(r"^([^=~\s]+)([=~])(.*)$")
+
+# (newlines in the range before the line, line start in the range, line) of one matching line
+_RangeMatch = Tuple[int, int, bytes]
+
+
+@dataclass(frozen=True)
+class SearchMatch:
+    """One matching line."""
+    line: int      # 1-based line number
+    offset: int    # Byte offset of the line start
+    text: str
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+class SearchQuery:
+    """
+    A compiled query: finds candidate lines in a buffer and checks them.
+
+    Raises:
+        ValueError: On an unknown mode, an invalid regex or a malformed field condition
+    """
+
+    def __init__(self, query: str, mode: str = "literal", ignore_case: bool = False):
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        if not query:
+            raise ValueError("Empty search query")
+        self.query = query
+        self.mode = mode
+        self.ignore_case = ignore_case
+        self._check: Optional[Callable[[bytes], bool]] = None
+        self._highlight: Optional["re.Pattern[str]"] = None
+
+        if mode == "field":
+            self._conditions = self._parse_conditions(query)
+            self._check = self._check_record
+            # Pre-filter on the longest value that appears verbatim in the JSON text
+            plain = [v for _k, _op, v in self._conditions
+                     if v and v.isascii() and v.isprintable() and not any(c in v for c in '"\\/')]
+            literal = max(plain, key=len) if plain else None
+        elif mode == "literal":
+            literal = query
+        else:
+            literal = None
+
+        flags = re.IGNORECASE if ignore_case else 0
+        if literal is not None and not ignore_case:
+            needle = literal.encode("utf-8")
+            self._find = lambda buf, pos, end: buf.find(needle, pos, end)
+        elif literal is not None or mode == "regex":
+            source = re.escape(literal) if literal is not None else query
+            try:
+                pattern = re.compile(source.encode("utf-8"), flags | re.MULTILINE)
+            except re.error as exc:
+                raise ValueError(f"Invalid regular expression: {exc}") from exc
+
+            def find(buf, pos: int, end: int) -> int:
+                match = pattern.search(buf, pos, end)
+                return match.start() if match else -1
+            self._find = find
+        else:
+            # Nothing to pre-filter on: every line is a candidate
+            self._find = lambda buf, pos, end: pos if pos < end else -1
+
+        if mode != "field":
+            try:
+                self._highlight = re.compile(re.escape(query) if mode == "literal" else query, flags)
+            except re.error:
+                self._highlight = None
+
+    @staticmethod
+    def _parse_conditions(query: str) -> List[Tuple[List[str], str, str]]:
+        conditions = []
+        for part in query.split():
+            match = _FIELD_CONDITION.match(part)
+            if not match:
+                raise ValueError(f"Expected key=value or key~text, got: {part}")
+            key, op, value = match.groups()
+            conditions.append((key.split("."), op, value))
+        return conditions
+
+    def _check_record(self, line: bytes) -> bool:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return False
+        for path, op, expected in self._conditions:
+            value: Any = record
+            for key in path:
+                if not isinstance(value, dict) or key not in value:
+                    return False
+                value = value[key]
+            text = _field_text(value)
+            if self.ignore_case:
+                text, expected = text.casefold(), expected.casefold()
+            if (text != expected) if op == "=" else (expected not in text):
+                return False
+        return True
+
+    def scan(self, data: bytes, limit: int) -> Tuple[List[_RangeMatch], int]:
+        """
+        Matching lines of `data`, which must start at a line start.
+
+        Returns:
+            ([(newlines before the line, line start, line), ...], newlines in data)
+        """
+        matches: List[_RangeMatch] = []
+        pos, end = 0, len(data)
+        counted_to, newlines = 0, 0
+        find, check = self._find, self._check
+        while pos < end and len(matches) < limit:
+            hit = find(data, pos, end)
+            if hit < 0:
+                break
+            line_start = data.rfind(b"\n", pos, hit) + 1 or pos
+            line_end = data.find(b"\n", hit)
+            if line_end < 0:
+                line_end = end
+            line = data[line_start:line_end]
+            if check is None or check(line):
+                newlines += data.count(b"\n", counted_to, line_start)
+                counted_to = line_start
+                matches.append((newlines, line_start, line))
+            pos = line_end + 1
+        return matches, newlines + data.count(b"\n", counted_to)
+
+    def highlight(self, text: str, color: str, reset: str) -> str:
+        """`text` with the matched parts wrapped in `color` (unchanged in field mode)."""
+        if self._highlight is None:
+            return text
+        return self._highlight.sub(lambda m: f"{color}{m.group(0)}{reset}" if m.group(0) else "", text)
+
+
+def _ranges(mapped: MappedFile) -> List[Tuple[int, int]]:
+    """SEARCH_CHUNK byte ranges of the file, each starting at a line start."""
+    bounds = [0]
+    while bounds[-1] + SEARCH_CHUNK < mapped.size:
+        newline = mapped.map.find(b"\n", bounds[-1] + SEARCH_CHUNK - 1)
+        if newline < 0 or newline + 1 >= mapped.size:
+            break
+        bounds.append(newline + 1)
+    bounds.append(mapped.size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def search_file(path: Union[str, Path], query: Union[str, SearchQuery], mode: str = "literal",
+                ignore_case: bool = False, max_matches: int = DEFAULT_MAX_MATCHES,
+                threads: Optional[int] = None) -> Iterator[SearchMatch]:
+    """
+    Yield the lines of a file matching `query`, in file order, as they are found.
+
+    Args:
+        path: File to search
+        query: Query text (compiled with `mode`/`ignore_case`) or a SearchQuery
+        mode: literal, regex or field (see module docstring)
+        ignore_case: Case-insensitive matching
+        max_matches: Stop after this many matching lines (0: no limit)
+        threads: Worker threads for files above PARALLEL_THRESHOLD
+            (default: up to 4, by CPU count)
+
+    Raises:
+        ValueError: When the query cannot be compiled
+    """
+    if not isinstance(query, SearchQuery):
+        query = SearchQuery(query, mode, ignore_case)
+    limit = max_matches if max_matches > 0 else sys.maxsize
+
+    with MappedFile(path) as mapped:
+        if not mapped.size:
+            return
+        ranges = _ranges(mapped)
+        workers = threads or min(4, os.cpu_count() or 1)
+        executor = None
+        if workers > 1 and len(ranges) > 1 and mapped.size >= PARALLEL_THRESHOLD and hasattr(os, "pread"):
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hpone-search")
+        fd = mapped.fileno()
+
+        def scan_range(start: int, end: int) -> Tuple[List[_RangeMatch], int]:
+            if executor is not None:
+                # pread releases the GIL while the range comes in from disk
+                data = os.pread(fd, end - start, start)
+            else:
+                data = mapped.map[start:end]
+            return query.scan(data, limit)
+
+        found = 0
+        line = 0
+        try:
+            for start, (matches, newlines) in _scan_in_order(ranges, scan_range, executor, workers * 2):
+                for before, line_start, text in matches:
+                    yield SearchMatch(line + before + 1, start + line_start, text.rstrip(b"\r").decode("utf-8", "replace"))
+                    found += 1
+                    if found >= limit:
+                        return
+                line += newlines
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _scan_in_order(ranges: List[Tuple[int, int]], scan_range: Callable[[int, int], Any],
+                   executor: Optional[ThreadPoolExecutor], lookahead: int) -> Iterator[Tuple[int, Any]]:
+    """(start, scan result) of every range in file order, `lookahead` ranges in flight when threaded."""
+    if executor is None:
+        for start, end in ranges:
+            yield start, scan_range(start, end)
+        return
+    pending: Deque[Tuple[int, Future]] = deque()
+    queued = iter(ranges)
+    for start, end in queued:
+        pending.append((start, executor.submit(scan_range, start, end)))
+        if len(pending) >= lookahead:
+            break
+    while pending:
+        start, future = pending.popleft()
+        for next_start, next_end in queued:
+            pending.append((next_start, executor.submit(scan_range, next_start, next_end)))
+            break
+        yield start, future.result()
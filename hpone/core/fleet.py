@@ -0,0 +1,151 @@
+"""
+Fleet state helpers for HPone.
+
+Build a single snapshot of every HPone-managed container so listing commands
+do not need one `docker compose ps` per honeypot.
+"""
+
+import json
+import subprocess
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Label injected by rewrite_compose_with_env into every honeypot service
+HPONE_LABEL = "hpone=true"
+
+# Labels set by docker compose (v1 and v2) on every container it creates
+COMPOSE_PROJECT_LABEL = "com.docker.compose.project"
+COMPOSE_SERVICE_LABEL = "com.docker.compose.service"
+
+# Honeypot ID label injected next to HPONE_LABEL; needed when several
+# honeypots share one compose project (fleet mode)
+HONEYPOT_ID_LABEL = "hpone.honeypot"
+
+
+def honeypot_of(labels: Dict[str, str]) -> Optional[str]:
+    """Return the honeypot ID a container belongs to, from its labels."""
+    return labels.get(HONEYPOT_ID_LABEL) or labels.get(COMPOSE_PROJECT_LABEL)
+
+
+@dataclass(frozen=True)
+class ContainerState:
+    """State of one container as reported by `docker ps -a`."""
+    name: str
+    project: str
+    service: str
+    state: str
+    status: str
+
+    @property
+    def running(self) -> bool:
+        return self.state.lower() == "running"
+
+
+def _parse_labels(raw: str) -> Dict[str, str]:
+    """Parse the `k=v,k=v` label string printed by `docker ps`."""
+    labels: Dict[str, str] = {}
+    last_key = None
+    for part in (raw or "").split(","):
+        if "=" in part:
+            key, value = part.split("=", 1)
+            labels[key] = value
+            last_key = key
+        elif last_key is not None:
+            # Label values may contain commas (e.g. compose config_files)
+            labels[last_key] += "," + part
+    return labels
+
+
+class FleetState:
+    """
+    Snapshot of all HPone containers, indexed by compose project and service.
+
+    Compose names the project after the directory holding docker-compose.yml,
+    so a honeypot imported to docker/<id> maps to project `<id>`. Containers of
+    the fleet project are mapped back by their `hpone.honeypot` label.
+    """
+
+    def __init__(self, containers: List[ContainerState], available: bool = True):
+        self.available = available
+        self._by_project: Dict[str, Dict[str, List[ContainerState]]] = {}
+        for container in containers:
+            services = self._by_project.setdefault(container.project.lower(), {})
+            services.setdefault(container.service, []).append(container)
+
+    @classmethod
+    def snapshot(cls, timeout: int = 10) -> "FleetState":
+        """Query Docker once for every container carrying the HPone label."""
+        from .docker_api import get_client, API_ERRORS
+        client = get_client()
+        if client is not None:
+            try:
+                return cls.from_api(client.containers(all=True, filters={"label": [HPONE_LABEL]}))
+            except API_ERRORS:
+                pass  # Fall back to the CLI below
+
+        cmd = ["docker", "ps", "-a", "--filter", f"label={HPONE_LABEL}", "--format", "{{json .}}"]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, check=True)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+            return cls([], available=False)
+        return cls.from_ps_output(result.stdout)
+
+    @classmethod
+    def from_api(cls, entries: List[Dict]) -> "FleetState":
+        """Build a snapshot from the Engine API `/containers/json` response."""
+        containers: List[ContainerState] = []
+        for entry in entries:
+            labels = entry.get("Labels") or {}
+            project = honeypot_of(labels)
+            if not project:
+                continue
+            names = entry.get("Names") or [""]
+            containers.append(ContainerState(
+                name=str(names[0]).lstrip("/"),
+                project=project,
+                service=labels.get(COMPOSE_SERVICE_LABEL, ""),
+                state=str(entry.get("State") or ""),
+                status=str(entry.get("Status") or ""),
+            ))
+        return cls(containers)
+
+    @classmethod
+    def from_ps_output(cls, output: str) -> "FleetState":
+        """Build a snapshot from `docker ps --format '{{json .}}'` output (one object per line)."""
+        containers: List[ContainerState] = []
+        for line in output.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            labels = entry.get("Labels")
+            if not isinstance(labels, dict):
+                labels = _parse_labels(str(labels or ""))
+            project = honeypot_of(labels)
+            if not project:
+                continue
+            containers.append(ContainerState(
+                name=str(entry.get("Names") or ""),
+                project=project,
+                service=labels.get(COMPOSE_SERVICE_LABEL, ""),
+                state=str(entry.get("State") or ""),
+                status=str(entry.get("Status") or ""),
+            ))
+        return cls(containers)
+
+    def containers(self, project: str, service: Optional[str] = None) -> List[ContainerState]:
+        """Return containers of a compose project, optionally limited to one service."""
+        services = self._by_project.get(project.lower(), {})
+        if service is not None:
+            return list(services.get(service, []))
+        return [c for items in services.values() for c in items]
+
+    def is_running(self, project: str) -> bool:
+        """True if any container of the compose project is running."""
+        return any(c.running for c in self.containers(project))
+
+    def running_projects(self) -> List[str]:
+        return sorted(p for p in self._by_project if self.is_running(p))
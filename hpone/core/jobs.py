@@ -0,0 +1,142 @@
+"""
+Cooperative cancellation of running commands.
+
+`hpone daemon` runs commands in threads of a process that stays up, so a
+command whose client went away cannot be interrupted at an arbitrary point:
+that could leave the registry, state cache or render cache half-updated
+for every later request. Instead each command runs with a CancelToken:
+
+- processes it starts are registered with the token (run_process, or
+  tracked_process around a Popen), and cancelling terminates exactly those;
+- loops over honeypots call check_cancelled() between steps, which raises
+  JobCancelled once the token was cancelled.
+
+Outside the daemon no token is installed and all of this is a no-op.
+"""
+
+import contextlib
+import subprocess
+import threading
+from typing import Any, Iterator, Optional, Sequence, Set
+
+
+class JobCancelled(KeyboardInterrupt):
+    """Raised at a cancellation check of a command that was cancelled."""
+
+
+class CancelToken:
+    """Cancellation flag of one command plus the processes it is running."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._processes: Set[subprocess.Popen] = set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Mark the command cancelled and terminate the processes it started."""
+        self._event.set()
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            _terminate(process)
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise JobCancelled()
+
+    def add(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.add(process)
+        # Cancelled while the process was being started
+        if self._event.is_set():
+            _terminate(process)
+
+    def discard(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.discard(process)
+
+
+def _terminate(process: subprocess.Popen) -> None:
+    if process.poll() is None:
+        try:
+            process.terminate()
+        except OSError:
+            pass
+
+
+_local = threading.local()
+
+# Token of the command holding the daemon's job lock; also seen by the
+# worker threads it starts (e.g. the pool of `up --all -j`)
+_job_token: Optional[CancelToken] = None
+
+
+def set_thread_token(token: Optional[CancelToken]) -> None:
+    """Install the token of the command running in the calling thread."""
+    _local.token = token
+
+
+def set_job_token(token: Optional[CancelToken]) -> None:
+    """Install the token of the command holding the job lock, for every thread."""
+    global _job_token
+    _job_token = token
+
+
+def current_token() -> Optional[CancelToken]:
+    return getattr(_local, "token", None) or _job_token
+
+
+def check_cancelled() -> None:
+    """Raise JobCancelled if the current command was cancelled."""
+    token = current_token()
+    if token is not None:
+        token.check()
+
+
+@contextlib.contextmanager
+def tracked_process(process: subprocess.Popen) -> Iterator[subprocess.Popen]:
+    """Terminate `process` if the current command is cancelled while it runs."""
+    token = current_token()
+    if token is None:
+        yield process
+        return
+    token.add(process)
+    try:
+        yield process
+    finally:
+        token.discard(process)
+
+
+def run_process(command: Sequence[str], check: bool = False, capture_output: bool = False,
+                input: Any = None, timeout: Optional[float] = None, **kwargs: Any) -> subprocess.CompletedProcess:
+    """
+    subprocess.run() whose process is terminated when the current command is cancelled.
+
+    Raises:
+        JobCancelled: When the command was cancelled before or while the process ran
+    """
+    token = current_token()
+    if token is None:
+        return subprocess.run(command, check=check, capture_output=capture_output,
+                              input=input, timeout=timeout, **kwargs)
+
+    token.check()
+    if capture_output:
+        kwargs["stdout"] = kwargs["stderr"] = subprocess.PIPE
+    if input is not None:
+        kwargs["stdin"] = subprocess.PIPE
+    with subprocess.Popen(command, **kwargs) as process, tracked_process(process):
+        try:
+            stdout, stderr = process.communicate(input, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+    token.check()
+    if check and process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
@@ -0,0 +1,159 @@
+"""
+Compiled line filters for the ephemeral log runner.
+
+A cold `compose up` of an image-building honeypot (suricata, conpot, ...)
+prints tens of thousands of BuildKit, apt, pip and npm progress lines. The
+runner only shows what matters, and deciding that per line has to be cheap:
+every filter here is a handful of precompiled regular expressions, so a line
+costs one lower() and at most three regex scans instead of a scan per keyword.
+
+Literal patterns are compiled into one alternation whose branches are
+factored by common prefix (a trie), which keeps the regex engine from retrying
+every literal at every position.
+
+Filters are chosen per compose action (LINE_FILTERS); actions without an entry
+show every line.
+"""
+
+import re
+from typing import Callable, Dict, Iterable, Optional, Sequence
+
+LineFilterFunc = Callable[[str], bool]
+
+# Shown even when a skip pattern matches too (matched lowercased)
+BUILD_IMPORTANT_KEYWORDS = ('error', 'failed', 'fatal', 'exception', 'warn', 'warning')
+
+# Verbose output hidden during builds (matched lowercased)
+BUILD_SKIP_PATTERNS = (
+    # BuildKit step logs and their operations
+    'transferring dockerfile:', 'transferring context:', 'done',
+
+    # Docker operations
+    'resolve docker.io', 'sha256:', 'kb / ', 'mb / ', 'gb / ',
+    'kb/s', 'mb/s', 'gb/s', 'downloading', 'extracting',
+    'verifying checksum', 'download complete',
+
+    # Pull patterns
+    'pulling fs layer', 'waiting', 'downloading [', 'extracting [', 'digest:', 'status:',
+
+    # Build patterns
+    'building with', 'load build definition', 'load metadata',
+    'load .dockerignore', 'internal', 'transferring',
+
+    # Package management and pip warnings
+    'get:', 'hit:', 'fetched', 'unpacking', 'setting up',
+    'preparing to unpack', 'processing triggers for',
+    'collecting ', 'installing collected packages',
+    'requirement already satisfied',
+    'warning: running pip as the', 'it is recommended to use a virtual environment',
+    'use the --root-user-action option', 'https://pip.pypa.io/warnings/venv',
+
+    # NPM/Yarn/Node
+    'added ', 'removed ', 'audited ', 'fetchmetadata', 'sill ', 'timing ',
+
+    # Cargo/Go/Rust
+    'compiling ', 'finished release', 'go: downloading', 'go: extracting',
+
+    # Database operations
+    '(reading database', 'files and directories currently installed',
+)
+
+# Size/time information, matched case-sensitively on the original line
+BUILD_SKIP_UNITS = ('kB', 'MB', 'GB', 'B /', 's done', 's DONE')
+
+# BuildKit step lines, e.g. "#7 63.58 Get:1 http://..." or "#12 DONE 0.1s",
+# and references to the first steps anywhere in a line
+BUILDKIT_STEP = r'^\s*#\d+\s+\S'
+BUILDKIT_STEP_REF = r'#(?:[1-9]|[12]\d) '
+
+
+def literal_pattern(literals: Iterable[str]) -> str:
+    """
+    Regex source matching any of `literals`, as an alternation factored by prefix.
+
+    ("get:", "go: downloading", "go: extracting") becomes
+    "g(?:et:|o:\\ (?:downloading|extracting))". A literal that is a prefix of
+    another one ends the match early, which is all a substring test needs.
+    """
+    trie: Dict[str, dict] = {}
+    for literal in literals:
+        if not literal:
+            continue
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        if '' in node:
+            return ''
+        branches = []
+        for char in sorted(node):
+            rest = node[char]
+            # Collapse single-child chains into one literal run
+            run = re.escape(char)
+            while len(rest) == 1 and '' not in rest:
+                (char, rest), = rest.items()
+                run += re.escape(char)
+            branches.append(run + build(rest))
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
+
+class LineFilter:
+    """
+    Precompiled show/skip decision for one line of command output.
+
+    A line is shown when it contains any `show` keyword; otherwise it is hidden
+    when it contains any `skip` literal (both compared lowercased), any
+    `skip_exact` literal (compared as is) or matches any `skip_regex`.
+    """
+
+    def __init__(self, show: Iterable[str] = (), skip: Iterable[str] = (),
+                 skip_exact: Iterable[str] = (), skip_regex: Sequence[str] = ()):
+        show = [s.lower() for s in show]
+        skip = [s.lower() for s in skip]
+        skip_exact = [s for s in skip_exact if s]
+        raw = [literal_pattern(skip_exact)] if skip_exact else []
+        raw += list(skip_regex)
+        self._show = re.compile(literal_pattern(show)).search if show else None
+        self._skip = re.compile(literal_pattern(skip)).search if skip else None
+        self._skip_raw = re.compile('|'.join(f'(?:{r})' for r in raw)).search if raw else None
+
+    def __call__(self, line: str) -> bool:
+        line_lower = line.lower()
+        if self._show is not None and self._show(line_lower):
+            return True
+        if self._skip is not None and self._skip(line_lower):
+            return False
+        if self._skip_raw is not None and self._skip_raw(line):
+            return False
+        return True
+
+
+BUILD_LOG_FILTER = LineFilter(
+    show=BUILD_IMPORTANT_KEYWORDS,
+    skip=BUILD_SKIP_PATTERNS,
+    skip_exact=BUILD_SKIP_UNITS,
+    skip_regex=(BUILDKIT_STEP, BUILDKIT_STEP_REF),
+)
+
+# Filter applied to the output of each compose action (missing: show everything)
+LINE_FILTERS: Dict[str, LineFilterFunc] = {
+    "up": BUILD_LOG_FILTER,
+}
+
+
+def get_line_filter(action: Optional[str], command: Sequence[str] = ()) -> Optional[LineFilterFunc]:
+    """
+    Line filter for a compose action, or None to show every line.
+
+    Without an action the command itself is inspected, so a plain
+    `docker compose up -d` still gets the build filter.
+    """
+    if action is None and "up" in command and "-d" in command:
+        action = "up"
+    return LINE_FILTERS.get(action) if action else None
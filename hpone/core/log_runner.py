@@ -6,16 +6,22 @@ This module provides functions to run commands with live logging that gets
 cleared and replaced with a summary after completion.
 """
 
+import codecs
 import os
 import sys
 import time
+import shutil
 import subprocess
 import threading
 import queue
+from collections import deque
 from datetime import datetime
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, BinaryIO
 from pathlib import Path
 
+from .jobs import check_cancelled, current_token
+from .log_filter import LineFilterFunc, get_line_filter
+
 # ANSI escape codes for terminal control
 CLEAR_SCREEN = "\033[2J\033[H"  # Clear screen and move cursor to top
 CLEAR_LINE = "\033[2K"  # Clear current line
@@ -29,6 +35,9 @@ COLOR_RED = "\033[31m"
 COLOR_YELLOW = "\033[33m"
 COLOR_CYAN = "\033[36m"
 
+READ_CHUNK_SIZE = 64 * 1024            # Bytes read from the command's pipe at once
+LAST_BUILD_LOG = ".last-build.log"     # Full output of the last `up`, next to its docker-compose.yml
+
 
 def get_timestamp() -> str:
     """Get current timestamp in HH:MM:SS format."""
@@ -50,150 +59,352 @@ def clear_lines(count: int) -> None:
     print(CLEAR_LINE, end='')
 
 
+class MultiSlotDisplay:
+    """
+    Ephemeral display for several commands running at once.
+
+    Each running honeypot owns one live status line showing its latest log
+    line. When a honeypot finishes, its live line is replaced by a permanent
+    summary line printed above the remaining live lines. On a non-TTY stream
+    only the summary lines are printed.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.interactive = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self._slots: dict[str, str] = {}
+        self._drawn = 0
+        self._lock = threading.Lock()
+
+    def add(self, name: str, text: str = "waiting ...") -> None:
+        with self._lock:
+            self._slots[name] = text
+            self._redraw()
+
+    def update(self, name: str, text: str) -> None:
+        with self._lock:
+            if name in self._slots:
+                self._slots[name] = text
+                self._redraw()
+
+    def is_active(self, name: str) -> bool:
+        with self._lock:
+            return name in self._slots
+
+    def discard(self, name: str) -> None:
+        """Drop the live line for `name` without printing a summary."""
+        with self._lock:
+            if self._slots.pop(name, None) is not None:
+                self._redraw()
+
+    def print_line(self, line: str) -> None:
+        """Print a permanent line above the live lines."""
+        with self._lock:
+            self._redraw([line])
+
+    def capture_stdout(self) -> "_DisplayWriter":
+        """
+        Context manager routing print() output through the display.
+
+        Worker threads print warnings and results while live lines are on
+        screen; without this, those prints would land inside the live area.
+        """
+        return _DisplayWriter(self)
+
+    def finish(self, name: str, summary: str) -> None:
+        """Drop the live line for `name` and print its summary line permanently."""
+        with self._lock:
+            self._slots.pop(name, None)
+            self._redraw([summary])
+
+    def close(self) -> None:
+        with self._lock:
+            self._slots.clear()
+            self._redraw()
+
+    def _redraw(self, finished: Optional[list[str]] = None) -> None:
+        if not self.interactive:
+            for line in finished or []:
+                self.stream.write(line + "\n")
+            self.stream.flush()
+            return
+
+        width = max(20, shutil.get_terminal_size((80, 20)).columns - 1)
+        buf = []
+        if self._drawn:
+            # Back to the first live line
+            buf.append(f"\r\033[{self._drawn}A")
+        for line in finished or []:
+            for part in line.split("\n"):
+                buf.append(CLEAR_LINE + part + "\n")
+        timestamp = get_timestamp()
+        for name, text in self._slots.items():
+            # Keep each live line on one terminal row so cursor math stays right
+            budget = max(0, width - len(timestamp) - len(name) - 5)
+            buf.append(f"{CLEAR_LINE}[{timestamp}] {COLOR_CYAN}{name}{COLOR_RESET}: {text[:budget]}\n")
+        buf.append("\033[J")
+        self._drawn = len(self._slots)
+        self.stream.write("".join(buf))
+        self.stream.flush()
+
+
+class _DisplayWriter:
+    """File-like proxy installed as sys.stdout while a MultiSlotDisplay is active."""
+
+    def __init__(self, display: MultiSlotDisplay):
+        self.display = display
+        self._pending = threading.local()
+        self._saved = None
+
+    def write(self, text: str) -> int:
+        buf = getattr(self._pending, "text", "") + text
+        *lines, rest = buf.split("\n")
+        for line in lines:
+            self.display.print_line(line)
+        self._pending.text = rest
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+    def __enter__(self) -> "_DisplayWriter":
+        self._saved = sys.stdout
+        sys.stdout = self
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        sys.stdout = self._saved
+        rest = getattr(self._pending, "text", "")
+        if rest:
+            self.display.print_line(rest)
+
+
+class _LogTail:
+    """
+    Latest lines of a running command, redrawn in place at a limited rate.
+
+    Only the last `size` lines are kept (a ring buffer), so memory and the
+    amount to clear afterwards stay fixed however long the command runs. With
+    a MultiSlotDisplay the newest line goes to the honeypot's live slot; on a
+    non-TTY stream every line is printed as it comes and nothing is cleared.
+    """
+
+    def __init__(self, name: str, size: int, fps: float, display: Optional[MultiSlotDisplay] = None):
+        self.name = name
+        self.display = display
+        self.stream = sys.stdout
+        self.interactive = display is not None or (hasattr(self.stream, "isatty") and self.stream.isatty())
+        self.lines: deque[str] = deque(maxlen=max(1, size))
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self._dirty = False
+        self._drawn = 0
+        self._last_draw = 0.0
+        self._second = 0
+        self._prefix = ""
+
+    def _line_prefix(self) -> str:
+        # The timestamp only changes once a second; don't format it per line
+        second = int(time.time())
+        if second != self._second:
+            self._second = second
+            self._prefix = f"[{get_timestamp()}] [INFO] "
+        return self._prefix
+
+    def add(self, line: str) -> None:
+        if self.display is not None:
+            self.lines.append(line)
+        elif not self.interactive:
+            self.stream.write(self._line_prefix() + line + "\n")
+            return
+        else:
+            self.lines.append(self._line_prefix() + line)
+        self._dirty = True
+
+    def flush(self, force: bool = False) -> None:
+        """Redraw if lines were added and the last frame is older than the frame interval."""
+        if not self._dirty:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_draw < self.interval:
+            return
+        self._dirty = False
+        self._last_draw = now
+        if self.display is not None:
+            self.display.update(self.name, self.lines[-1])
+            return
+
+        width = max(20, shutil.get_terminal_size((80, 20)).columns - 1)
+        buf = [f"\r\033[{self._drawn}A"] if self._drawn else []
+        for line in self.lines:
+            # One terminal row per line so the cursor math stays right
+            buf.append(CLEAR_LINE + line[:width] + ("\n" if "\033" not in line else COLOR_RESET + "\n"))
+        buf.append("\033[J")
+        self._drawn = len(self.lines)
+        self.stream.write("".join(buf))
+        self.stream.flush()
+
+    def clear(self) -> None:
+        """Remove the drawn lines from the terminal."""
+        if self._drawn:
+            self.stream.write(f"\r\033[{self._drawn}A\033[J")
+            self.stream.flush()
+            self._drawn = 0
+        self.lines.clear()
+        self._dirty = False
+
+
+def _pump_output(stream: BinaryIO, chunks: "queue.Queue[Optional[bytes]]") -> None:
+    """Move a pipe into `chunks` in large reads; None marks the end."""
+    try:
+        while True:
+            chunk = stream.read1(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.put(chunk)
+    except (OSError, ValueError):
+        pass
+    finally:
+        chunks.put(None)
+
+
+def _runner_settings() -> tuple[int, float, bool]:
+    try:
+        from config import EPHEMERAL_LOG_LINES
+    except ImportError:
+        EPHEMERAL_LOG_LINES = 10
+    try:
+        from config import EPHEMERAL_LOG_FPS
+    except ImportError:
+        EPHEMERAL_LOG_FPS = 15
+    try:
+        from config import SAVE_BUILD_LOG
+    except ImportError:
+        SAVE_BUILD_LOG = False
+    return EPHEMERAL_LOG_LINES, EPHEMERAL_LOG_FPS, SAVE_BUILD_LOG
+
+
 def run_with_ephemeral_logs(
     command: list[str],
     honeypot_name: str,
     cwd: Optional[Path] = None,
     timeout: Optional[int] = None,
     on_log_line: Optional[Callable[[str], None]] = None,
-    action: Optional[str] = None
+    action: Optional[str] = None,
+    display: Optional[MultiSlotDisplay] = None,
+    line_filter: Optional[LineFilterFunc] = None,
+    log_file: Optional[Path] = None
 ) -> tuple[bool, float]:
     """
     Run a command with ephemeral logging display.
 
+    Output is read from the pipe in large chunks and decoded incrementally.
+    Shown lines go to a fixed-size ring buffer that is redrawn at most
+    EPHEMERAL_LOG_FPS times a second (see _LogTail).
+
     Args:
         command: List of command arguments
         honeypot_name: Name of the honeypot for display
         cwd: Working directory for the command
         timeout: Command timeout in seconds (None = no timeout)
         on_log_line: Optional callback for each log line
+        display: Shared multi-slot display; when given, logs go to this
+            honeypot's live line instead of scrolling the terminal
+        line_filter: Decides which output lines are shown (default: the
+            filter registered for `action` in core.log_filter.LINE_FILTERS)
+        log_file: Write the complete, unfiltered output here (default:
+            `<cwd>/.last-build.log` for `up` when SAVE_BUILD_LOG is set)
 
     Returns:
         Tuple of (success: bool, duration: float)
     """
     start_time = time.time()
-    log_lines: list[str] = []
-    is_build_command = "up" in command and "-d" in command
-
-    def should_show_line(line: str) -> bool:
-        """Filter out verbose build output but keep important information."""
-        if not is_build_command:
-            return True
-
-        line_lower = line.lower()
-
-        # Always show these important messages
-        important_keywords = ['error', 'failed', 'fatal', 'exception', 'warn', 'warning']
-        if any(keyword in line_lower for keyword in important_keywords):
-            return True
-
-        # Skip all verbose output patterns - more comprehensive filtering
-        skip_patterns = [
-            # BuildKit step logs - all numbered steps and their operations
-            '#1 ', '#2 ', '#3 ', '#4 ', '#5 ', '#6 ', '#7 ', '#8 ', '#9 ',
-            '#10 ', '#11 ', '#12 ', '#13 ', '#14 ', '#15 ', '#16 ', '#17 ', '#18 ', '#19 ',
-            '#20 ', '#21 ', '#22 ', '#23 ', '#24 ', '#25 ', '#26 ', '#27 ', '#28 ', '#29 ',
-            'transferring dockerfile:', 'transferring context:', 'done',
-
-            # Docker operations
-            'resolve docker.io', 'sha256:', 'kb / ', 'mb / ', 'gb / ',
-            'kb/s', 'mb/s', 'gb/s', 'done', 'downloading', 'extracting',
-            'verifying checksum', 'download complete',
-
-            # Pull patterns
-            'pulling fs layer', 'waiting', 'downloading [', 'extracting [', 'digest:', 'status:',
-
-            # Build patterns
-            'building with', 'load build definition', 'load metadata',
-            'load .dockerignore', 'internal', 'transferring',
-
-            # Package management and pip warnings
-            'get:', 'hit:', 'fetched', 'unpacking', 'setting up',
-            'preparing to unpack', 'processing triggers for',
-            'collecting ', 'installing collected packages',
-            'requirement already satisfied',
-            'warning: running pip as the', 'it is recommended to use a virtual environment',
-            'use the --root-user-action option', 'https://pip.pypa.io/warnings/venv',
-
-            # NPM/Yarn/Node
-            'added ', 'removed ', 'audited ', 'fetchmetadata', 'sill ', 'timing ',
-
-            # Cargo/Go/Rust
-            'compiling ', 'finished release', 'go: downloading', 'go: extracting',
-
-            # Database operations
-            '(reading database', 'files and directories currently installed',
-        ]
-
-        # Check if line should be skipped
-        for pattern in skip_patterns:
-            if pattern in line_lower:
-                return False
-
-        # Skip BuildKit step lines dynamically (e.g., "#7 63.58 WARNING: ...")
-        import re
-        if re.match(r'^#\d+\s+', line.strip()):
-            return False
-
-        # Skip lines that start with step numbers (e.g., "#1 DONE 0.1s")
-        if line.strip().startswith('#') and any(word in line_lower for word in ['done', 'transferring', 'warning']):
-            return False
-
-        # Skip size/time information lines
-        if any(unit in line for unit in ['kB', 'MB', 'GB', 'B /', 's done', 's DONE']):
-            return False
-
-        # Show everything else (should be minimal now)
-        return True
+    tail_size, fps, save_build_log = _runner_settings()
+    tail = _LogTail(honeypot_name, tail_size, fps, display)
+    if line_filter is None:
+        line_filter = get_line_filter(action, command)
+    if log_file is None and save_build_log and action == "up" and cwd is not None:
+        log_file = Path(cwd) / LAST_BUILD_LOG
 
     def log_line(line: str) -> None:
-        """Add a timestamped log line."""
-        if should_show_line(line):
-            timestamp = get_timestamp()
-            formatted_line = f"[{timestamp}] [INFO] {line}"
-            log_lines.append(formatted_line)
-            print(formatted_line)
-
+        """Add a log line to the live output."""
+        if line_filter is None or line_filter(line):
+            tail.add(line)
             if on_log_line:
                 on_log_line(line)
 
-    def clear_logs() -> None:
-        """Clear all displayed log lines."""
-        if log_lines:
-            clear_lines(len(log_lines))
+    def show_result(line: str) -> None:
+        if display is not None:
+            display.finish(honeypot_name, line)
+        else:
+            print(line)
 
+    process = None
+    spill = None
+    token = current_token()
     try:
         # Start the process
         action_verb = "Stopping" if action == "down" else "Starting"
         log_line(f"{action_verb} {honeypot_name} containers ...")
+        tail.flush(force=True)
+
+        if log_file is not None:
+            try:
+                spill = open(log_file, "wb")
+            except OSError:
+                spill = None
 
         process = subprocess.Popen(
             command,
             cwd=str(cwd) if cwd else None,
             stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
+            stderr=subprocess.STDOUT
         )
+        if token is not None:
+            # A cancelled command (daemon client gone) terminates its compose run
+            token.add(process)
+
+        # A reader thread keeps the pipe drained while the terminal is redrawn
+        chunks: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=64)
+        threading.Thread(target=_pump_output, args=(process.stdout, chunks), daemon=True).start()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        deadline = start_time + timeout if timeout else None
+        pending = ""
 
-        # Read output in real-time
         while True:
-            line = process.stdout.readline()
-            if not line and process.poll() is not None:
+            try:
+                chunk = chunks.get(timeout=tail.interval or 0.1)
+            except queue.Empty:
+                chunk = b""
+            if chunk is None:
                 break
-
-            if line:
-                line = line.strip()
-                if line:  # Skip empty lines
-                    log_line(line)
+            if deadline is not None and time.time() > deadline:
+                raise subprocess.TimeoutExpired(command, timeout)
+            if chunk:
+                if spill is not None:
+                    spill.write(chunk)
+                # Same line endings as a text-mode pipe: \r\n and lone \r end a line
+                text = (pending + decoder.decode(chunk)).replace("\r\n", "\n").replace("\r", "\n")
+                *complete, pending = text.split("\n")
+                for line in complete:
+                    line = line.strip()
+                    if line:  # Skip empty lines
+                        log_line(line)
+            tail.flush()
+
+        rest = (pending + decoder.decode(b"", final=True)).strip()
+        if rest:
+            log_line(rest)
 
         # Wait for process to complete
-        return_code = process.wait(timeout=timeout)
+        return_code = process.wait(timeout=max(0.0, deadline - time.time()) if deadline is not None else None)
         duration = time.time() - start_time
+        check_cancelled()
 
-        # Clear all logs
-        clear_logs()
+        # Clear the live output
+        tail.clear()
 
         # Display result
         if return_code == 0:
@@ -206,84 +417,31 @@ def run_with_ephemeral_logs(
             status = f"{COLOR_RED}[FAIL]{COLOR_RESET}"
             result = f"{COLOR_RED}ERR{COLOR_RESET}"
 
-        print(f"{status} {honeypot_name} {result} ({duration:.1f}s)")
+        show_result(f"{status} {honeypot_name} {result} ({duration:.1f}s)")
         return return_code == 0, duration
 
     except subprocess.TimeoutExpired:
         process.kill()
+        process.wait()
         duration = time.time() - start_time
-        clear_logs()
-        print(f"{COLOR_RED}[FAIL]{COLOR_RESET} {honeypot_name} {COLOR_RED}TIMEOUT{COLOR_RESET} ({duration:.1f}s)")
+        tail.clear()
+        show_result(f"{COLOR_RED}[FAIL]{COLOR_RESET} {honeypot_name} {COLOR_RED}TIMEOUT{COLOR_RESET} ({duration:.1f}s)")
         return False, duration
 
     except Exception as e:
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait()
         duration = time.time() - start_time
-        clear_logs()
-        print(f"{COLOR_RED}[FAIL]{COLOR_RESET} {honeypot_name} {COLOR_RED}ERROR{COLOR_RESET} ({duration:.1f}s)")
-        print(f"Error: {e}")
+        tail.clear()
+        show_result(f"{COLOR_RED}[FAIL]{COLOR_RESET} {honeypot_name} {COLOR_RED}ERROR{COLOR_RESET} ({duration:.1f}s)\nError: {e}")
         return False, duration
 
-
-def run_docker_compose_action(
-    action: str,
-    honeypot_name: str,
-    honeypot_dir: Path,
-    timeout: Optional[int] = None
-) -> tuple[bool, float]:
-    """
-    Run docker compose action with ephemeral logging.
-
-    Args:
-        action: Docker compose action (up, down, etc.)
-        honeypot_name: Name of the honeypot
-        honeypot_dir: Directory containing docker-compose.yml
-        timeout: Command timeout in seconds
-
-    Returns:
-        Tuple of (success: bool, duration: float)
-    """
-    if not (honeypot_dir / "docker-compose.yml").exists():
-        raise FileNotFoundError(f"docker-compose.yml not found in {honeypot_dir}")
-
-    # Build command
-    cmd = ["docker", "compose", action]
-    if action == "up":
-        cmd.append("-d")
-
-    return run_with_ephemeral_logs(cmd, honeypot_name, cwd=honeypot_dir, timeout=timeout, action=action)
-
-
-def run_docker_compose_action_with_args(
-    action: str,
-    honeypot_name: str,
-    honeypot_dir: Path,
-    extra_args: Optional[list[str]] = None,
-    timeout: Optional[int] = None
-) -> tuple[bool, float]:
-    """
-    Run docker compose action with extra arguments and ephemeral logging.
-
-    Args:
-        action: Docker compose action (up, down, etc.)
-        honeypot_name: Name of the honeypot
-        honeypot_dir: Directory containing docker-compose.yml
-        extra_args: Additional arguments for docker compose command
-        timeout: Command timeout in seconds
-
-    Returns:
-        Tuple of (success: bool, duration: float)
-    """
-    if not (honeypot_dir / "docker-compose.yml").exists():
-        raise FileNotFoundError(f"docker-compose.yml not found in {honeypot_dir}")
-
-    # Build command
-    cmd = ["docker", "compose", action]
-    if action == "up":
-        cmd.append("-d")
-    if extra_args:
-        cmd.extend(extra_args)
-
-    return run_with_ephemeral_logs(cmd, honeypot_name, cwd=honeypot_dir, timeout=timeout, action=action)
+    finally:
+        if token is not None and process is not None:
+            token.discard(process)
+        if spill is not None:
+            spill.close()
 
 
 # Example usage and testing
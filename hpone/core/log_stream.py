@@ -0,0 +1,204 @@
+"""
+Multiplexed container log stream for HPone.
+
+`hpone logs [ids...|--all] -f` follows the containers of many honeypots at
+once. Every container gets a reader thread that pulls its log stream
+(Engine API with timestamps, `docker logs --timestamps` as fallback), splits
+it into lines and puts them on its own bounded queue. The calling thread
+merges: it drains the queues round-robin, at most QUOTA_LINES per source per round,
+holds lines for REORDER_WINDOW seconds to put them in Docker timestamp
+order, and prints them with a colored per-honeypot prefix.
+
+Backpressure: when a source produces faster than the terminal consumes, its
+queue fills up and its reader blocks, which stops reading from that socket
+(Docker keeps the rest in the container's log file). Quiet sources keep
+their share of every round, so one noisy sensor cannot starve the others.
+"""
+
+import heapq
+import itertools
+import queue
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from .docker_api import API_ERRORS, STREAM_STDOUT, get_client
+from .utils import COLOR_RESET
+
+QUEUE_LINES = 1000      # Buffered lines per source; a full queue pauses that source's reader
+QUOTA_LINES = 200       # Lines taken from each source per merge round
+REORDER_WINDOW = 0.25   # Seconds a line is held so later-arriving older lines sort before it
+
+# Prefix colors, assigned to sources in order
+_PREFIX_COLORS = (
+    "\033[36m", "\033[32m", "\033[33m", "\033[35m", "\033[34m",
+    "\033[96m", "\033[92m", "\033[93m", "\033[95m", "\033[94m",
+)
+
+
+@dataclass(frozen=True)
+class LogSource:
+    """One container to follow and the label shown in front of its lines."""
+    label: str
+    container: str
+
+
+def split_timestamp(line: bytes) -> Tuple[str, bytes]:
+    """
+    Split `<RFC3339Nano> <text>` into a sortable key and the text.
+
+    Docker trims trailing zeros of the fraction, so it is padded to 9 digits
+    to make keys compare correctly as strings. Lines without a timestamp
+    return an empty key.
+    """
+    stamp, sep, text = line.partition(b" ")
+    if not sep or len(stamp) < 20 or stamp[4:5] != b"-" or stamp[10:11] != b"T":
+        return "", line
+    try:
+        stamp_str = stamp.decode("ascii").rstrip("Z")
+    except UnicodeDecodeError:
+        return "", line
+    seconds, _dot, fraction = stamp_str.partition(".")
+    return f"{seconds}.{fraction[:9]:0<9}", text
+
+
+def _log_frames(container: str, tail: int, follow: bool) -> Iterator[Tuple[int, bytes]]:
+    """(stream_id, bytes) of a container's logs with timestamps, API first, CLI as fallback."""
+    client = get_client()
+    if client is not None:
+        try:
+            frames = client.logs(container, tail=tail, follow=follow, timestamps=True)
+            # Pull the first frame before yielding so request errors can still fall back
+            first = next(frames, None)
+        except API_ERRORS:
+            frames = None
+        if frames is not None:
+            if first is not None:
+                yield first
+                yield from frames
+            return
+
+    cmd = ["docker", "logs", "--timestamps", "--tail", str(tail)] + (["-f"] if follow else []) + [container]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    try:
+        for line in proc.stdout:
+            yield STREAM_STDOUT, line
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+class _Reader(threading.Thread):
+    """Reads one container's log stream into a bounded queue of (key, text) lines."""
+
+    def __init__(self, index: int, source: LogSource, tail: int, follow: bool, wakeup: threading.Event):
+        super().__init__(daemon=True, name=f"logs-{source.label}")
+        self.index = index
+        self.source = source
+        self.tail = tail
+        self.follow = follow
+        self.wakeup = wakeup
+        self.lines: "queue.Queue[Tuple[str, bytes]]" = queue.Queue(maxsize=QUEUE_LINES)
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+    def _put(self, key: str, text: bytes) -> None:
+        # Blocks while the queue is full: this is the backpressure on noisy sources
+        self.lines.put((key, text))
+        self.wakeup.set()
+
+    def run(self) -> None:
+        partial = {}
+        last_key = ""
+        try:
+            for stream_id, payload in _log_frames(self.source.container, self.tail, self.follow):
+                *complete, partial[stream_id] = (partial.get(stream_id, b"") + payload).split(b"\n")
+                for line in complete:
+                    key, text = split_timestamp(line.rstrip(b"\r"))
+                    # Continuation lines without a timestamp stay behind their predecessor
+                    last_key = key or last_key
+                    self._put(last_key, text)
+            for rest in partial.values():
+                if rest:
+                    key, text = split_timestamp(rest)
+                    self._put(key or last_key, text)
+        except Exception as exc:  # noqa: BLE001 - reported by the merger
+            self.error = exc
+        finally:
+            self.done = True
+            self.wakeup.set()
+
+
+def stream_logs(sources: List[LogSource], tail: int = 20, follow: bool = True,
+                out: Optional[BinaryIO] = None, color: Optional[bool] = None) -> None:
+    """
+    Print the logs of several containers merged into one timestamp-ordered stream.
+
+    Args:
+        sources: Containers to read, with their prefix labels
+        tail: Lines of history per container before following
+        follow: Keep streaming new lines (until Ctrl+C or every container stops)
+        out: Binary output stream (default: sys.stdout.buffer)
+        color: Colored prefixes (default: when the output is a terminal)
+    """
+    out = out or sys.stdout.buffer
+    if color is None:
+        color = sys.stdout.isatty()
+
+    width = max((len(s.label) for s in sources), default=0)
+    prefixes = []
+    for index, source in enumerate(sources):
+        label = source.label.ljust(width)
+        if color:
+            label = f"{_PREFIX_COLORS[index % len(_PREFIX_COLORS)]}{label}{COLOR_RESET}"
+        prefixes.append(f"{label} | ".encode("utf-8"))
+
+    wakeup = threading.Event()
+    readers = [_Reader(i, s, tail, follow, wakeup) for i, s in enumerate(sources)]
+    for reader in readers:
+        reader.start()
+
+    held: List[Tuple[str, int, float, int, bytes]] = []
+    order = itertools.count()
+    reported = set()
+    while True:
+        wakeup.clear()
+        now = time.monotonic()
+        pending = False
+        # Round-robin with a quota so every source gets its share of each round
+        for reader in readers:
+            for _ in range(QUOTA_LINES):
+                try:
+                    key, text = reader.lines.get_nowait()
+                except queue.Empty:
+                    break
+                heapq.heappush(held, (key, next(order), now, reader.index, text))
+            else:
+                pending = True
+
+        finished = all(r.done and r.lines.empty() for r in readers)
+        release_before = now - REORDER_WINDOW
+        chunk = []
+        while held and (finished or held[0][2] <= release_before):
+            _key, _order, _arrival, index, text = heapq.heappop(held)
+            chunk.append(prefixes[index] + text + b"\n")
+
+        for reader in readers:
+            if reader.index in reported or not (reader.done and reader.lines.empty()) or not (follow or reader.error):
+                continue
+            # After its last held line
+            if not any(entry[3] == reader.index for entry in held):
+                reported.add(reader.index)
+                reason = f": {reader.error}" if reader.error else ""
+                chunk.append(prefixes[reader.index] + f"-- log stream ended{reason}\n".encode("utf-8"))
+
+        if chunk:
+            out.write(b"".join(chunk))
+            out.flush()
+        if finished and not held:
+            return
+        if not pending:
+            wakeup.wait(REORDER_WINDOW / 2 if held else 1.0)
@@ -0,0 +1,141 @@
+"""
+Memory-mapped, lazily line-indexed view of a (possibly growing) file.
+
+Honeypot data files such as cowrie.json reach hundreds of megabytes. The
+viewer and search of `hpone logs` read them through MappedFile instead of
+loading them: the file is mmap'ed and only the pages that are looked at are
+touched. Line numbers are resolved with a sparse index that stores the
+number of newlines before each BLOCK_SIZE block, built block by block only
+as far as a lookup needs, so the index for a 500 MB file is a few thousand
+integers.
+"""
+
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+BLOCK_SIZE = 256 * 1024   # Bytes per index block; a lookup scans at most one block
+
+
+class MappedFile:
+    """
+    Read-only mmap of a file with line lookups.
+
+    Lines are numbered from 0. Call refresh() to pick up appended data (the
+    index is kept) or truncation/rotation (the index is rebuilt).
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self.map: Optional[mmap.mmap] = None
+        self.size = 0
+        # _blocks[i]: newlines before offset i * BLOCK_SIZE (only for fully counted blocks)
+        self._blocks = array("q", [0])
+        self.refresh()
+
+    def __enter__(self) -> "MappedFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def close(self) -> None:
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self._file.close()
+
+    def refresh(self) -> bool:
+        """Remap when the file size changed; returns True when it did."""
+        size = os.fstat(self._file.fileno()).st_size
+        if size == self.size:
+            return False
+        if size < self.size:
+            # Truncated or rotated in place: earlier counts no longer hold
+            self._blocks = array("q", [0])
+        if self.map is not None:
+            self.map.close()
+        self.map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ) if size else None
+        self.size = size
+        return True
+
+    # ---- index --------------------------------------------------------
+
+    def _count_newlines(self, start: int, end: int) -> int:
+        # Counted with plain reads: going through the map would leave every
+        # counted page resident in this process
+        self._file.seek(start)
+        return self._file.read(end - start).count(b"\n")
+
+    def _extend_index(self, until_newlines: Optional[int] = None) -> None:
+        """Count full blocks until `until_newlines` newlines are covered (None: all of them)."""
+        blocks = self._blocks
+        while (len(blocks) * BLOCK_SIZE <= self.size
+               and (until_newlines is None or blocks[-1] < until_newlines)):
+            start = (len(blocks) - 1) * BLOCK_SIZE
+            blocks.append(blocks[-1] + self._count_newlines(start, start + BLOCK_SIZE))
+
+    def line_offset(self, line: int) -> Optional[int]:
+        """Byte offset where `line` starts, or None past the last line."""
+        if line < 0 or not self.size:
+            return None
+        if line == 0:
+            return 0
+        self._extend_index(line)
+        # Last block that starts before the line's preceding newline
+        block = bisect_left(self._blocks, line) - 1
+        pos = block * BLOCK_SIZE
+        for _ in range(line - self._blocks[block]):
+            found = self.map.find(b"\n", pos)
+            if found < 0:
+                return None
+            pos = found + 1
+        return pos if pos < self.size else None
+
+    def line_count(self) -> int:
+        """Number of lines (indexes the whole file once; later calls only count appended data)."""
+        if not self.size:
+            return 0
+        self._extend_index()
+        tail_start = (len(self._blocks) - 1) * BLOCK_SIZE
+        count = self._blocks[-1] + self._count_newlines(tail_start, self.size)
+        return count + (0 if self.map[self.size - 1] == 0x0A else 1)
+
+    def line_number_at(self, offset: int) -> int:
+        """Number of the line containing byte `offset`."""
+        offset = max(0, min(offset, self.size))
+        block = offset // BLOCK_SIZE
+        while len(self._blocks) <= block:
+            self._extend_index(self._blocks[-1] + 1)
+        start = block * BLOCK_SIZE
+        return self._blocks[block] + self._count_newlines(start, offset)
+
+    # ---- reading ------------------------------------------------------
+
+    def iter_lines(self, start: int = 0, offset: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+        """(offset, raw line without newline) from line `start` (or byte `offset`) to the end."""
+        pos = self.line_offset(start) if offset is None else offset
+        if pos is None:
+            return
+        while pos < self.size:
+            end = self.map.find(b"\n", pos)
+            if end < 0:
+                end = self.size
+            yield pos, self.map[pos:end]
+            pos = end + 1
+
+    def lines(self, start: int, count: int) -> List[bytes]:
+        """Up to `count` raw lines starting at line `start`."""
+        result: List[bytes] = []
+        for _offset, line in self.iter_lines(start):
+            if len(result) >= count:
+                break
+            result.append(line)
+        return result
@@ -0,0 +1,73 @@
+"""
+Machine-readable output for HPone.
+
+`list`, `status` and `inspect` accept `--output json|ndjson|csv`. Their
+records are plain dicts built straight from the manifests and container
+state (no ANSI, no table layout) and are written as they are produced:
+
+  json    one JSON array, elements written one by one
+  ndjson  one JSON object per line
+  csv     header row plus one row per record; lists are joined with ";"
+          (objects inside them as "a:b"), mappings are written as "key=value"
+"""
+
+import csv
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+OUTPUT_FORMATS = ("table", "json", "ndjson", "csv")
+
+
+def _csv_value(value: Any, nested: bool = False) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, dict):
+        if nested:
+            return ":".join(_csv_value(v, True) for v in value.values())
+        return ";".join(f"{k}={_csv_value(v, True)}" for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return ";".join(_csv_value(v, True) for v in value)
+    return str(value)
+
+
+def write_records(records: Iterable[Dict[str, Any]], output_format: str, fields: List[str],
+                  stream: Optional[TextIO] = None, single: bool = False) -> int:
+    """
+    Write records in a machine-readable format and return how many were written.
+
+    Args:
+        records: Dicts to write (consumed lazily)
+        output_format: json, ndjson or csv
+        fields: Keys of every record, in output order (csv header)
+        stream: Target stream (default: sys.stdout)
+        single: The output describes one object (json writes it without the array)
+    """
+    out = stream or sys.stdout
+    count = 0
+    if output_format == "ndjson":
+        for record in records:
+            out.write(json.dumps({f: record.get(f) for f in fields}, ensure_ascii=False) + "\n")
+            count += 1
+    elif output_format == "json" and single:
+        for record in records:
+            out.write(json.dumps({f: record.get(f) for f in fields}, ensure_ascii=False, indent=2) + "\n")
+            count += 1
+    elif output_format == "json":
+        out.write("[")
+        for record in records:
+            out.write(("\n  " if count == 0 else ",\n  ") + json.dumps({f: record.get(f) for f in fields}, ensure_ascii=False))
+            count += 1
+        out.write("\n]\n" if count else "]\n")
+    elif output_format == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(fields)
+        for record in records:
+            writer.writerow([_csv_value(record.get(f)) for f in fields])
+            count += 1
+    else:
+        raise ValueError(f"Unknown output format: {output_format}")
+    out.flush()
+    return count
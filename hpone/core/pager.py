@@ -0,0 +1,241 @@
+"""
+Built-in pager for honeypot data files.
+
+`page_file` shows a file one screen at a time through MappedFile, so only
+the shown pages are read and memory does not depend on the file size.
+
+Keys:
+  Space, PgDn, f     next page             b, PgUp        previous page
+  j, Down, Enter     next line             k, Up          previous line
+  g, Home            first line            G, End         last page
+  :                  jump to line          F              follow (Ctrl+C stops)
+  q, Esc             quit
+
+When stdin or stdout is not a terminal the file is copied to stdout in
+chunks instead.
+"""
+
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .mapped_file import MappedFile
+from .utils import COLOR_GRAY, COLOR_RESET
+
+FOLLOW_INTERVAL = 0.5        # Seconds between size checks in follow mode
+FOLLOW_MAX_CHUNK = 1 << 20   # Bytes printed per check, so a burst cannot stall Ctrl+C
+
+_ENTER_SCREEN = "\033[?1049h\033[H"
+_LEAVE_SCREEN = "\033[?1049l"
+_CLEAR = "\033[2J\033[H"
+
+# Escape sequences (POSIX) and scan codes (Windows) of the navigation keys
+_ESCAPE_KEYS = {
+    b"\x1b[5~": "pgup", b"\x1b[6~": "pgdn",
+    b"\x1b[A": "up", b"\x1b[B": "down",
+    b"\x1b[H": "home", b"\x1b[1~": "home", b"\x1bOH": "home",
+    b"\x1b[F": "end", b"\x1b[4~": "end", b"\x1bOF": "end",
+}
+_WINDOWS_KEYS = {"I": "pgup", "Q": "pgdn", "H": "up", "P": "down", "G": "home", "O": "end"}
+
+
+def _read_key() -> str:
+    """Read one key press without waiting for Enter."""
+    if os.name == "nt":
+        import msvcrt
+        key = msvcrt.getwch()
+        if key in ("\x00", "\xe0"):
+            return _WINDOWS_KEYS.get(msvcrt.getwch(), "")
+        return key
+
+    import select
+    import termios
+    import tty
+
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    try:
+        # cbreak keeps ISIG, so Ctrl+C still raises KeyboardInterrupt
+        tty.setcbreak(fd)
+        key = os.read(fd, 1)
+        if key != b"\x1b":
+            return key.decode("utf-8", "ignore")
+        # Rest of an escape sequence, if any arrives right behind the ESC
+        while select.select([fd], [], [], 0.03)[0]:
+            key += os.read(fd, 1)
+            if len(key) > 2 and 0x40 <= key[-1] <= 0x7E or len(key) >= 6:
+                break
+        return _ESCAPE_KEYS.get(key, "esc")
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+
+def _render(line: bytes, width: int) -> str:
+    text = line.rstrip(b"\r").decode("utf-8", "replace").expandtabs(8)
+    # Raw control characters (ANSI from the logged data) would corrupt the page
+    if any(ch < " " for ch in text):
+        text = "".join(ch if ch >= " " else "?" for ch in text)
+    return text[:width]
+
+
+class _Pager:
+    def __init__(self, mapped: MappedFile):
+        self.mapped = mapped
+        self.top = 0
+        self.message = ""
+
+    @staticmethod
+    def _screen() -> tuple:
+        size = shutil.get_terminal_size((80, 24))
+        return max(1, size.lines - 1), max(20, size.columns)
+
+    def _page(self, height: int) -> List[bytes]:
+        return self.mapped.lines(self.top, height)
+
+    def draw(self) -> None:
+        height, columns = self._screen()
+        lines = self._page(height)
+        gutter = len(str(self.top + height))
+        buf = [_CLEAR]
+        for number, line in enumerate(lines, self.top + 1):
+            buf.append(f"{COLOR_GRAY}{number:>{gutter}}{COLOR_RESET} {_render(line, columns - gutter - 1)}\n")
+        buf.append("~\n" * (height - len(lines)))
+        first, last = self.top + 1, self.top + len(lines)
+        percent = 100 if not self.mapped.size else (self._end_offset(lines) * 100 // self.mapped.size)
+        status = self.message or "Space/b page  j/k line  g/G top/end  : line  F follow  q quit"
+        status = f" {self.mapped.path.name}  {first}-{last}  {percent}%  {status} "
+        buf.append(f"\033[7m{status[:columns]}\033[0m")
+        sys.stdout.write("".join(buf))
+        sys.stdout.flush()
+        self.message = ""
+
+    def _end_offset(self, lines: List[bytes]) -> int:
+        start = self.mapped.line_offset(self.top) or 0
+        return min(self.mapped.size, start + sum(len(line) + 1 for line in lines))
+
+    def _last_top(self, height: int) -> int:
+        return max(0, self.mapped.line_count() - height)
+
+    def scroll(self, delta: int) -> None:
+        height, _columns = self._screen()
+        target = max(0, self.top + delta)
+        if delta > 0 and self.mapped.line_offset(target) is None:
+            # Past the end: show the last page instead of an empty one
+            target = max(self.top, self._last_top(height))
+        self.top = target
+
+    def jump(self) -> None:
+        sys.stdout.write("\r\033[2K:")
+        sys.stdout.flush()
+        try:
+            answer = input().strip()
+        except EOFError:
+            return
+        if not answer:
+            return
+        try:
+            line = int(answer)
+        except ValueError:
+            self.message = f"Not a line number: {answer}"
+            return
+        self.goto(line)
+
+    def goto(self, line: int) -> None:
+        """Put 1-based `line` at the top (the last page when the file is shorter)."""
+        self.top = max(0, line - 1)
+        if self.mapped.line_offset(self.top) is None:
+            self.top = self._last_top(self._screen()[0])
+            self.message = f"File has {self.mapped.line_count()} lines"
+
+    def follow(self) -> None:
+        """Print appended lines as they arrive (like tail -f) until Ctrl+C."""
+        height, columns = self._screen()
+        self.mapped.refresh()
+        self.top = self._last_top(height)
+        sys.stdout.write(_CLEAR)
+        for line in self._page(height):
+            sys.stdout.write(_render(line, columns) + "\n")
+        sys.stdout.write(f"{COLOR_GRAY}-- following {self.mapped.path.name}, Ctrl+C to stop --{COLOR_RESET}\n")
+        sys.stdout.flush()
+
+        pos = self.mapped.size
+        try:
+            while True:
+                self.mapped.refresh()
+                if self.mapped.size < pos:
+                    # Rotated or truncated: start over from the beginning
+                    pos = 0
+                limit = min(self.mapped.size, pos + FOLLOW_MAX_CHUNK)
+                end = self.mapped.map.rfind(b"\n", pos, limit) if limit > pos else -1
+                if end < 0 and limit - pos < FOLLOW_MAX_CHUNK:
+                    # Nothing new, or only an unfinished line
+                    time.sleep(FOLLOW_INTERVAL)
+                    continue
+                # A line longer than FOLLOW_MAX_CHUNK is printed in pieces
+                next_pos = end + 1 if end >= 0 else limit
+                for line in self.mapped.map[pos:end if end >= 0 else limit].split(b"\n"):
+                    sys.stdout.write(_render(line, columns) + "\n")
+                sys.stdout.flush()
+                pos = next_pos
+        except KeyboardInterrupt:
+            pass
+        self.top = self._last_top(self._screen()[0])
+
+    def run(self) -> None:
+        while True:
+            # Appended data becomes visible on the next key press
+            self.mapped.refresh()
+            self.draw()
+            key = _read_key()
+            height, _columns = self._screen()
+            if key in ("q", "Q", "esc"):
+                return
+            if key in (" ", "pgdn", "f"):
+                self.scroll(height)
+            elif key in ("b", "pgup"):
+                self.scroll(-height)
+            elif key in ("j", "down", "\n", "\r"):
+                self.scroll(1)
+            elif key in ("k", "up"):
+                self.scroll(-1)
+            elif key in ("g", "home", "<"):
+                self.top = 0
+            elif key in ("G", "end", ">"):
+                self.top = self._last_top(height)
+            elif key == ":":
+                self.jump()
+            elif key == "F":
+                self.follow()
+
+
+def page_file(path: Union[str, Path], start_line: Optional[int] = None) -> None:
+    """
+    Show a file in the built-in pager (or copy it to stdout when not on a terminal).
+
+    Args:
+        path: File to show
+        start_line: 1-based line to open at (default: the first line)
+    """
+    path = Path(path)
+    if not (sys.stdin.isatty() and sys.stdout.isatty()):
+        with open(path, "rb") as f:
+            sys.stdout.flush()
+            shutil.copyfileobj(f, sys.stdout.buffer, 1 << 20)
+        sys.stdout.buffer.flush()
+        return
+
+    with MappedFile(path) as mapped:
+        pager = _Pager(mapped)
+        if start_line:
+            pager.goto(start_line)
+        sys.stdout.write(_ENTER_SCREEN)
+        try:
+            pager.run()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sys.stdout.write(_LEAVE_SCREEN)
+            sys.stdout.flush()
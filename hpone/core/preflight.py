@@ -0,0 +1,130 @@
+"""
+Preflight cache for HPone.
+
+`require_dependencies` and the Docker permission check fork up to four CLI
+probes (`docker --version`, `docker-compose --version`, `docker compose
+version`, `docker info`) before every command. Their successful results are
+stored in CACHE_DIR/preflight.json together with a fingerprint of everything
+they depend on:
+
+  - resolved paths and mtimes of `docker`, `docker-compose` and the compose
+    CLI plugin,
+  - the daemon socket (path, inode, owner, mode),
+  - the user's uid and groups.
+
+An entry is reused while the fingerprint is unchanged and it is younger than
+PREFLIGHT_TTL seconds. Failures are never cached so their hints are always
+printed; `hpone check` clears the cache and probes again.
+"""
+
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, Optional
+
+from .constants import CACHE_DIR
+
+try:
+    from config import PREFLIGHT_TTL
+except ImportError:
+    PREFLIGHT_TTL = 300
+
+PREFLIGHT_CACHE_FILE = CACHE_DIR / "preflight.json"
+PREFLIGHT_CACHE_VERSION = 1
+
+# Where the `docker compose` v2 plugin is installed (user first, like the CLI)
+_COMPOSE_PLUGIN_DIRS = (
+    os.path.join(os.path.expanduser("~"), ".docker", "cli-plugins"),
+    "/usr/local/lib/docker/cli-plugins",
+    "/usr/local/libexec/docker/cli-plugins",
+    "/usr/lib/docker/cli-plugins",
+    "/usr/libexec/docker/cli-plugins",
+)
+
+
+def _file_stamp(path: Optional[str]) -> Optional[list]:
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [os.path.realpath(path), st.st_mtime_ns, st.st_size]
+
+
+def preflight_fingerprint() -> Dict[str, Any]:
+    """Cheap (stat-only) fingerprint of the environment the probes depend on."""
+    from .docker_api import socket_path_from_env
+
+    plugin = next((p for p in (os.path.join(d, "docker-compose") for d in _COMPOSE_PLUGIN_DIRS)
+                   if os.path.exists(p)), None)
+    socket_path = socket_path_from_env()
+    socket_stamp = None
+    if socket_path:
+        try:
+            st = os.stat(socket_path)
+            socket_stamp = [socket_path, st.st_ino, st.st_uid, st.st_gid, st.st_mode]
+        except OSError:
+            socket_stamp = None
+    return {
+        "docker": _file_stamp(shutil.which("docker")),
+        "docker-compose": _file_stamp(shutil.which("docker-compose")),
+        "compose-plugin": _file_stamp(plugin),
+        "docker-host": os.environ.get("DOCKER_HOST", ""),
+        "socket": socket_stamp,
+        "uid": os.getuid(),
+        "groups": sorted(os.getgroups()),
+    }
+
+
+def _read_cache() -> Dict[str, Any]:
+    try:
+        with PREFLIGHT_CACHE_FILE.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != PREFLIGHT_CACHE_VERSION:
+        return {}
+    return data
+
+
+def cached_preflight(key: str) -> Optional[Any]:
+    """Return a cached probe result, or None when missing, expired or the environment changed."""
+    if PREFLIGHT_TTL <= 0:
+        return None
+    data = _read_cache()
+    entry = (data.get("entries") or {}).get(key)
+    if not isinstance(entry, dict) or time.time() - entry.get("at", 0) > PREFLIGHT_TTL:
+        return None
+    if data.get("fingerprint") != preflight_fingerprint():
+        return None
+    return entry.get("value")
+
+
+def store_preflight(key: str, value: Any) -> None:
+    """Remember a successful probe result for the current environment."""
+    if PREFLIGHT_TTL <= 0:
+        return
+    fingerprint = preflight_fingerprint()
+    data = _read_cache()
+    entries = data.get("entries") if data.get("fingerprint") == fingerprint else None
+    entries = dict(entries or {})
+    entries[key] = {"value": value, "at": time.time()}
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = PREFLIGHT_CACHE_FILE.with_name(f"{PREFLIGHT_CACHE_FILE.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump({"version": PREFLIGHT_CACHE_VERSION, "fingerprint": fingerprint, "entries": entries}, f)
+        os.replace(tmp_path, PREFLIGHT_CACHE_FILE)
+    except OSError:
+        # Cache is best-effort (e.g. read-only home)
+        pass
+
+
+def clear_preflight() -> None:
+    """Forget every cached probe result (`hpone check`)."""
+    try:
+        PREFLIGHT_CACHE_FILE.unlink()
+    except OSError:
+        pass
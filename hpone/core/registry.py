@@ -0,0 +1,259 @@
+"""
+Manifest registry for HPone.
+
+Index of `honeypots/*.yml`: the directory is listed once (and again only
+when its mtime changes), ids and lowercase `name:` values map to paths, and
+parsed documents are cached by (path, mtime_ns, size). Lookups that used to
+glob and parse every manifest become dictionary hits plus a stat().
+
+The index and documents are also persisted to CACHE_DIR/manifests.bin
+(marshal-encoded) so short-lived commands and shell completion skip PyYAML
+entirely while nothing changed. Every entry is re-validated against the
+directory and file stat tuples before use, so stale data is never served.
+"""
+
+import copy
+import marshal
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .constants import HONEYPOT_MANIFEST_DIR, CACHE_DIR
+
+_Stamp = Tuple[int, int]
+
+MANIFEST_CACHE_FILE = CACHE_DIR / "manifests.bin"
+MANIFEST_CACHE_VERSION = 1
+
+
+class ManifestRegistry:
+    """Cached id/name index and parsed documents of a manifest directory."""
+
+    def __init__(self, manifest_dir: Path = HONEYPOT_MANIFEST_DIR, cache_file: Optional[Path] = None):
+        self.manifest_dir = Path(manifest_dir)
+        self.cache_file = cache_file
+        self._lock = threading.RLock()
+        self._dir_stamp: Optional[_Stamp] = None
+        self._paths: Dict[str, Path] = {}
+        self._documents: Dict[Path, Tuple[_Stamp, Any]] = {}
+        self._names: Dict[str, Path] = {}
+        self._names_stamp: Optional[Tuple[Tuple[Path, _Stamp], ...]] = None
+        self._dirty = False
+        self._loaded = cache_file is None
+
+    # ---- persistent cache ---------------------------------------------
+
+    def _load_cache(self) -> None:
+        """Seed the index and documents from the on-disk cache (once)."""
+        self._loaded = True
+        try:
+            with open(self.cache_file, "rb") as f:
+                state = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if not isinstance(state, dict) or state.get("version") != MANIFEST_CACHE_VERSION \
+                or state.get("dir") != str(self.manifest_dir):
+            return
+        try:
+            self._dir_stamp = tuple(state["dir_stamp"]) if state.get("dir_stamp") else None
+            self._paths = {stem: self.manifest_dir / f"{stem}.yml" for stem in state["ids"]}
+            for stem, (mtime_ns, size, data) in state["documents"].items():
+                self._documents[self.manifest_dir / f"{stem}.yml"] = ((mtime_ns, size), data)
+        except (KeyError, TypeError, ValueError):
+            self._dir_stamp = None
+            self._paths = {}
+            self._documents = {}
+
+    def _flush(self) -> None:
+        """Write the cache back when something was (re)parsed or invalidated."""
+        if not self._dirty or self.cache_file is None:
+            return
+        self._dirty = False
+        documents = {
+            path.stem: (stamp[0], stamp[1], data)
+            for path, (stamp, data) in self._documents.items()
+            if not isinstance(data, Exception)
+        }
+        state = {
+            "version": MANIFEST_CACHE_VERSION,
+            "dir": str(self.manifest_dir),
+            "dir_stamp": self._dir_stamp,
+            "ids": list(self._paths),
+            "documents": documents,
+        }
+        try:
+            payload = marshal.dumps(state)
+        except ValueError:
+            # A manifest holds a type marshal can't encode (e.g. a YAML timestamp)
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.cache_file)
+        except OSError:
+            # Cache is best-effort (e.g. read-only home)
+            pass
+
+    # ---- index --------------------------------------------------------
+
+    def _scan(self) -> None:
+        """Re-list the directory when entries were added, removed or renamed."""
+        if not self._loaded:
+            self._load_cache()
+        try:
+            st = os.stat(self.manifest_dir)
+            dir_stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            dir_stamp = None
+        if dir_stamp == self._dir_stamp and dir_stamp is not None:
+            return
+        paths: Dict[str, Path] = {}
+        if dir_stamp is not None:
+            with os.scandir(self.manifest_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".yml") and entry.is_file():
+                        paths[entry.name[:-len(".yml")]] = Path(entry.path)
+        self._paths = dict(sorted(paths.items()))
+        known = set(paths.values())
+        self._documents = {p: doc for p, doc in self._documents.items() if p in known}
+        self._names_stamp = None
+        self._dir_stamp = dir_stamp
+        self._dirty = True
+
+    def ids(self) -> List[str]:
+        """Return all manifest ids (file stems), sorted."""
+        with self._lock:
+            self._scan()
+            self._flush()
+            return list(self._paths)
+
+    def paths(self) -> List[Path]:
+        with self._lock:
+            self._scan()
+            self._flush()
+            return list(self._paths.values())
+
+    def _name_index(self) -> Dict[str, Path]:
+        stamps = tuple((p, self._stamp(p)) for p in self._paths.values())
+        if stamps != self._names_stamp:
+            names: Dict[str, Path] = {}
+            for path in self._paths.values():
+                try:
+                    data = self.document(path)
+                except Exception:
+                    continue
+                if not isinstance(data, dict):
+                    continue
+                name = str(data.get("name", "")).lower()
+                if name:
+                    names.setdefault(name, path)
+            self._names = names
+            self._names_stamp = stamps
+        return self._names
+
+    def path(self, honeypot_id: str) -> Optional[Path]:
+        """Resolve a honeypot by file stem, then by `name:` (case-insensitive)."""
+        with self._lock:
+            self._scan()
+            explicit = self._paths.get(honeypot_id)
+            if explicit is None:
+                explicit = self._name_index().get(honeypot_id.lower())
+            self._flush()
+            return explicit
+
+    # ---- documents ----------------------------------------------------
+
+    @staticmethod
+    def _stamp(path: Path) -> Optional[_Stamp]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def document(self, path: Path) -> Dict[str, Any]:
+        """
+        Return the parsed manifest at `path` (shared, do not mutate).
+        Raises the parse error when the file is not valid YAML.
+        """
+        return self._document(path, flush=True)
+
+    def _document(self, path: Path, flush: bool) -> Any:
+        """document(); with flush=False a re-parse leaves the cache write to the caller."""
+        with self._lock:
+            if not self._loaded:
+                self._load_cache()
+            stamp = self._stamp(path)
+            if stamp is None:
+                self._documents.pop(path, None)
+                raise FileNotFoundError(f"Manifest not found: {path}")
+            cached = self._documents.get(path)
+            if cached is None or cached[0] != stamp:
+                # PyYAML is only imported on a cache miss
+                from . import yaml_io
+                try:
+                    with path.open("r", encoding="utf-8") as f:
+                        data: Any = yaml_io.safe_load(f) or {}
+                except Exception as exc:
+                    data = exc
+                cached = (stamp, data)
+                self._documents[path] = cached
+                self._dirty = True
+                if flush:
+                    self._flush()
+            if isinstance(cached[1], Exception):
+                raise cached[1]
+            return cached[1]
+
+    def load(self, honeypot_id: str) -> Optional[Tuple[str, Path, Dict[str, Any]]]:
+        """Return (resolved_name, path, private copy of the document), or None if unknown."""
+        path = self.path(honeypot_id)
+        if path is None:
+            return None
+        data = copy.deepcopy(self.document(path))
+        return str(data.get("name") or honeypot_id), path, data
+
+    def entries(self) -> List[Tuple[str, Path, Dict[str, Any]]]:
+        """Return (id, path, document) for every manifest; unparsable or non-mapping files give {}."""
+        result: List[Tuple[str, Path, Dict[str, Any]]] = []
+        with self._lock:
+            self._scan()
+            for honeypot_id, path in self._paths.items():
+                # Write the cache once for the whole listing, not per parsed file
+                try:
+                    data = self._document(path, flush=False)
+                except Exception:
+                    data = {}
+                if not isinstance(data, dict):
+                    data = {}
+                result.append((honeypot_id, path, data))
+            self._flush()
+        return result
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Drop cached state for one manifest (after writing it) or everything."""
+        with self._lock:
+            if path is None:
+                self._dir_stamp = None
+                self._documents.clear()
+            else:
+                self._documents.pop(Path(path), None)
+            self._names_stamp = None
+            self._dirty = True
+            self._flush()
+
+
+_REGISTRY: Optional[ManifestRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> ManifestRegistry:
+    """Return the process-wide registry for HONEYPOT_MANIFEST_DIR."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = ManifestRegistry(HONEYPOT_MANIFEST_DIR, cache_file=MANIFEST_CACHE_FILE)
+        return _REGISTRY
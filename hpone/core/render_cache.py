@@ -0,0 +1,117 @@
+"""
+Render cache for HPone.
+
+Rendering docker/<id>/docker-compose.yml means a PyYAML parse of the template
+compose file, the `rewrite_compose_with_env` changes and a PyYAML dump. The
+result only depends on the template compose content, the honeypot ID/name and
+the manifest keys the rewrite reads, so it is cached under that key:
+
+  - in memory, the parsed template per compose hash (shared by honeypots that
+    point at the same template via `template_dir`);
+  - on disk, the rendered compose text under CACHE_DIR/render/<key>.yml,
+    reused by later imports and processes.
+
+`.env` is not cached: it expands host paths against the current environment
+and is built without YAML, so rendering it is already cheap.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import yaml_io
+
+from .constants import CACHE_DIR
+from .config import apply_compose_env
+
+# Bump when apply_compose_env output changes for the same inputs
+RENDER_CACHE_VERSION = 1
+
+RENDER_CACHE_DIR = CACHE_DIR / "render"
+
+# Manifest keys read by apply_compose_env
+_RENDER_KEYS = ("ports", "volumes", "env", "image", "service", "services")
+
+_PARSED_TEMPLATES: Dict[str, Any] = {}
+_RENDERED: Dict[str, str] = {}
+_LOCK = threading.Lock()
+
+
+def render_cache_key(template_sha: str, honeypot_id: str, honeypot_name: str, config: Dict[str, Any]) -> str:
+    """Key of a rendered compose file: template hash plus the normalized manifest."""
+    payload = json.dumps({
+        "version": RENDER_CACHE_VERSION,
+        "template": template_sha,
+        "id": honeypot_id,
+        "name": honeypot_name,
+        "config": {k: config.get(k) for k in _RENDER_KEYS if k in config},
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load_rendered(key: str) -> Optional[str]:
+    with _LOCK:
+        if key in _RENDERED:
+            return _RENDERED[key]
+    try:
+        text = (RENDER_CACHE_DIR / f"{key}.yml").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    with _LOCK:
+        _RENDERED[key] = text
+    return text
+
+
+def _store_rendered(key: str, text: str) -> None:
+    with _LOCK:
+        _RENDERED[key] = text
+    path = RENDER_CACHE_DIR / f"{key}.yml"
+    try:
+        RENDER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        # Cache is best-effort (e.g. read-only home)
+        pass
+
+
+def _parse_template(template_sha: str, text: str) -> Any:
+    with _LOCK:
+        parsed = _PARSED_TEMPLATES.get(template_sha)
+    if parsed is None:
+        parsed = yaml_io.safe_load(text) or {}
+        with _LOCK:
+            _PARSED_TEMPLATES[template_sha] = parsed
+    # apply_compose_env mutates its input
+    return copy.deepcopy(parsed)
+
+
+def render_compose(template_text: str, honeypot_id: str, honeypot_name: str, config: Dict[str, Any]) -> str:
+    """Return the rendered compose text for a honeypot, from cache when possible."""
+    template_sha = hashlib.sha256(template_text.encode("utf-8")).hexdigest()
+    key = render_cache_key(template_sha, honeypot_id, honeypot_name, config)
+    cached = _load_rendered(key)
+    if cached is not None:
+        return cached
+
+    compose_data = _parse_template(template_sha, template_text)
+    if apply_compose_env(compose_data, honeypot_id, honeypot_name, config):
+        rendered = yaml_io.safe_dump(compose_data)
+    else:
+        rendered = template_text
+    _store_rendered(key, rendered)
+    return rendered
+
+
+def render_compose_file(template_compose: Path, dest_dir: Path, honeypot_id: str, honeypot_name: str,
+                        config: Dict[str, Any]) -> None:
+    """Write docker/<id>/docker-compose.yml rendered from the template compose file."""
+    if not template_compose.exists():
+        return
+    rendered = render_compose(template_compose.read_text(encoding="utf-8"), honeypot_id, honeypot_name, config)
+    (dest_dir / "docker-compose.yml").write_text(rendered, encoding="utf-8")
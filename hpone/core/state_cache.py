@@ -0,0 +1,280 @@
+"""
+Live container state cache for HPone.
+
+Long-running processes (the web dashboard, the daemon) subscribe once to the
+Docker events stream, filtered on the `hpone=true` label, and keep an
+in-memory map of honeypot containers. Lookups are then dictionary hits
+instead of Docker round-trips. Short-lived CLI commands that never start the
+cache get a one-shot FleetState snapshot from `current_fleet()`.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional
+
+from .docker_api import DockerClient, EventStream, get_client, API_ERRORS
+from .fleet import FleetState, ContainerState, HPONE_LABEL, COMPOSE_SERVICE_LABEL, honeypot_of
+
+# Container event actions mapped to the state they leave the container in
+_ACTION_STATES = {
+    "create": "created",
+    "start": "running",
+    "restart": "running",
+    "unpause": "running",
+    "pause": "paused",
+    "die": "exited",
+    "stop": "exited",
+    "kill": None,  # followed by "die", which carries the exit code
+    "oom": None,
+}
+
+
+@dataclass(frozen=True)
+class ContainerRecord:
+    """Cached state of one honeypot container."""
+    container_id: str
+    name: str
+    project: str
+    service: str
+    state: str
+    started_at: str = ""
+    exit_code: Optional[int] = None
+    # Docker's RestartCount: restarts by the restart policy since the last manual start
+    restart_count: int = 0
+    updated_at: float = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self.state == "running"
+
+
+def _record_from_inspect(data: Dict[str, Any]) -> Optional[ContainerRecord]:
+    labels = (data.get("Config") or {}).get("Labels") or {}
+    project = honeypot_of(labels)
+    if not project:
+        return None
+    state = data.get("State") or {}
+    return ContainerRecord(
+        container_id=str(data.get("Id") or ""),
+        name=str(data.get("Name") or "").lstrip("/"),
+        project=project,
+        service=labels.get(COMPOSE_SERVICE_LABEL, ""),
+        state=str(state.get("Status") or ""),
+        started_at=str(state.get("StartedAt") or ""),
+        exit_code=state.get("ExitCode"),
+        restart_count=int(data.get("RestartCount") or 0),
+        updated_at=time.time(),
+    )
+
+
+class StateCache:
+    """In-memory honeypot container state kept current by `docker events`."""
+
+    def __init__(self, client: DockerClient):
+        self.client = client
+        self._lock = threading.Lock()
+        self._records: Dict[str, ContainerRecord] = {}
+        self._by_project: Dict[str, Dict[str, ContainerRecord]] = {}
+        self._live = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._events: Optional[EventStream] = None
+
+    @property
+    def live(self) -> bool:
+        """True while the event subscription is connected and the map is current."""
+        return self._live
+
+    # ---- lifecycle ----------------------------------------------------
+
+    def start(self) -> "StateCache":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="hpone-state-cache", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._live = False
+        # Unblock the thread waiting for the next event
+        events = self._events
+        if events is not None:
+            events.close()
+
+    def wait_live(self, timeout: float = 2.0) -> bool:
+        """Block until the first seed finished (or timeout)."""
+        deadline = time.time() + timeout
+        while not self._live and time.time() < deadline and not self._stop.is_set():
+            time.sleep(0.01)
+        return self._live
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                since = int(time.time())
+                self.seed()
+                self._live = True
+                backoff = 1.0
+                filters = {"type": ["container"], "label": [HPONE_LABEL]}
+                self._events = self.client.events(filters=filters, since=since)
+                if self._stop.is_set():
+                    self._events.close()  # stop() ran before the stream was stored
+                for event in self._events:
+                    if self._stop.is_set():
+                        return
+                    self.apply_event(event)
+            except API_ERRORS:
+                pass
+            finally:
+                self._events = None
+            # Stream ended or failed: state may be stale until the next seed
+            self._live = False
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    # ---- updates ------------------------------------------------------
+
+    def seed(self) -> None:
+        """Rebuild the map from the daemon (one list plus one inspect per container)."""
+        records: Dict[str, ContainerRecord] = {}
+        for entry in self.client.containers(all=True, filters={"label": [HPONE_LABEL]}):
+            try:
+                record = _record_from_inspect(self.client.inspect_container(entry["Id"]))
+            except API_ERRORS:
+                continue
+            if record is not None:
+                records[record.container_id] = record
+        with self._lock:
+            self._records = records
+            self._reindex()
+
+    def _reindex(self) -> None:
+        by_project: Dict[str, Dict[str, ContainerRecord]] = {}
+        for record in self._records.values():
+            by_project.setdefault(record.project.lower(), {})[record.container_id] = record
+        self._by_project = by_project
+
+    def _store(self, record: ContainerRecord) -> None:
+        self._records[record.container_id] = record
+        self._by_project.setdefault(record.project.lower(), {})[record.container_id] = record
+
+    def _drop(self, container_id: str) -> None:
+        record = self._records.pop(container_id, None)
+        if record is not None:
+            self._by_project.get(record.project.lower(), {}).pop(container_id, None)
+
+    def apply_event(self, event: Dict[str, Any]) -> None:
+        """Update the map from one decoded Docker event."""
+        if event.get("Type", "container") != "container":
+            return
+        action = str(event.get("Action") or event.get("status") or "")
+        actor = event.get("Actor") or {}
+        container_id = str(actor.get("ID") or event.get("id") or "")
+        attributes = actor.get("Attributes") or {}
+        if not container_id:
+            return
+
+        restart_count: Optional[int] = None
+        if action in ("start", "restart"):
+            # Tell restart-policy restarts from manual down/up, which resets the count
+            try:
+                restart_count = int((self.client.inspect_container(container_id) or {}).get("RestartCount") or 0)
+            except API_ERRORS:
+                pass
+
+        with self._lock:
+            if action == "destroy":
+                self._drop(container_id)
+                return
+            if action not in _ACTION_STATES:
+                return  # exec_*, attach, health_status, ...
+
+            current = self._records.get(container_id)
+            if current is None:
+                project = honeypot_of(attributes)
+                if not project:
+                    return
+                current = ContainerRecord(
+                    container_id=container_id,
+                    name=str(attributes.get("name") or ""),
+                    project=project,
+                    service=attributes.get(COMPOSE_SERVICE_LABEL, ""),
+                    state="created",
+                )
+
+            changes: Dict[str, Any] = {"updated_at": time.time()}
+            new_state = _ACTION_STATES[action]
+            if new_state:
+                changes["state"] = new_state
+            if action == "die" and "exitCode" in attributes:
+                try:
+                    changes["exit_code"] = int(attributes["exitCode"])
+                except ValueError:
+                    pass
+            if action == "start":
+                changes["started_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(event.get("time") or time.time()))
+            if restart_count is not None:
+                changes["restart_count"] = restart_count
+            self._store(replace(current, **changes))
+
+    # ---- queries ------------------------------------------------------
+
+    def containers(self, project: str) -> List[ContainerRecord]:
+        with self._lock:
+            return list(self._by_project.get(project.lower(), {}).values())
+
+    def is_running(self, project: str) -> bool:
+        return any(record.running for record in self.containers(project))
+
+    def fleet(self) -> FleetState:
+        """Return the cached state as a FleetState without touching Docker."""
+        with self._lock:
+            records = list(self._records.values())
+        return FleetState([
+            ContainerState(name=r.name, project=r.project, service=r.service, state=r.state, status=r.state)
+            for r in records
+        ])
+
+
+_CACHE: Optional[StateCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def start_state_cache(wait: float = 2.0) -> Optional[StateCache]:
+    """
+    Start (once per process) the event-driven cache. Returns None without a Docker socket.
+
+    Only the call that creates the cache waits up to `wait` seconds for it to
+    go live; later calls return at once (callers fall back to a snapshot
+    while it is not live, see current_fleet).
+    """
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is not None:
+            return _CACHE
+        client = get_client()
+        if client is None:
+            return None
+        _CACHE = StateCache(client).start()
+        cache = _CACHE
+    cache.wait_live(wait)
+    return cache
+
+
+def get_state_cache() -> Optional[StateCache]:
+    """Return the process cache if it was started and is currently live."""
+    cache = _CACHE
+    if cache is not None and cache.live:
+        return cache
+    return None
+
+
+def current_fleet() -> FleetState:
+    """Fleet state from the live cache when available, else a one-shot snapshot."""
+    cache = get_state_cache()
+    if cache is not None:
+        return cache.fleet()
+    return FleetState.snapshot()
@@ -5,7 +5,7 @@ Fungsi-fungsi utility yang dibutuhkan oleh core modules.
 """
 
 import re
-from typing import List
+from typing import List, Tuple
 import textwrap
 
 
@@ -62,62 +62,51 @@ def _format_table(headers: List[str], rows: List[List[str]], max_width: int = 50
     if not headers or not rows:
         return ""
 
-    # Calculate column widths (ignore ANSI sequences)
-    col_widths = []
-    for i, header in enumerate(headers):
-        # Start with header width
-        max_width_col = len(_strip_ansi(header))
-        # Check all rows for this column
-        for row in rows:
-            if i < len(row):
-                max_width_col = max(max_width_col, len(_strip_ansi(str(row[i]))))
-        # Apply max_width limit
-        max_width_col = min(max_width_col, max_width)
-        col_widths.append(max_width_col)
+    ncols = len(headers)
+    col_widths = [min(len(_strip_ansi(header)), max_width) for header in headers]
+
+    # Single pass over the cells: stringify once, measure the visible width
+    # (the ANSI regex only runs on cells that contain an escape sequence)
+    cells: List[List[Tuple[str, int, bool]]] = []
+    for row in rows:
+        row_cells = []
+        for i in range(ncols):
+            value = str(row[i]) if i < len(row) else ""
+            has_ansi = "\x1b" in value
+            visible = len(_strip_ansi(value)) if has_ansi else len(value)
+            if visible > col_widths[i]:
+                col_widths[i] = min(visible, max_width)
+            row_cells.append((value, visible, has_ansi))
+        cells.append(row_cells)
 
     # Build separator line
     separator = "+" + "+".join("-" * (w + 2) for w in col_widths) + "+"
-
-    # Build header row
-    header_row = "|"
-    for header, width in zip(headers, col_widths):
-        header_row += f" {_pad_ansi_left(header, width)} |"
+    lines = [separator, "|" + "".join(f" {_pad_ansi_left(h, w)} |" for h, w in zip(headers, col_widths)), separator]
 
     # Build data rows with word-wrapping per cell
-    data_rows = []
-    for row in rows:
-        # Prepare wrapped lines for each cell in the row
+    for row_cells in cells:
         wrapped_per_cell = []
         max_lines = 1
-        for i in range(len(headers)):
-            cell_value = str(row[i]) if i < len(row) else ""
-            width = col_widths[i]
-            # Wrap by words; ensure at least one empty line when value is empty
-            # Avoid wrapping ANSI content (keep as single line) to preserve sequences
-            if ANSI_RE.search(cell_value):
-                wrapped_lines = [cell_value]
+        for (value, visible, has_ansi), width in zip(row_cells, col_widths):
+            # Avoid wrapping ANSI content (keep as single line) to preserve sequences;
+            # short single-line cells need no textwrap at all
+            if has_ansi:
+                wrapped = [(value, visible)]
+            elif visible <= width and value.isprintable() and value == value.strip():
+                wrapped = [(value, visible)]
             else:
-                wrapped_lines = textwrap.wrap(cell_value, width=width) if cell_value else [""]
-            if not wrapped_lines:
-                wrapped_lines = [""]
-            wrapped_per_cell.append(wrapped_lines)
-            if len(wrapped_lines) > max_lines:
-                max_lines = len(wrapped_lines)
+                wrapped = [(part, len(part)) for part in textwrap.wrap(value, width=width)] or [("", 0)]
+            wrapped_per_cell.append(wrapped)
+            if len(wrapped) > max_lines:
+                max_lines = len(wrapped)
 
         # Emit visual lines for this logical row
         for line_idx in range(max_lines):
-            line_str = "|"
-            for i, width in enumerate(col_widths):
-                lines = wrapped_per_cell[i]
-                part = lines[line_idx] if line_idx < len(lines) else ""
-                line_str += f" {_pad_ansi_left(part, width)} |"
-            data_rows.append(line_str)
-
-    # Combine all parts
-    table = separator + "\n"
-    table += header_row + "\n"
-    table += separator + "\n"
-    table += "\n".join(data_rows) + "\n"
-    table += separator
-
-    return table
+            parts = []
+            for wrapped, width in zip(wrapped_per_cell, col_widths):
+                part, visible = wrapped[line_idx] if line_idx < len(wrapped) else ("", 0)
+                parts.append(f" {part}{' ' * max(0, width - visible)} |")
+            lines.append("|" + "".join(parts))
+
+    lines.append(separator)
+    return "\n".join(lines)
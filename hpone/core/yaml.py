@@ -4,79 +4,53 @@ YAML helpers for HPone.
 Functions to read, write, and manipulate honeypot YAML files.
 """
 
-import glob
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple
 
-try:
-    import yaml  # type: ignore
-except ImportError:
-    raise ImportError("PyYAML is required for this module")
+from . import yaml_io
 
 # Import constants dari helpers
 from .constants import HONEYPOT_MANIFEST_DIR
+from .registry import get_registry
 
 def load_honeypot_yaml_by_filename(honeypot_id: str) -> Tuple[str, Dict[str, Any]]:
     """
     Read YAML `honeypots/<honeypot_id>.yml`. If it does not exist, search YAML files that have `name: <honeypot_id>` (case-insensitive).
     Return (resolved_honeypot_name, config_dict).
     """
-    explicit_path = HONEYPOT_MANIFEST_DIR / f"{honeypot_id}.yml"
-    if explicit_path.exists():
-        with explicit_path.open("r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-        resolved_name = str(data.get("name") or honeypot_id)
-        return resolved_name, data
-
-    # Fallback: search by `name` field
-    for path_str in glob.glob(str(HONEYPOT_MANIFEST_DIR / "*.yml")):
-        p = Path(path_str)
-        try:
-            with p.open("r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-            if str(data.get("name", "")).lower() == honeypot_id.lower():
-                return str(data.get("name")), data
-        except Exception:
-            continue
-
-    raise FileNotFoundError(f"Config YAML for honeypot '{honeypot_id}' not found in '{HONEYPOT_MANIFEST_DIR}'.")
+    loaded = get_registry().load(honeypot_id)
+    if loaded is None:
+        raise FileNotFoundError(f"Config YAML for honeypot '{honeypot_id}' not found in '{HONEYPOT_MANIFEST_DIR}'.")
+    resolved_name, _path, data = loaded
+    return resolved_name, data
 
 
 def find_honeypot_yaml_path(honeypot_id: str) -> Path:
     """Return YAML path for honeypot_id by filename or `name` field inside YAML."""
-    explicit_path = HONEYPOT_MANIFEST_DIR / f"{honeypot_id}.yml"
-    if explicit_path.exists():
-        return explicit_path
-    for path_str in glob.glob(str(HONEYPOT_MANIFEST_DIR / "*.yml")):
-        p = Path(path_str)
-        try:
-            with p.open("r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-            if str(data.get("name", "")).lower() == honeypot_id.lower():
-                return p
-        except Exception:
-            continue
-    raise FileNotFoundError(f"YAML file for honeypot '{honeypot_id}' not found in '{HONEYPOT_MANIFEST_DIR}'.")
+    path = get_registry().path(honeypot_id)
+    if path is None:
+        raise FileNotFoundError(f"YAML file for honeypot '{honeypot_id}' not found in '{HONEYPOT_MANIFEST_DIR}'.")
+    return path
+
+
+def _honeypot_document(honeypot_id: str) -> Dict[str, Any]:
+    """Parsed (shared, read-only) YAML of a honeypot; raises like find_honeypot_yaml_path."""
+    return get_registry().document(find_honeypot_yaml_path(honeypot_id))
 
 
 def set_honeypot_enabled(honeypot_id: str, enabled: bool) -> None:
     """Set `enabled` field in `honeypots/<honeypot>.yml`. Matches by filename or `name` field."""
     yaml_path = find_honeypot_yaml_path(honeypot_id)
-    with yaml_path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    data = dict(get_registry().document(yaml_path))
     data["enabled"] = bool(enabled)
     with yaml_path.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(data, f, default_flow_style=False, sort_keys=False)
+        yaml_io.safe_dump(data, f)
+    get_registry().invalidate(yaml_path)
 
 
 def is_honeypot_enabled(honeypot_id: str) -> bool:
     try:
-        yaml_path = find_honeypot_yaml_path(honeypot_id)
-    except FileNotFoundError:
-        return False
-    try:
-        with yaml_path.open("r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        data = _honeypot_document(honeypot_id)
         return bool(data.get("enabled") is True)
     except Exception:
         return False
@@ -88,9 +62,7 @@ def get_custom_template_dir(honeypot_id: str) -> Path | None:
     Returns None if no custom template_dir is specified.
     """
     try:
-        yaml_path = find_honeypot_yaml_path(honeypot_id)
-        with yaml_path.open("r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        data = _honeypot_document(honeypot_id)
 
         template_dir = data.get("template_dir")
         if template_dir:
@@ -104,3 +76,21 @@ def get_custom_template_dir(honeypot_id: str) -> Path | None:
         return None
     except Exception:
         return None
+
+
+def get_honeypot_dependencies(honeypot_id: str) -> List[str]:
+    """
+    Get the `depends_on` honeypot IDs from honeypot YAML config.
+    Accepts a single ID or a list. Returns an empty list when not set.
+    """
+    try:
+        data = _honeypot_document(honeypot_id)
+    except Exception:
+        return []
+
+    depends_on = data.get("depends_on") or []
+    if isinstance(depends_on, str):
+        depends_on = [depends_on]
+    if not isinstance(depends_on, list):
+        return []
+    return [str(dep).strip() for dep in depends_on if str(dep).strip()]
@@ -0,0 +1,44 @@
+"""
+YAML facade for HPone.
+
+All manifest and compose parsing/dumping goes through here so the libyaml C
+implementation (`CSafeLoader`/`CSafeDumper`) is used whenever PyYAML was built
+with it, with a transparent fallback to the pure-Python classes. Dumping keeps
+the HPone defaults (block style, keys in document order); `None` values such
+as an empty `networks: {default: }` entry are written as `null` by both
+backends, exactly as before.
+"""
+
+from typing import Any, Optional, IO, Union
+
+try:
+    import yaml  # type: ignore
+except ImportError:
+    raise ImportError("PyYAML is required for this module")
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper  # type: ignore
+    YAML_BACKEND = "libyaml"
+except ImportError:
+    from yaml import SafeLoader, SafeDumper  # type: ignore
+    YAML_BACKEND = "python"
+
+YAMLError = yaml.YAMLError
+
+
+def safe_load(stream: Union[str, bytes, IO[Any]]) -> Any:
+    """Parse one YAML document with the fastest available safe loader."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_dump(data: Any, stream: Optional[IO[Any]] = None, **kwargs: Any) -> Optional[str]:
+    """
+    Serialize `data` with the fastest available safe dumper.
+
+    Defaults to `default_flow_style=False, sort_keys=False`; other keyword
+    arguments are passed through to `yaml.dump`. Returns the text when no
+    stream is given.
+    """
+    kwargs.setdefault("default_flow_style", False)
+    kwargs.setdefault("sort_keys", False)
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
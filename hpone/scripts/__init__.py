@@ -4,139 +4,120 @@ HPone scripts package.
 This package contains command scripts for the HPone Docker template manager.
 """
 
-from .list import (
-    list_honeypots,
-    list_enabled_honeypot_ids,
-    list_all_enabled_honeypot_ids,
-    list_imported_honeypot_ids,
-    resolve_honeypot_dir_id
-)
-
-from .inspect import (
-    inspect_honeypot
-)
-
-from .import_cmd import (
-    import_honeypot
-)
-
-from .remove import (
-    remove_honeypot
-)
-
-from .file_ops import (
-    ensure_destination_dir,
-    find_template_dir,
-    copy_template_to_destination,
-    remove_honeypot_data
-)
-
-from .check import (
-    check_all_dependencies,
-    check_python_dependencies,
-    check_system_dependencies,
-    print_dependency_status,
-    get_installation_instructions,
-    require_dependencies
-)
-
-from .error_handlers import (
-    handle_yaml_error,
-    handle_docker_error,
-    safe_execute,
-    print_error_with_suggestion,
-    check_file_permissions,
-    check_docker_permissions,
-    check_directory_permissions
-)
-
-from .status import (
-    show_status,
-)
-
-from .logs import (
-    logs_main
-)
-
-from .clean import (
-    clean_main,
-    clean_all_honeypots,
-    clean_single_honeypot
-)
-
-from .up import (
-    up_main,
-    up_all_honeypots,
-    up_single_honeypot
-)
-
-from .edit import (
-    edit_main
-)
-
-from .web import (
-    web_main
-)
-
-__all__ = [
+import importlib
+from typing import Any, Dict, List
+
+# Exported name -> submodule that defines it. Submodules are imported on first
+# attribute access (PEP 562) so a command only pays for the modules it uses.
+_EXPORTS: Dict[str, str] = {
     # List commands
-    'list_honeypots',
-    'list_enabled_honeypot_ids',
-    'list_all_enabled_honeypot_ids',
-    'list_imported_honeypot_ids',
-    'resolve_honeypot_dir_id',
+    'list_honeypots': 'list',
+    'list_enabled_honeypot_ids': 'list',
+    'list_all_enabled_honeypot_ids': 'list',
+    'list_imported_honeypot_ids': 'list',
+    'resolve_honeypot_dir_id': 'list',
+    'iter_honeypot_records': 'list',
+    'list_main': 'list',
 
     # Inspect commands
-    'inspect_honeypot',
+    'inspect_honeypot': 'inspect',
+    'honeypot_record': 'inspect',
+    'inspect_main': 'inspect',
 
     # Import commands
-    'import_honeypot',
+    'import_honeypot': 'import_cmd',
+    'format_import_stats': 'import_cmd',
+    'import_main': 'import_cmd',
+    'update_main': 'import_cmd',
 
     # Remove commands
-    'remove_honeypot',
+    'remove_honeypot': 'remove',
 
     # File operations
-    'ensure_destination_dir',
-    'find_template_dir',
-    'copy_template_to_destination',
-    'remove_honeypot_data',
+    'ensure_destination_dir': 'file_ops',
+    'find_template_dir': 'file_ops',
+    'copy_template_to_destination': 'file_ops',
+    'materialize_file': 'file_ops',
+    'remove_honeypot_data': 'file_ops',
 
     # Check dependencies
-    'check_all_dependencies',
-    'check_python_dependencies',
-    'check_system_dependencies',
-    'print_dependency_status',
-    'get_installation_instructions',
-    'require_dependencies',
+    'check_all_dependencies': 'check',
+    'check_python_dependencies': 'check',
+    'check_system_dependencies': 'check',
+    'print_dependency_status': 'check',
+    'get_installation_instructions': 'check',
+    'require_dependencies': 'check',
+    'check_main': 'check',
 
     # Error handlers
-    'handle_yaml_error',
-    'handle_docker_error',
-    'safe_execute',
-    'print_error_with_suggestion',
-    'check_file_permissions',
-    'check_docker_permissions',
-    'check_directory_permissions'
-    ,
+    'handle_yaml_error': 'error_handlers',
+    'handle_docker_error': 'error_handlers',
+    'safe_execute': 'error_handlers',
+    'print_error_with_suggestion': 'error_handlers',
+    'check_file_permissions': 'error_handlers',
+    'check_docker_permissions': 'error_handlers',
+    'check_directory_permissions': 'error_handlers',
+
     # Status helpers
-    'show_status',
+    'show_status': 'status',
+    'port_records': 'status',
+    'status_main': 'status',
 
     # Logs
-    'logs_main',
+    'logs_main': 'logs',
+    'follow_logs': 'logs',
+    'log_sources': 'logs',
+    'search_in_file': 'logs',
 
     # Clean
-    'clean_main',
-    'clean_all_honeypots',
-    'clean_single_honeypot',
+    'clean_main': 'clean',
+    'clean_all_honeypots': 'clean',
+    'clean_single_honeypot': 'clean',
 
     # Up
-    'up_main',
-    'up_all_honeypots',
-    'up_single_honeypot',
+    'up_main': 'up',
+    'up_all_honeypots': 'up',
+    'up_single_honeypot': 'up',
+    'build_dependency_graph': 'up',
+    'topological_layers': 'up',
+    'run_in_dependency_order': 'up',
+
+    # Down
+    'down_main': 'down',
+    'down_all_honeypots': 'down',
+    'teardown_honeypots': 'down',
+    'teardown_layers': 'down',
+    'teardown_all': 'down',
 
     # Edit
-    'edit_main',
+    'edit_main': 'edit',
 
     # Web
-    'web_main'
-]
+    'web_main': 'web',
+
+    # Enable / disable
+    'enable_main': 'enable',
+    'disable_main': 'enable',
+
+    # Shell
+    'shell_main': 'shell',
+
+    # Daemon
+    'HponeDaemon': 'daemon',
+    'daemon_main': 'daemon',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
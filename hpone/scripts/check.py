@@ -4,6 +4,7 @@ Dependency checker for HPone.
 Functions to verify that required dependencies are available.
 """
 
+import importlib.util
 import subprocess
 import sys
 from pathlib import Path
@@ -16,17 +17,24 @@ def check_python_dependencies() -> Dict[str, bool]:
 
     deps = builtin.copy()
     for module in to_check:
+        # find_spec checks availability without paying the import cost
         try:
-            __import__(module)
-            # tampilkan dengan nama lebih enak (PyYAML, bukan yaml)
-            deps["PyYAML" if module == "yaml" else module] = True
-        except ImportError:
-            deps["PyYAML" if module == "yaml" else module] = False
+            found = importlib.util.find_spec(module) is not None
+        except (ImportError, ValueError):
+            found = False
+        # tampilkan dengan nama lebih enak (PyYAML, bukan yaml)
+        deps["PyYAML" if module == "yaml" else module] = found
 
     return deps
 
 def check_system_dependencies() -> Dict[str, bool]:
-    """Check system command dependencies."""
+    """Check system command dependencies (cached, see core.preflight)."""
+    from core.preflight import cached_preflight, store_preflight
+
+    cached = cached_preflight("system")
+    if isinstance(cached, dict):
+        return cached
+
     dependencies = {
         'docker': False,
         'docker-compose': False,
@@ -60,6 +68,9 @@ def check_system_dependencies() -> Dict[str, bool]:
     except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.SubprocessError):
         pass
 
+    # Only remember a usable setup; a missing Docker is probed (and reported) every time
+    if any(dependencies.values()):
+        store_preflight("system", dependencies)
     return dependencies
 
 
@@ -101,6 +112,10 @@ def print_dependency_status() -> None:
     compose_v2_ok = deps['system']['docker compose']
 
     print(f"   {'✅' if docker_ok else '❌'} docker")
+    from core.docker_api import get_client
+    client = get_client()
+    if client is not None and client.ping():
+        print(f"   ✅ docker engine API ({client.socket_path})")
     if compose_v2_ok:
         print("   ✅ docker compose (v2)")
     elif compose_v1_ok:
@@ -143,3 +158,21 @@ def require_dependencies() -> None:
                 print(f"   {line.strip()}")
         print()
         sys.exit(1)
+
+
+def check_main(args) -> int:
+    """Main entry point for the check command: self-tests, then dependency status."""
+    from core.utils import PREFIX_ERROR
+    from core.preflight import clear_preflight
+    try:
+        # Always probe for real
+        clear_preflight()
+        # Run import self-tests first
+        from test import run_docker_api_self_test, run_import_self_test, run_permission_self_test
+        if not run_import_self_test() or not run_permission_self_test() or not run_docker_api_self_test():
+            return 1
+        print_dependency_status()
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} Failed to check dependencies: {exc}", file=sys.stderr)
+        return 1
+    return 0
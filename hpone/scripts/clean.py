@@ -6,7 +6,6 @@ removing data, images, volumes, and docker directories for honeypots.
 """
 
 import sys
-import time
 from typing import List
 
 try:
@@ -17,6 +16,7 @@ except ImportError:
 
 from core import (
     down_honeypot,
+    wait_for_honeypot_stopped,
     cleanup_global_images,
     cleanup_global_volumes
 )
@@ -33,10 +33,14 @@ from .file_ops import (
     remove_honeypot_data
 )
 
+from .down import (
+    teardown_all
+)
+
 from core.utils import PREFIX_OK, PREFIX_ERROR, PREFIX_WARN
 
 
-def clean_all_honeypots(remove_data: bool = False, remove_images: bool = False, remove_volumes: bool = False) -> int:
+def clean_all_honeypots(remove_data: bool = False, remove_images: bool = False, remove_volumes: bool = False, jobs: int = 1) -> int:
     """
     Clean all imported honeypots with optional data, images, and volumes removal.
 
@@ -44,6 +48,7 @@ def clean_all_honeypots(remove_data: bool = False, remove_images: bool = False,
         remove_data: Whether to remove data directories
         remove_images: Whether to remove Docker images
         remove_volumes: Whether to remove Docker volumes
+        jobs: Number of honeypots to clean concurrently (1 = sequential)
 
     Returns:
         Exit code (0 for success, 1 for error)
@@ -123,42 +128,37 @@ def clean_all_honeypots(remove_data: bool = False, remove_images: bool = False,
                 return 0
 
         print(f"Cleaning {len(imported_ids)} imported honeypots (down + remove{' + data' if remove_data_all else ''}{' + images' if remove_images_all else ''}{' + volumes' if remove_volumes_all else ''})...")
-        for t in imported_ids:
-            try:
-                # Down first
-                down_honeypot(
-                    t,
-                    remove_volumes=remove_volumes_all,
-                    remove_images=remove_images_all,
-                )
-
-                # Wait a moment for containers to fully stop before removing data
-                if remove_data_all:
-                    time.sleep(1)  # Brief pause to ensure containers are fully stopped
-
-                # Remove data if confirmed - do this before removing docker directory
-                if remove_data_all:
-                    try:
-                        success = remove_honeypot_data(t)  # This prints its own success message
-                        if not success:
-                            print(f"{PREFIX_WARN} Data removal for '{t}' was skipped (folder may not exist)")
-                    except Exception as exc_data:
-                        print(f"{PREFIX_WARN} Failed to remove data for '{t}': {exc_data}")
-
-                # Show image/volume removal status (docker compose down with flags doesn't show explicit confirmation)
-                if remove_images_all:
-                    print(f"{PREFIX_OK}: Removed images for {t}")
-
-                if remove_volumes_all:
-                    print(f"{PREFIX_OK}: Removed volumes for {t}")
-
-                # Then remove docker directory
-                remove_honeypot(t)  # This prints its own success message
-            except Exception as exc:
-                print(f"{PREFIX_ERROR} Failed to clean '{t}': {exc}", file=sys.stderr)
-                continue
 
-        return 0
+        def _after_stop(t: str) -> None:
+            # Runs as soon as this honeypot's containers are gone
+            if remove_data_all:
+                try:
+                    success = remove_honeypot_data(t)  # This prints its own success message
+                    if not success:
+                        print(f"{PREFIX_WARN} Data removal for '{t}' was skipped (folder may not exist)")
+                except Exception as exc_data:
+                    print(f"{PREFIX_WARN} Failed to remove data for '{t}': {exc_data}")
+
+            # Show image/volume removal status (docker compose down with flags doesn't show explicit confirmation)
+            if remove_images_all:
+                print(f"{PREFIX_OK}: Removed images for {t}")
+            if remove_volumes_all:
+                print(f"{PREFIX_OK}: Removed volumes for {t}")
+
+            # Then remove docker directory
+            remove_honeypot(t)  # This prints its own success message
+
+        # Same order as `down --all`: fleet project first, then dependents before their dependencies
+        failures = teardown_all(
+            imported_ids,
+            jobs=jobs,
+            remove_volumes=remove_volumes_all,
+            remove_images=remove_images_all,
+            after_stop=_after_stop,
+        )
+        for t, exc in failures:
+            print(f"{PREFIX_ERROR} Failed to clean '{t}': {exc}", file=sys.stderr)
+        return 1 if failures else 0
 
     except Exception as exc:
         print(f"{PREFIX_ERROR} Failed to clean all honeypots: {exc}", file=sys.stderr)
@@ -215,9 +215,9 @@ def clean_single_honeypot(honeypot_id: str, remove_data: bool = False, remove_im
             remove_images=remove_images_single,
         )
 
-        # Wait a moment for containers to fully stop before removing data
+        # Wait for containers to actually stop before removing data
         if remove_data_single:
-            time.sleep(1)  # Brief pause to ensure containers are fully stopped
+            wait_for_honeypot_stopped(honeypot_id)
 
         # Optionally remove data for single honeypot - do this before removing docker directory
         if remove_data_single:
@@ -260,7 +260,8 @@ def clean_main(args) -> int:
             return clean_all_honeypots(
                 remove_data=getattr(args, "data", False),
                 remove_images=getattr(args, "image", False),
-                remove_volumes=getattr(args, "volume", False)
+                remove_volumes=getattr(args, "volume", False),
+                jobs=getattr(args, "jobs", 1) or 1
             )
         else:
             if not args.honeypot:
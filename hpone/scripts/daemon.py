@@ -0,0 +1,405 @@
+"""
+Resident HPone daemon.
+
+`hpone daemon` keeps the manifest registry, the Docker state cache (fed by
+`docker events`) and the imported modules warm in one long-running process and
+serves them as newline-delimited JSON-RPC 2.0 on a unix socket (DAEMON_SOCKET).
+`hpone list/status/up/down` and the web service become clients while it runs
+and fall back to their in-process code otherwise (see core.daemon_client).
+
+Methods:
+  ping                          -> daemon pid, uptime and socket
+  honeypots                     -> manifest + imported/running state of every honeypot
+  command {argv}                -> run a CLI command (DAEMON_COMMANDS); output is streamed as
+                                   `output` notifications, the result is the exit code
+  up {honeypot_id, force}       -> import (ALWAYS_IMPORT) and start one honeypot
+  down {honeypot_id}            -> stop one honeypot
+  shutdown                      -> stop the daemon
+
+Reads (honeypots, `list`, `status`) run concurrently and never wait for a job.
+`up`/`down` commands and methods go through one job lock, so concurrent
+callers are serialized and never interleave compose runs. A client that
+disconnects while its command runs (e.g. Ctrl+C) cancels it cooperatively
+(core.jobs): the compose processes that command started are terminated and
+it stops at its next cancellation check.
+"""
+
+import contextlib
+import json
+import os
+import select
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from core.constants import DAEMON_SOCKET, OUTPUT_DOCKER_DIR
+from core.daemon_client import DAEMON_COMMANDS, DaemonError, DaemonUnavailable, daemon_call
+from core.jobs import CancelToken, JobCancelled, set_job_token, set_thread_token
+from core.utils import PREFIX_OK, PREFIX_ERROR, PREFIX_WARN
+
+# JSON-RPC error codes
+_PARSE_ERROR = -32700
+_METHOD_NOT_FOUND = -32601
+_SERVER_ERROR = -32000
+
+# Served commands that only read the registry and state cache (no job lock)
+READ_ONLY_COMMANDS = ("list", "status")
+
+
+class _OutputRouter:
+    """
+    sys.stdout/sys.stderr replacement that sends each thread's output to its client.
+
+    Threads of a command write to the sink they registered; other threads
+    (e.g. the worker pool of `up --all -j`) write to the sink of the job that
+    holds the job lock; everything else goes to the daemon's own stream.
+    """
+
+    def __init__(self, stream, name: str):
+        self._stream = stream
+        self.name = name
+        self._local = threading.local()
+        self.job_sink: Optional[Callable[[str, str], None]] = None
+
+    def set_sink(self, sink: Optional[Callable[[str, str], None]]) -> None:
+        self._local.sink = sink
+
+    def write(self, text: str) -> int:
+        sink = getattr(self._local, "sink", None) or self.job_sink
+        if sink is None:
+            return self._stream.write(text)
+        if text:
+            sink(self.name, text)
+        return len(text)
+
+    def flush(self) -> None:
+        if getattr(self._local, "sink", None) is None and self.job_sink is None:
+            self._stream.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+def _route_output(sink: Optional[Callable[[str, str], None]]) -> None:
+    for stream in (sys.stdout, sys.stderr):
+        if isinstance(stream, _OutputRouter):
+            stream.set_sink(sink)
+
+
+def _set_job_sink(sink: Optional[Callable[[str, str], None]]) -> None:
+    for stream in (sys.stdout, sys.stderr):
+        if isinstance(stream, _OutputRouter):
+            stream.job_sink = sink
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """One client connection; may carry several requests, one JSON document per line."""
+
+    def handle(self) -> None:
+        daemon = self.server.hpone_daemon
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = daemon.dispatch(line, self)
+            if response is None:
+                # Client went away during a streamed command
+                return
+            if not self.send(response):
+                return
+            if daemon.stopping:
+                # Reply first; shutdown() blocks until serve_forever returns, so use a thread
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+    def send(self, message: Dict[str, Any]) -> bool:
+        """Write one JSON document; False when the client is gone."""
+        try:
+            self.wfile.write(json.dumps(message, default=str).encode("utf-8") + b"\n")
+            self.wfile.flush()
+        except OSError:
+            return False
+        return True
+
+    def disconnected(self) -> bool:
+        """True once the client closed its end (it sends nothing while a command runs)."""
+        try:
+            readable = select.select([self.connection], [], [], 0)[0]
+            return bool(readable) and not self.connection.recv(1, socket.MSG_PEEK)
+        except OSError:
+            return True
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # Completion, web workers and scripts may connect in bursts
+    request_queue_size = 64
+
+
+class HponeDaemon:
+    """State owner and method table behind the daemon socket."""
+
+    def __init__(self, socket_path: str = str(DAEMON_SOCKET)):
+        self.socket_path = socket_path
+        self.started_at = time.time()
+        self._jobs = threading.Lock()
+        self.stopping = False
+        self._methods: Dict[str, Callable[..., Any]] = {
+            "ping": self.ping,
+            "honeypots": self.honeypots,
+            "command": self.command,
+            "up": self.up,
+            "down": self.down,
+            "shutdown": self.shutdown,
+        }
+
+    # ---- protocol -----------------------------------------------------
+
+    def dispatch(self, raw: bytes, client: Optional[_Handler] = None) -> Optional[Dict[str, Any]]:
+        try:
+            request = json.loads(raw)
+        except ValueError as exc:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": _PARSE_ERROR, "message": str(exc)}}
+        request_id = request.get("id")
+        method = self._methods.get(request.get("method"))
+        if method is None:
+            return {"jsonrpc": "2.0", "id": request_id,
+                    "error": {"code": _METHOD_NOT_FOUND, "message": f"Unknown method: {request.get('method')}"}}
+        params = dict(request.get("params") or {})
+        if method == self.command:
+            params["client"] = client
+        try:
+            result = method(**params)
+        except JobCancelled:
+            return None
+        except Exception as exc:
+            return {"jsonrpc": "2.0", "id": request_id,
+                    "error": {"code": _SERVER_ERROR, "message": str(exc), "data": {"type": type(exc).__name__}}}
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    # ---- methods ------------------------------------------------------
+
+    def ping(self) -> Dict[str, Any]:
+        from core.state_cache import get_state_cache
+        cache = get_state_cache()
+        return {
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started_at,
+            "socket": self.socket_path,
+            "state_cache": bool(cache is not None and cache.live),
+        }
+
+    def honeypots(self) -> List[Dict[str, Any]]:
+        from core.config import parse_ports, parse_volumes
+        from core.docker import is_honeypot_running
+        from core.registry import get_registry
+        from core.state_cache import current_fleet
+
+        fleet = current_fleet()
+        states: List[Dict[str, Any]] = []
+        for honeypot_id, yaml_path, data in get_registry().entries():
+            try:
+                ports = parse_ports(data)
+            except Exception:
+                ports = []
+            try:
+                volumes = parse_volumes(data)
+            except Exception:
+                volumes = []
+            states.append({
+                "honeypot_id": honeypot_id,
+                "name": str(data.get("name") or honeypot_id),
+                "description": str(data.get("description") or ""),
+                "enabled": bool(data.get("enabled") is True),
+                "imported": (OUTPUT_DOCKER_DIR / honeypot_id).exists(),
+                "running": is_honeypot_running(honeypot_id, fleet=fleet),
+                "ports": ports,
+                "volumes": volumes,
+                "yaml_path": str(yaml_path),
+            })
+        return states
+
+    def command(self, argv: List[str], client: Optional[_Handler] = None) -> Dict[str, Any]:
+        """
+        Run a CLI command with its output streamed to `client` as notifications.
+
+        The command runs in its own thread while this one watches the
+        connection, so a disconnecting client cancels it.
+        """
+        from core.argaparse import build_arg_parser
+
+        lock = threading.Lock()
+        gone = threading.Event()
+
+        def sink(stream: str, text: str) -> None:
+            if gone.is_set() or client is None:
+                return
+            with lock:
+                sent = client.send({"jsonrpc": "2.0", "method": "output", "params": {"stream": stream, "data": text}})
+            if not sent:
+                gone.set()
+
+        outcome: Dict[str, Any] = {}
+
+        token = CancelToken()
+
+        def job() -> None:
+            _route_output(sink)
+            set_thread_token(token)
+            try:
+                try:
+                    args = build_arg_parser().parse_args(argv)
+                except SystemExit as exc:
+                    outcome["code"] = exc.code or 0
+                    return
+                if args.command not in DAEMON_COMMANDS:
+                    outcome["error"] = ValueError(f"Command '{args.command}' is not served by the daemon")
+                    return
+                if args.command in READ_ONLY_COMMANDS:
+                    outcome["code"] = self._run_command(args)
+                    return
+                with self._jobs:
+                    # Worker threads of the command (up --all -j) see its output and token
+                    _set_job_sink(sink)
+                    set_job_token(token)
+                    try:
+                        self._new_job()
+                        outcome["code"] = self._run_command(args)
+                    finally:
+                        set_job_token(None)
+                        _set_job_sink(None)
+            except JobCancelled:
+                outcome["cancelled"] = True
+            except Exception as exc:
+                outcome["error"] = exc
+            finally:
+                set_thread_token(None)
+                _route_output(None)
+
+        worker = threading.Thread(target=job, daemon=True, name="hpone-job")
+        worker.start()
+        while worker.is_alive():
+            worker.join(0.2)
+            if not token.cancelled and (gone.is_set() or (client is not None and client.disconnected())):
+                gone.set()
+                token.cancel()
+        # A cancelled command still runs to its next check; nobody is left to read the result
+        if gone.is_set() or outcome.get("cancelled"):
+            raise JobCancelled()
+        if "error" in outcome:
+            raise outcome["error"]
+        return {"code": outcome.get("code", 0)}
+
+    @staticmethod
+    def _run_command(args) -> int:
+        from app import load_command
+        try:
+            return load_command(args.command)(args)
+        except SystemExit as exc:
+            return exc.code or 0
+
+    def up(self, honeypot_id: str, force: bool = False) -> None:
+        from core.docker import up_honeypot
+        from scripts.import_cmd import import_honeypot
+        try:
+            from config import ALWAYS_IMPORT
+        except ImportError:
+            ALWAYS_IMPORT = True
+
+        with self._jobs:
+            self._new_job()
+            if ALWAYS_IMPORT:
+                import_honeypot(honeypot_id, force=True)
+            up_honeypot(honeypot_id, force=force)
+
+    def down(self, honeypot_id: str) -> None:
+        from core.docker import down_honeypot
+
+        with self._jobs:
+            self._new_job()
+            down_honeypot(honeypot_id)
+
+    def shutdown(self) -> bool:
+        # The connection handler stops the server once this reply is sent
+        self.stopping = True
+        return True
+
+    @staticmethod
+    def _new_job() -> None:
+        """Per-command state that a one-shot CLI process would start fresh with."""
+        from scripts.error_handlers import reset_auto_fix_permissions
+        reset_auto_fix_permissions()
+
+    # ---- lifecycle ----------------------------------------------------
+
+    def serve_forever(self) -> None:
+        """Bind the socket, warm the caches and serve until shutdown."""
+        from core.registry import get_registry
+        from core.state_cache import start_state_cache
+
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        if os.path.exists(self.socket_path):
+            # Only reached when nobody answers on it (checked by daemon_main)
+            os.unlink(self.socket_path)
+
+        get_registry().entries()
+        start_state_cache()
+
+        # Per-thread stdout/stderr so every command's output reaches its own client;
+        # they are no terminal, so compose runs print result lines, not a live tail
+        saved_streams = sys.stdout, sys.stderr
+        sys.stdout = _OutputRouter(sys.stdout, "stdout")
+        sys.stderr = _OutputRouter(sys.stderr, "stderr")
+
+        old_umask = os.umask(0o077)
+        try:
+            server = _Server(self.socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        server.hpone_daemon = self
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            sys.stdout, sys.stderr = saved_streams
+            with contextlib.suppress(OSError):
+                os.unlink(self.socket_path)
+
+
+def daemon_main(args) -> int:
+    """Main entry point for the daemon command."""
+    if getattr(args, "stop", False) or getattr(args, "status", False):
+        try:
+            info = daemon_call("ping", timeout=2)
+        except (DaemonUnavailable, DaemonError):
+            print(f"{PREFIX_WARN} HPone daemon is not running ({DAEMON_SOCKET})")
+            return 1
+        if getattr(args, "stop", False):
+            daemon_call("shutdown", timeout=2)
+            print(f"{PREFIX_OK}: Stopped HPone daemon (pid {info['pid']})")
+        else:
+            print(f"{PREFIX_OK}: HPone daemon running (pid {info['pid']}, up {info['uptime']:.0f}s, {info['socket']})")
+        return 0
+
+    try:
+        info = daemon_call("ping", timeout=2)
+        print(f"{PREFIX_ERROR} HPone daemon already running (pid {info['pid']})", file=sys.stderr)
+        return 1
+    except (DaemonUnavailable, DaemonError):
+        pass
+
+    daemon = HponeDaemon()
+    print(f"{PREFIX_OK}: HPone daemon listening on {daemon.socket_path} (Ctrl+C to stop)")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} HPone daemon failed: {exc}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,214 @@
+"""
+Down command implementation for HPone.
+
+This module handles stopping honeypots, either one at a time or as a
+concurrent teardown across all imported honeypots. `down --all` stops
+honeypots in reverse dependency order (dependents before their dependencies).
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from core import (
+    down_honeypot,
+    wait_for_honeypot_stopped
+)
+from core.compose_fleet import fleet_honeypot_ids, run_fleet_action, remove_fleet_compose
+
+from .list import (
+    list_imported_honeypot_ids
+)
+
+from .up import (
+    build_dependency_graph,
+    topological_layers
+)
+
+from core.utils import PREFIX_ERROR, PREFIX_WARN, COLOR_RED, COLOR_RESET
+from core.log_runner import MultiSlotDisplay
+from core.jobs import check_cancelled
+
+
+def teardown_honeypots(
+    honeypot_ids: List[str],
+    jobs: int = 1,
+    remove_volumes: bool = False,
+    remove_images: bool = False,
+    after_stop: Optional[Callable[[str], None]] = None
+) -> List[Tuple[str, Exception]]:
+    """
+    Stop honeypots concurrently on a bounded pool.
+
+    Each worker runs `docker compose down`, waits until the honeypot's
+    containers are really gone, then calls `after_stop(honeypot_id)` right
+    away (e.g. data and directory removal) without waiting for the others.
+
+    Args:
+        honeypot_ids: Honeypots to stop
+        jobs: Maximum number of honeypots torn down at the same time
+        remove_volumes: Pass -v to docker compose down
+        remove_images: Pass --rmi all to docker compose down
+        after_stop: Optional per-honeypot callback once its containers stopped
+
+    Returns:
+        List of (honeypot_id, exception) for the honeypots that failed
+    """
+    display = MultiSlotDisplay()
+
+    def _job(honeypot_id: str) -> Optional[Tuple[str, Exception]]:
+        check_cancelled()
+        display.add(honeypot_id)
+        try:
+            down_honeypot(
+                honeypot_id,
+                remove_volumes=remove_volumes,
+                remove_images=remove_images,
+                display=display,
+            )
+            if not wait_for_honeypot_stopped(honeypot_id):
+                print(f"{PREFIX_WARN} Containers of '{honeypot_id}' still running after down")
+            if after_stop is not None:
+                after_stop(honeypot_id)
+            display.discard(honeypot_id)
+            return None
+        except Exception as exc:
+            if display.is_active(honeypot_id):
+                display.finish(honeypot_id, f"{COLOR_RED}[FAIL]{COLOR_RESET} {honeypot_id} {COLOR_RED}ERR{COLOR_RESET}")
+            return honeypot_id, exc
+
+    with display.capture_stdout():
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            results = list(pool.map(_job, honeypot_ids))
+    display.close()
+    return [failure for failure in results if failure is not None]
+
+
+def teardown_layers(honeypot_ids: List[str]) -> List[List[str]]:
+    """
+    Stop order for honeypots: reverse start layers, dependents first.
+
+    A broken dependency declaration (e.g. a depends_on cycle) must never keep
+    containers running, so it only costs the ordering: everything is stopped
+    as one unordered layer.
+    """
+    try:
+        return list(reversed(topological_layers(build_dependency_graph(honeypot_ids, warn_missing=False))))
+    except ValueError as exc:
+        print(f"{PREFIX_WARN} {exc}; stopping honeypots without dependency order", file=sys.stderr)
+        return [list(honeypot_ids)] if honeypot_ids else []
+
+
+def teardown_all(
+    honeypot_ids: List[str],
+    jobs: int = 1,
+    remove_volumes: bool = False,
+    remove_images: bool = False,
+    after_stop: Optional[Callable[[str], None]] = None
+) -> List[Tuple[str, Exception]]:
+    """
+    Stop honeypots in reverse dependency order, the fleet project first.
+
+    Honeypots started in fleet mode go down with one `docker compose down`
+    of the fleet project; the rest are stopped layer by layer (dependents
+    first), each layer on the bounded pool when `jobs` > 1. A failure is
+    recorded and never keeps the other honeypots running.
+
+    Args:
+        honeypot_ids: Honeypots to stop
+        jobs: Maximum number of honeypots torn down at the same time
+        remove_volumes: Pass -v to docker compose down
+        remove_images: Pass --rmi all to docker compose down
+        after_stop: Optional per-honeypot callback once its containers stopped
+
+    Returns:
+        List of (honeypot_id, exception) for the honeypots that failed
+    """
+    failures: List[Tuple[str, Exception]] = []
+
+    fleet_ids = [h for h in fleet_honeypot_ids() if h in honeypot_ids]
+    if fleet_ids:
+        # Also catch containers of members dropped from the fleet file while running
+        extra_args = ["--remove-orphans"] + (["-v"] if remove_volumes else []) + (["--rmi", "all"] if remove_images else [])
+        try:
+            run_fleet_action("down", extra_args=extra_args)
+            remove_fleet_compose()
+        except Exception as exc:
+            failures.extend((honeypot_id, exc) for honeypot_id in fleet_ids)
+        else:
+            for honeypot_id in fleet_ids:
+                try:
+                    if after_stop is not None:
+                        after_stop(honeypot_id)
+                except Exception as exc:
+                    failures.append((honeypot_id, exc))
+        honeypot_ids = [h for h in honeypot_ids if h not in fleet_ids]
+
+    for layer in teardown_layers(honeypot_ids):
+        if jobs > 1:
+            failures.extend(teardown_honeypots(
+                layer,
+                jobs=jobs,
+                remove_volumes=remove_volumes,
+                remove_images=remove_images,
+                after_stop=after_stop,
+            ))
+            continue
+        for honeypot_id in layer:
+            check_cancelled()
+            try:
+                down_honeypot(honeypot_id, remove_volumes=remove_volumes, remove_images=remove_images)
+                if after_stop is not None:
+                    # Containers must be gone before their data is removed
+                    wait_for_honeypot_stopped(honeypot_id)
+                    after_stop(honeypot_id)
+            except Exception as exc:
+                failures.append((honeypot_id, exc))
+    return failures
+
+
+def down_all_honeypots(jobs: int = 1) -> int:
+    """
+    Stop all imported honeypots.
+
+    Args:
+        jobs: Number of honeypots to stop concurrently (1 = sequential)
+
+    Returns:
+        Exit code (0 for success, 1 for error)
+    """
+    honeypot_ids = list_imported_honeypot_ids()
+    # Fleet members whose docker/<id> is already gone can still have containers
+    honeypot_ids += [h for h in fleet_honeypot_ids() if h not in honeypot_ids]
+    if not honeypot_ids:
+        print("No imported honeypots.")
+        return 0
+
+    failures = teardown_all(honeypot_ids, jobs=jobs)
+    for honeypot_id, exc in failures:
+        print(f"{PREFIX_ERROR} Failed to stop '{honeypot_id}': {exc}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def down_main(args) -> int:
+    """
+    Main function for the down command.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Exit code (0 for success, 1 for error, 2 for invalid arguments)
+    """
+    try:
+        if getattr(args, "all", False):
+            return down_all_honeypots(jobs=getattr(args, "jobs", 1) or 1)
+        else:
+            if not args.honeypot:
+                print("You must specify a honeypot or use --all", file=sys.stderr)
+                return 2
+            down_honeypot(args.honeypot)
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} Failed to stop: {exc}", file=sys.stderr)
+        return 1
+    return 0
@@ -152,11 +152,11 @@ def validate_yaml_file(file_path: Path) -> Tuple[bool, Optional[str]]:
     if yaml_validator is None:
         # Fallback: basic YAML syntax check
         try:
-            import yaml
+            from core import yaml_io
             with open(file_path, 'r', encoding='utf-8') as f:
-                yaml.safe_load(f)
+                yaml_io.safe_load(f)
             return True, None
-        except yaml.YAMLError as e:
+        except yaml_io.YAMLError as e:
             return False, f"YAML syntax error: {e}"
         except Exception as e:
             return False, f"File reading error: {e}"
@@ -190,7 +190,15 @@ def edit_honeypot_config(honeypot_name: str) -> int:
         print(f"   Tip: Available honeypots: {', '.join([f.stem for f in HONEYPOT_MANIFEST_DIR.glob('*.yml')])}")
         return 1
 
-    return edit_file_with_validation(yaml_file, is_yaml=True)
+    result = edit_file_with_validation(yaml_file, is_yaml=True)
+
+    # Drop the cached manifest even if the edit kept size and mtime
+    try:
+        from core.registry import get_registry
+        get_registry().invalidate(yaml_file)
+    except Exception:
+        pass
+    return result
 
 def edit_config_file() -> int:
     """
@@ -0,0 +1,36 @@
+"""
+Enable/disable helpers for HPone.
+
+Command handlers that toggle the `enabled` field of honeypot YAML files.
+"""
+
+import sys
+
+from core.yaml import set_honeypot_enabled
+from core.utils import PREFIX_OK, PREFIX_ERROR
+
+
+def enable_main(args) -> int:
+    """Main entry point for the enable command."""
+    try:
+        # Handle multiple honeypots
+        for honeypot in args.honeypot:
+            set_honeypot_enabled(honeypot, True)
+            print(f"{PREFIX_OK}: Honeypot '{honeypot}' enabled.")
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} Failed to enable honeypots: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def disable_main(args) -> int:
+    """Main entry point for the disable command."""
+    try:
+        # Handle multiple honeypots
+        for honeypot in args.honeypot:
+            set_honeypot_enabled(honeypot, False)
+            print(f"{PREFIX_OK}: Honeypot '{honeypot}' disabled.")
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} Failed to disable honeypots: {exc}", file=sys.stderr)
+        return 1
+    return 0
@@ -4,8 +4,11 @@ Error handlers for HPone.
 Helpers to handle errors more gracefully and user-friendly.
 """
 
+import os
+import stat
 import sys
-from typing import Any, Callable, TypeVar, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 from functools import wraps
 from core.utils import PREFIX_ERROR
 
@@ -131,6 +134,34 @@ def check_file_permissions(file_path: str) -> bool:
 def check_docker_permissions() -> bool:
     """Check if Docker is accessible and user has proper permissions."""
     import subprocess
+    from core.docker_api import get_client, DockerAPIError
+    from core.preflight import cached_preflight, store_preflight
+
+    # Recently verified for this binary/socket/groups combination
+    if cached_preflight("docker_access"):
+        return True
+
+    # Ask the daemon directly over its socket when possible (no CLI fork)
+    client = get_client()
+    if client is not None:
+        try:
+            client.info()
+            store_preflight("docker_access", True)
+            return True
+        except PermissionError:
+            print(f"{PREFIX_ERROR} Docker permission denied!")
+            print("   Fix: Add your user to the docker group: sudo usermod -aG docker $USER")
+            print("   Then restart your shell")
+            return False
+        except (ConnectionRefusedError, FileNotFoundError):
+            print(f"{PREFIX_ERROR} Docker service is not running!")
+            print("   Start Docker service: sudo systemctl start docker")
+            return False
+        except DockerAPIError as e:
+            print(f"{PREFIX_ERROR} Docker command failed: {e.message}")
+            return False
+        except Exception:
+            pass  # Fall back to the docker CLI below
 
     try:
         result = subprocess.run(
@@ -141,6 +172,7 @@ def check_docker_permissions() -> bool:
         )
 
         if result.returncode == 0:
+            store_preflight("docker_access", True)
             return True
 
         # Handle common Docker errors
@@ -184,92 +216,230 @@ def check_directory_permissions(dir_path: str) -> bool:
         return False
 
 
-def auto_fix_permissions() -> bool:
-    """Automatically fix HPone directory permissions if possible."""
-    import subprocess
-    import os
-    from pathlib import Path
+# Wanted (directory mode, file mode); data/ must be writable by container users
+_PERMISSION_DIRS = ("docker", "conf", "honeypots", "data")
+_PERMISSION_MODES = {"data": (0o2777, 0o666)}
+_DEFAULT_PERMISSION_MODES = (0o2775, 0o664)
+_PERMISSIONS_STATE_VERSION = 1
+
+# Scopes (honeypot ID, or None for everything) already fixed by this process
+_PERMISSIONS_FIXED: Dict[Optional[str], bool] = {}
+
+
+def _hpone_base() -> Optional[Path]:
+    """Project root for .deb (/opt/hpone) and source installs, or None if unknown."""
+    # Check if we're in a .deb package installation
+    if Path("/opt/hpone").exists():
+        return Path("/opt/hpone")
+    # Go up from hpone/scripts/error_handlers.py to project root
+    script_dir = Path(__file__).resolve().parent.parent.parent
+    if (script_dir / "app.py").exists():
+        return script_dir
+    return None
+
+
+def _permission_targets(hpone_base: Path, honeypot_id: Optional[str]) -> List[Tuple[str, Path]]:
+    """(top-level dirname, path) pairs to fix: everything, or only what one honeypot uses."""
+    targets = []
+    for dirname in _PERMISSION_DIRS:
+        if honeypot_id is None:
+            path = hpone_base / dirname
+        elif dirname == "honeypots":
+            path = hpone_base / dirname / f"{honeypot_id}.yml"
+        else:
+            path = hpone_base / dirname / honeypot_id
+        if path.exists():
+            targets.append((dirname, path))
+    return targets
+
+
+def _fix_entry(path: str, st: os.stat_result, mode: int, gid: Optional[int]) -> bool:
+    """chgrp/chmod one entry only if it differs; returns False if a change failed."""
+    if st.st_nlink > 1 and not stat.S_ISDIR(st.st_mode):
+        # Hardlinked template (see materialize_file): the inode is shared with
+        # the template tree, whose mode and group must stay as they are
+        return True
+    ok = True
+    # chgrp first: chown may clear the setgid bit that chmod sets
+    if gid is not None and st.st_gid != gid:
+        try:
+            os.chown(path, -1, gid)
+        except OSError:
+            ok = False
+    if stat.S_IMODE(st.st_mode) != mode or (gid is not None and st.st_gid != gid):
+        try:
+            os.chmod(path, mode)
+        except OSError:
+            ok = False
+    return ok
 
+
+def _fix_tree(root: Path, dir_mode: int, file_mode: int, gid: Optional[int],
+              known: Dict[str, list], seen: Dict[str, list]) -> None:
+    """
+    Walk `root` with os.scandir, fixing wrong modes/groups in place.
+
+    `known` maps a directory to [mtime_ns, subdirectory names] from an earlier
+    clean pass; while its mtime is unchanged no entry was added, removed or
+    renamed in it, so its files are skipped and only its subdirectories are
+    visited. Clean directories of this pass are recorded in `seen`.
+    """
     try:
-        # Flexible path detection for different installation types
-        hpone_base = None
+        root_st = os.lstat(root)
+    except OSError:
+        return
+    if not stat.S_ISDIR(root_st.st_mode):
+        if stat.S_ISREG(root_st.st_mode):
+            _fix_entry(str(root), root_st, file_mode, gid)
+        return
+
+    stack = [str(root)]
+    while stack:
+        dir_path = stack.pop()
+        try:
+            dir_st = os.lstat(dir_path)
+        except OSError:
+            continue
+        # A chmod/chgrp changes ctime only, so the mtime below stays comparable
+        clean = _fix_entry(dir_path, dir_st, dir_mode, gid)
+
+        previous = known.get(dir_path)
+        if previous is not None and previous[0] == dir_st.st_mtime_ns:
+            seen[dir_path] = previous
+            stack.extend(os.path.join(dir_path, name) for name in previous[1])
+            continue
+
+        subdirs: List[str] = []
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            if not _fix_entry(entry.path, entry.stat(follow_symlinks=False), file_mode, gid):
+                                clean = False
+                    except OSError:
+                        clean = False
+        except OSError:
+            continue
+        if clean:
+            seen[dir_path] = [dir_st.st_mtime_ns, subdirs]
+
+
+def _fix_with_sudo(dirname: str, path: Path) -> None:
+    """Fallback for users outside the docker group: one batched sudo pass over wrong entries."""
+    import subprocess
 
-        # Check if we're in a .deb package installation
-        if Path("/opt/hpone").exists():
-            hpone_base = Path("/opt/hpone")
-        else:
-            # Fallback to script location for development/manual installs
-            # Go up from hpone/scripts/error_handlers.py to project root
-            script_dir = Path(__file__).resolve().parent.parent.parent
-            if (script_dir / "app.py").exists():
-                hpone_base = script_dir
+    dir_mode, file_mode = _PERMISSION_MODES.get(dirname, _DEFAULT_PERMISSION_MODES)
+    # Files with more than one link are hardlinked templates and left alone
+    for kind, mode, links in (("d", dir_mode, []), ("f", file_mode, ["-links", "1"])):
+        perm = f"{mode:o}"
+        subprocess.run(["sudo", "-n", "find", str(path), "-type", kind, *links, "!", "-perm", perm,
+                        "-exec", "chmod", perm, "{}", "+"], capture_output=True)
+    subprocess.run(["sudo", "-n", "find", str(path), "(", "-type", "d", "-o", "-links", "1", ")",
+                    "!", "-group", "docker", "-exec", "chgrp", "-h", "docker", "{}", "+"], capture_output=True)
+
+
+def auto_fix_permissions(honeypot_id: Optional[str] = None) -> bool:
+    """
+    Fix group/modes of the HPone directories used by a honeypot (or all of them).
 
+    Runs in-process and only touches entries whose mode or group is wrong.
+    Directories unchanged since the last clean pass (by mtime, persisted in
+    CACHE_DIR/permissions.json) are not listed again. Each scope is fixed at
+    most once per process.
+
+    Args:
+        honeypot_id: Only fix docker/<id>, data/<id>, conf/<id> and
+            honeypots/<id>.yml; None fixes the four directories entirely
+
+    Returns:
+        True if permissions were fixed (or nothing needed fixing)
+    """
+    if None in _PERMISSIONS_FIXED:
+        return _PERMISSIONS_FIXED[None]
+    if honeypot_id in _PERMISSIONS_FIXED:
+        return _PERMISSIONS_FIXED[honeypot_id]
+    result = _auto_fix_permissions(honeypot_id)
+    _PERMISSIONS_FIXED[honeypot_id] = result
+    return result
+
+
+def reset_auto_fix_permissions() -> None:
+    """Allow auto_fix_permissions to run again (the daemon calls this per job)."""
+    _PERMISSIONS_FIXED.clear()
+
+
+def _auto_fix_permissions(honeypot_id: Optional[str]) -> bool:
+    import grp
+    import json
+
+    try:
+        hpone_base = _hpone_base()
         if not hpone_base or not hpone_base.exists():
             return False  # Cannot determine HPone installation path
 
-        # Directories that need permission fixing
-        target_dirs = []
-        for dirname in ["docker", "conf", "honeypots", "data"]:
-            dir_path = hpone_base / dirname
-            if dir_path.exists():
-                target_dirs.append((dirname, dir_path))
-
+        target_dirs = _permission_targets(hpone_base, honeypot_id)
         if not target_dirs:
             return True  # Nothing to fix
 
-        # Check if user is in docker group or has sudo access
-        in_docker_group = False
-        can_sudo = False
-
         try:
-            result = subprocess.run(["groups"], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0 and "docker" in result.stdout:
-                in_docker_group = True
-        except Exception:
-            pass
+            docker_gid: Optional[int] = grp.getgrnam("docker").gr_gid
+        except KeyError:
+            docker_gid = None
 
-        try:
-            result = subprocess.run(["sudo", "-n", "true"], capture_output=True, timeout=5)
-            if result.returncode == 0:
-                can_sudo = True
-        except Exception:
-            pass
+        is_root = os.geteuid() == 0
+        in_docker_group = docker_gid is not None and (docker_gid in os.getgroups() or os.getegid() == docker_gid)
 
-        if not in_docker_group and not can_sudo:
-            return False  # Cannot fix permissions
+        if not in_docker_group and not is_root:
+            # Cannot fix in-process; sudo only if it works without a password
+            import subprocess
+            try:
+                can_sudo = subprocess.run(["sudo", "-n", "true"], capture_output=True, timeout=5).returncode == 0
+            except Exception:
+                can_sudo = False
+            if not can_sudo:
+                return False  # Cannot fix permissions
+            for dirname, dir_path in target_dirs:
+                try:
+                    _fix_with_sudo(dirname, dir_path)
+                except Exception:
+                    # Silently continue if fixing one directory fails
+                    continue
+            return True
 
-        # Fix permissions for each directory
+        from core.constants import CACHE_DIR
+        state_path = CACHE_DIR / "permissions.json"
+        try:
+            with state_path.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        if state.get("version") != _PERMISSIONS_STATE_VERSION or state.get("gid") != docker_gid:
+            state = {}
+        known: Dict[str, list] = state.get("dirs") or {}
+
+        # Drop the old entries of the scanned trees; untouched trees keep theirs
+        seen: Dict[str, list] = {}
+        scanned = [str(path) for _dirname, path in target_dirs]
         for dirname, dir_path in target_dirs:
-            try:
-                if dirname == "data":
-                    # Data directory needs world-writable permissions for containers
-                    dir_perm = "2777"
-                    file_perm = "666"
-                else:
-                    # Other directories use group-writable permissions
-                    dir_perm = "2775"
-                    file_perm = "664"
-
-                if in_docker_group:
-                    # Fix without sudo
-                    subprocess.run(["find", str(dir_path), "-type", "d", "-exec", "chmod", dir_perm, "{}", ";"],
-                                 capture_output=True, timeout=10)
-                    subprocess.run(["find", str(dir_path), "-type", "f", "-exec", "chmod", file_perm, "{}", ";"],
-                                 capture_output=True, timeout=10)
-                    subprocess.run(["chgrp", "-R", "docker", str(dir_path)],
-                                 capture_output=True, timeout=10)
-                elif can_sudo:
-                    # Fix with sudo
-                    subprocess.run(["sudo", "find", str(dir_path), "-type", "d", "-exec", "chmod", dir_perm, "{}", ";"],
-                                 capture_output=True, timeout=10)
-                    subprocess.run(["sudo", "find", str(dir_path), "-type", "f", "-exec", "chmod", file_perm, "{}", ";"],
-                                 capture_output=True, timeout=10)
-                    subprocess.run(["sudo", "chgrp", "-R", "docker", str(dir_path)],
-                                 capture_output=True, timeout=10)
+            dir_mode, file_mode = _PERMISSION_MODES.get(dirname, _DEFAULT_PERMISSION_MODES)
+            _fix_tree(dir_path, dir_mode, file_mode, docker_gid, known, seen)
+        remaining = {d: v for d, v in known.items()
+                     if not any(d == root or d.startswith(root + os.sep) for root in scanned)}
+        remaining.update(seen)
 
-            except Exception:
-                # Silently continue if fixing one directory fails
-                continue
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = state_path.with_name(f"{state_path.name}.{os.getpid()}.tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump({"version": _PERMISSIONS_STATE_VERSION, "gid": docker_gid, "dirs": remaining}, f)
+            os.replace(tmp_path, state_path)
+        except OSError:
+            # High-water marks are best-effort (e.g. read-only home)
+            pass
 
         return True
 
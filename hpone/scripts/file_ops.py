@@ -4,14 +4,109 @@ File helpers for HPone.
 Functions to manage files, directories, and templates.
 """
 
+import errno
+import hashlib
+import os
 import shutil
+import stat
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
 
 # Import constants dari helpers
 from core.constants import TEMPLATE_DOCKER_DIR, OUTPUT_DOCKER_DIR, DATA_DIR
+from core.compose_fleet import refresh_fleet_compose
 from core.utils import PREFIX_OK, PREFIX_WARN, PREFIX_ERROR
 
+# Import configuration
+try:
+    from config import HARDLINK_TEMPLATES
+except ImportError:
+    HARDLINK_TEMPLATES = False
+
+# ioctl(dest_fd, FICLONE, src_fd): share the source extents copy-on-write (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+# Errors meaning "this filesystem pair cannot do that", not "this file failed"
+_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.ENOSYS, errno.EPERM, errno.EMLINK}
+
+# (source st_dev, destination st_dev) -> materialization methods known not to work
+_UNSUPPORTED_METHODS: Dict[Tuple[int, int], Set[str]] = {}
+_METHODS_LOCK = threading.Lock()
+
+
+def _method_supported(devices: Tuple[int, int], method: str) -> bool:
+    with _METHODS_LOCK:
+        return method not in _UNSUPPORTED_METHODS.get(devices, set())
+
+
+def _mark_unsupported(devices: Tuple[int, int], method: str) -> None:
+    with _METHODS_LOCK:
+        _UNSUPPORTED_METHODS.setdefault(devices, set()).add(method)
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    with src.open("rb") as fsrc, dst.open("wb") as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    shutil.copystat(src, dst)
+
+
+def materialize_file(src: Path, dst: Path, read_only: bool = False) -> Tuple[str, int]:
+    """
+    Put a template file at `dst` as cheaply as the filesystem allows.
+
+    Tries a FICLONE reflink first, then (only for files treated as read-only)
+    a hardlink, then a regular copy. Methods that fail for a source/destination
+    filesystem pair are remembered and not tried again for that pair.
+
+    Returns:
+        Tuple of (method used: "reflink", "hardlink" or "copy", bytes written)
+    """
+    src_st = src.stat()
+    devices = (src_st.st_dev, dst.parent.stat().st_dev)
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+
+    if fcntl is not None and _method_supported(devices, "reflink"):
+        try:
+            _reflink(src, dst)
+            return "reflink", 0
+        except OSError as exc:
+            if exc.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            _mark_unsupported(devices, "reflink")
+            try:
+                dst.unlink()
+            except OSError:
+                pass
+
+    if read_only and _method_supported(devices, "hardlink"):
+        try:
+            os.link(src, dst)
+            return "hardlink", 0
+        except OSError as exc:
+            if exc.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            _mark_unsupported(devices, "hardlink")
+
+    shutil.copy2(src, dst)
+    return "copy", src_st.st_size
+
+
+def _is_read_only(path: Path) -> bool:
+    """Template files without any write bit (or all of them with HARDLINK_TEMPLATES) may be hardlinked."""
+    if HARDLINK_TEMPLATES:
+        return True
+    try:
+        return not (path.stat().st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+    except OSError:
+        return False
+
 def ensure_destination_dir(dest: Path, force: bool = False) -> None:
     if dest.exists():
         if force:
@@ -61,24 +156,115 @@ def find_template_dir(honeypot_id: str) -> Path:
     )
 
 
-def copy_template_to_destination(template_dir: Path, dest_dir: Path) -> None:
-    """Copy template contents to the destination directory."""
+def copy_template_to_destination(template_dir: Path, dest_dir: Path) -> int:
+    """Copy template contents to the destination directory. Returns bytes written."""
     # If using TEMPLATE_DOCKER_DIR as a generic template, copy only Dockerfile and docker-compose.yml
     if template_dir == TEMPLATE_DOCKER_DIR:
+        written = 0
         for fname in ("Dockerfile", "docker-compose.yml"):
             src = template_dir / fname
             if src.exists():
-                shutil.copy2(src, dest_dir / fname)
-        return
+                written += materialize_file(src, dest_dir / fname)[1]
+        return written
 
     # If honeypot-specific template (contains dist/, etc.), copy the tree
+    written = 0
+
+    def _copy(src: str, dst: str) -> None:
+        nonlocal written
+        written += materialize_file(Path(src), Path(dst), read_only=_is_read_only(Path(src)))[1]
+
     for item in template_dir.iterdir():
         src = item
         dst = dest_dir / item.name
         if src.is_dir():
-            shutil.copytree(src, dst)
+            shutil.copytree(src, dst, copy_function=_copy)
+        else:
+            written += materialize_file(src, dst, read_only=_is_read_only(src))[1]
+    return written
+
+
+# Files in docker/<id>/ that are rendered from the template instead of copied
+RENDERED_FILES = ("docker-compose.yml", ".env")
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_template_files(template_dir: Path, previous: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Return {relative_path: {"size", "mtime_ns", "sha256"}} for the template files
+    that an import copies. Hashes from `previous` are reused when size and
+    mtime are unchanged, so an unchanged template is only stat()ed.
+    """
+    previous = previous or {}
+    if template_dir == TEMPLATE_DOCKER_DIR:
+        paths = [template_dir / fname for fname in ("Dockerfile", "docker-compose.yml")]
+    else:
+        paths = []
+        for root, _dirs, names in os.walk(template_dir, followlinks=True):
+            paths.extend(Path(root) / name for name in names)
+
+    files: Dict[str, Dict[str, Any]] = {}
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        rel = path.relative_to(template_dir).as_posix()
+        old = previous.get(rel) or {}
+        if old.get("size") == st.st_size and old.get("mtime_ns") == st.st_mtime_ns and old.get("sha256"):
+            sha = old["sha256"]
         else:
-            shutil.copy2(src, dst)
+            sha = _file_digest(path)
+        files[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha}
+    return files
+
+
+def sync_template_to_destination(template_dir: Path, dest_dir: Path, files: Dict[str, Dict[str, Any]],
+                                 previous: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, int]:
+    """
+    Bring the destination in line with the template: materialize new or
+    changed files (or files whose copy was touched) and delete files the
+    template no longer has. Unchanged files are left alone so the Docker build
+    context stays valid. Rendered files (RENDERED_FILES) are handled by the
+    import itself.
+
+    Returns:
+        Counters: files per method ("reflink", "hardlink", "copy") and "bytes_written"
+    """
+    previous = previous or {}
+    stats = {"reflink": 0, "hardlink": 0, "copy": 0, "bytes_written": 0}
+    for rel, meta in files.items():
+        if rel in RENDERED_FILES:
+            continue
+        dst = dest_dir / rel
+        old = previous.get(rel) or {}
+        if old.get("sha256") == meta["sha256"]:
+            try:
+                st = dst.stat()
+                if st.st_size == meta["size"] and st.st_mtime_ns == meta["mtime_ns"]:
+                    continue
+            except OSError:
+                pass
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        src = template_dir / rel
+        method, written = materialize_file(src, dst, read_only=_is_read_only(src))
+        stats[method] += 1
+        stats["bytes_written"] += written
+
+    for rel in previous:
+        if rel not in files and rel not in RENDERED_FILES:
+            try:
+                (dest_dir / rel).unlink()
+            except OSError:
+                pass
+    return stats
 
 
 def remove_honeypot(honeypot_id: str) -> None:
@@ -87,6 +273,8 @@ def remove_honeypot(honeypot_id: str) -> None:
         print(f"{PREFIX_WARN} Folder not found: {dest_dir}")
         return
     shutil.rmtree(dest_dir)
+    # Drop it from the fleet file, which would otherwise point at the deleted folder
+    refresh_fleet_compose()
     print(f"{PREFIX_OK}: Removed honeypot {honeypot_id}")
 
 
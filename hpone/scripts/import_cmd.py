@@ -2,36 +2,214 @@
 Import helpers for HPone.
 
 Functions to import honeypot templates.
+
+Re-imports are incremental: `docker/<id>/.hpone-manifest.json` records the
+template file hashes and a digest of the render inputs, so only changed files
+are copied and `.env`/`docker-compose.yml` are only re-rendered when their
+inputs (or the rendered files themselves) changed.
 """
 
+import hashlib
+import json
+import os
+import shutil
+import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Import constants dan functions dari helpers
 from core.constants import OUTPUT_DOCKER_DIR
 from core.yaml import load_honeypot_yaml_by_filename
-from .file_ops import ensure_destination_dir, find_template_dir, copy_template_to_destination
-from core.config import ensure_volume_directories, generate_env_file, rewrite_compose_with_env
-from core.utils import PREFIX_WARN
+from .file_ops import (
+    ensure_destination_dir,
+    find_template_dir,
+    hash_template_files,
+    sync_template_to_destination,
+    RENDERED_FILES,
+)
+from core.config import ensure_volume_directories, generate_env_file
+from core.render_cache import render_compose_file
+from core.utils import PREFIX_OK, PREFIX_ERROR, PREFIX_WARN
+
+# Import konfigurasi ALWAYS_IMPORT
+try:
+    from config import ALWAYS_IMPORT
+except ImportError:
+    ALWAYS_IMPORT = True
+
+IMPORT_MANIFEST_NAME = ".hpone-manifest.json"
+IMPORT_MANIFEST_VERSION = 1
+
+
+def load_import_manifest(dest_dir: Path) -> Optional[Dict[str, Any]]:
+    """Return the import manifest of an imported honeypot, or None if missing/outdated."""
+    try:
+        with (dest_dir / IMPORT_MANIFEST_NAME).open("r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != IMPORT_MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def _write_import_manifest(dest_dir: Path, manifest: Dict[str, Any]) -> None:
+    path = dest_dir / IMPORT_MANIFEST_NAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _render_inputs_digest(resolved_name: str, cfg: Dict[str, Any], files: Dict[str, Dict[str, Any]]) -> str:
+    """Digest of everything `.env` and `docker-compose.yml` are rendered from."""
+    payload = json.dumps({
+        "name": resolved_name,
+        "config": cfg,
+        "compose": (files.get("docker-compose.yml") or {}).get("sha256"),
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _rendered_digests(dest_dir: Path) -> Dict[str, str]:
+    digests: Dict[str, str] = {}
+    for fname in RENDERED_FILES:
+        try:
+            digests[fname] = hashlib.sha256((dest_dir / fname).read_bytes()).hexdigest()
+        except OSError:
+            continue
+    return digests
+
+
+def format_import_stats(stats: Dict[str, int]) -> str:
+    """Short summary of an import's materialization counters, e.g. `12 reflinked, 1.2 MB written`."""
+    parts = [f"{stats[key]} {label}" for key, label in (("reflink", "reflinked"), ("hardlink", "hardlinked"), ("copy", "copied")) if stats.get(key)]
+    if not parts:
+        return "unchanged"
+    written = float(stats.get("bytes_written", 0))
+    for unit in ("B", "KB", "MB", "GB"):
+        if written < 1024 or unit == "GB":
+            break
+        written /= 1024
+    parts.append(f"{written:.0f} {unit} written" if unit == "B" else f"{written:.1f} {unit} written")
+    return ", ".join(parts)
+
 
+def import_honeypot(honeypot_id: str, force: bool = False, stats: Optional[Dict[str, int]] = None) -> Path:
+    """
+    Import (or incrementally re-import) a honeypot into docker/<id>/.
 
-def import_honeypot(honeypot_id: str, force: bool = False) -> Path:
+    When `stats` is given it is filled with the materialization counters
+    (files per method and "bytes_written").
+    """
     resolved_name, cfg = load_honeypot_yaml_by_filename(honeypot_id)
     dest_dir = OUTPUT_DOCKER_DIR / honeypot_id
 
     # Check if template exists BEFORE creating destination directory
     template_dir = find_template_dir(honeypot_id)
 
-    # Only create destination directory if template is found
-    ensure_destination_dir(dest_dir, force=force)
-    copy_template_to_destination(template_dir, dest_dir)
+    previous = load_import_manifest(dest_dir) if force and dest_dir.exists() else None
+    if previous is not None and previous.get("template_dir") != str(template_dir):
+        previous = None
+
+    if previous is None:
+        # First import, or no usable manifest: start from a clean destination
+        ensure_destination_dir(dest_dir, force=force)
+        previous_files: Dict[str, Dict[str, Any]] = {}
+    else:
+        previous_files = previous.get("files") or {}
+
+    files = hash_template_files(template_dir, previous_files)
+    sync_stats = sync_template_to_destination(template_dir, dest_dir, files, previous_files)
+    if stats is not None:
+        stats.update(sync_stats)
     # Ensure host directories for volumes exist
     ensure_volume_directories(cfg)
+
+    inputs = _render_inputs_digest(resolved_name, cfg, files)
+    if previous is not None and previous.get("inputs") == inputs and previous.get("outputs") == _rendered_digests(dest_dir):
+        # Nothing to render; only refresh the manifest when template stats moved
+        if files != previous_files:
+            _write_import_manifest(dest_dir, dict(previous, files=files))
+        return dest_dir
+
+    # Render from the template compose file (cached per template + manifest)
+    template_compose = template_dir / "docker-compose.yml"
     generate_env_file(dest_dir, resolved_name, cfg)
     try:
-        rewrite_compose_with_env(dest_dir, honeypot_id, resolved_name, cfg)
+        render_compose_file(template_compose, dest_dir, honeypot_id, resolved_name, cfg)
     except Exception as exc:
-        # Non-fatal: continue even if rewrite fails
+        # Non-fatal: continue with the unmodified template compose file
+        if template_compose.exists():
+            shutil.copy2(template_compose, dest_dir / "docker-compose.yml")
         print(f"{PREFIX_WARN} Failed to adjust docker-compose.yml for env: {exc}")
 
+    _write_import_manifest(dest_dir, {
+        "version": IMPORT_MANIFEST_VERSION,
+        "template_dir": str(template_dir),
+        "files": files,
+        "inputs": inputs,
+        "outputs": _rendered_digests(dest_dir),
+    })
     return dest_dir
+
+
+def import_main(args) -> int:
+    """Main entry point for the import command (only available when ALWAYS_IMPORT=false)."""
+    if ALWAYS_IMPORT:
+        return 1
+
+    try:
+        if getattr(args, "all", False):
+            from .list import list_all_enabled_honeypot_ids
+            # Import all enabled honeypots
+            honeypot_ids = list_all_enabled_honeypot_ids()
+            if not honeypot_ids:
+                print("No enabled honeypots.")
+                return 0
+            print(f"Importing {len(honeypot_ids)} enabled honeypots...")
+            for t in honeypot_ids:
+                try:
+                    stats = {}
+                    import_honeypot(t, force=bool(args.force), stats=stats)
+                    print(f"{PREFIX_OK}: Imported '{t}' ({format_import_stats(stats)})")
+                except Exception as exc:
+                    print(f"{PREFIX_ERROR} Failed to import '{t}': {exc}", file=sys.stderr)
+                    continue
+        else:
+            if not args.honeypot:
+                print("You must specify a honeypot or use --all", file=sys.stderr)
+                return 2
+            stats = {}
+            import_honeypot(args.honeypot, force=bool(args.force), stats=stats)
+            print(f"{PREFIX_OK}: Imported '{args.honeypot}' ({format_import_stats(stats)})")
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} Failed to import: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def update_main(args) -> int:
+    """Main entry point for the update command: re-import every imported honeypot."""
+    if ALWAYS_IMPORT:
+        return 1
+
+    try:
+        from .list import list_imported_honeypot_ids
+        honeypot_ids = list_imported_honeypot_ids()
+        if not honeypot_ids:
+            print("No imported honeypots.")
+            return 0
+        print(f"Updating {len(honeypot_ids)} imported honeypots...")
+        for t in honeypot_ids:
+            try:
+                stats = {}
+                import_honeypot(t, force=True, stats=stats)
+                print(f"{PREFIX_OK}: Updated '{t}' ({format_import_stats(stats)})")
+            except Exception as exc:
+                print(f"{PREFIX_ERROR} Failed to update '{t}': {exc}", file=sys.stderr)
+                continue
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} Failed to update: {exc}", file=sys.stderr)
+        return 1
+    return 0
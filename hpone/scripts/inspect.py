@@ -5,24 +5,65 @@ Functions to render clean and informative output.
 """
 
 import glob
+import sys
 from pathlib import Path
-from typing import List
-
-try:
-    import yaml  # type: ignore
-except ImportError:
-    raise ImportError("PyYAML diperlukan untuk modul ini")
+from typing import Any, Dict, List
 
 # Import constants dan functions dari helpers
 from core.constants import HONEYPOT_MANIFEST_DIR, OUTPUT_DOCKER_DIR
 from core.utils import _format_table, PREFIX_ERROR
 from core.config import parse_ports, parse_volumes
 from core.docker import is_honeypot_running
+from core.state_cache import current_fleet
 
 # Fungsi list_honeypots dipindah ke scripts/list.py untuk avoid duplication
 
-def inspect_honeypot(honeypot_id: str) -> None:
-    """Show detailed information about a honeypot."""
+# Fields of an inspect record (`inspect --output json|ndjson|csv`)
+INSPECT_RECORD_FIELDS = [
+    "id", "name", "enabled", "imported", "running", "description",
+    "ports", "volumes", "env", "service", "services", "config_path", "docker_dir", "env_file",
+]
+
+
+def honeypot_record(honeypot_id: str) -> Dict[str, Any]:
+    """
+    Everything `inspect` shows about a honeypot as one plain record (no ANSI).
+
+    Raises:
+        FileNotFoundError: When the honeypot has no manifest
+    """
+    from core.yaml import load_honeypot_yaml_by_filename, find_honeypot_yaml_path
+    resolved_name, config = load_honeypot_yaml_by_filename(honeypot_id)
+    yaml_path = find_honeypot_yaml_path(honeypot_id)
+    docker_dir = OUTPUT_DOCKER_DIR / honeypot_id
+    imported_flag = docker_dir.exists()
+    env_file = docker_dir / ".env"
+    services = config.get("services")
+    return {
+        "id": yaml_path.stem,
+        "name": resolved_name,
+        "enabled": bool(config.get("enabled") is True),
+        "imported": imported_flag,
+        "running": is_honeypot_running(honeypot_id, fleet=current_fleet()),
+        "description": str(config.get("description") or ""),
+        "ports": [{"host": host, "container": container} for host, container in parse_ports(config)],
+        "volumes": [{"source": src, "target": dst} for src, dst in parse_volumes(config)],
+        "env": {str(k): v for k, v in (config.get("env") or {}).items()},
+        "service": config.get("service"),
+        "services": [str(s) for s in services] if services else None,
+        "config_path": str(yaml_path),
+        "docker_dir": str(docker_dir) if imported_flag else None,
+        "env_file": str(env_file) if imported_flag and env_file.exists() else None,
+    }
+
+
+def inspect_honeypot(honeypot_id: str, output: str = "table") -> None:
+    """Show detailed information about a honeypot (or write it as a json/ndjson/csv record)."""
+    if output != "table":
+        from core.output import write_records
+        write_records([honeypot_record(honeypot_id)], output, INSPECT_RECORD_FIELDS, single=True)
+        return
+
     try:
         from core.yaml import load_honeypot_yaml_by_filename, find_honeypot_yaml_path
         resolved_name, config = load_honeypot_yaml_by_filename(honeypot_id)
@@ -36,7 +77,7 @@ def inspect_honeypot(honeypot_id: str) -> None:
     # Status info
     enabled_flag = bool(config.get("enabled") is True)
     imported_flag = (OUTPUT_DOCKER_DIR / honeypot_id).exists()
-    running_flag = is_honeypot_running(honeypot_id)
+    running_flag = is_honeypot_running(honeypot_id, fleet=current_fleet())
 
     # Status indicators
     enabled_icon = "✅" if enabled_flag else "❌"
@@ -129,3 +170,13 @@ def inspect_honeypot(honeypot_id: str) -> None:
         print(f"📁 File Information: Error ({exc})")
 
     print(f"\n🎉 Inspection complete!")
+
+
+def inspect_main(args) -> int:
+    """Main entry point for the inspect command."""
+    try:
+        inspect_honeypot(args.honeypot, output=getattr(args, "output", "table"))
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} Failed to inspect '{args.honeypot}': {exc}", file=sys.stderr)
+        return 1
+    return 0
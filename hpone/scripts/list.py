@@ -4,18 +4,14 @@ List helpers for HPone.
 Functions to list honeypots and resolve honeypot directory IDs.
 """
 
-import glob
+import sys
 from pathlib import Path
-from typing import List
-
-try:
-    import yaml  # type: ignore
-except ImportError:
-    raise ImportError("PyYAML is required for this module")
+from typing import Any, Dict, Iterator, List, Optional
 
 # Import constants dari helpers
 from core.constants import HONEYPOT_MANIFEST_DIR, OUTPUT_DOCKER_DIR
-from core.utils import COLOR_GREEN, COLOR_RED, COLOR_CYAN, COLOR_GRAY, _format_table
+from core.registry import get_registry
+from core.utils import COLOR_GREEN, COLOR_RED, COLOR_CYAN, COLOR_GRAY, PREFIX_ERROR, _format_table
 
 # Import konfigurasi dari config.py
 try:
@@ -28,32 +24,20 @@ except ImportError:
 
 def list_enabled_honeypot_ids() -> List[str]:
     honeypot_ids: List[str] = []
-    for path_str in glob.glob(str(HONEYPOT_MANIFEST_DIR / "*.yml")):
-        p = Path(path_str)
-        try:
-            with p.open("r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-            if data.get("enabled") is True:
-                # Hanya anggap imported jika folder docker/<stem> ada
-                if (OUTPUT_DOCKER_DIR / p.stem).exists():
-                    honeypot_ids.append(p.stem)
-        except Exception:
-            continue
+    for honeypot_id, _path, data in get_registry().entries():
+        if data.get("enabled") is True:
+            # Hanya anggap imported jika folder docker/<stem> ada
+            if (OUTPUT_DOCKER_DIR / honeypot_id).exists():
+                honeypot_ids.append(honeypot_id)
     return sorted(honeypot_ids)
 
 
 def list_all_enabled_honeypot_ids() -> List[str]:
     """Return all enabled honeypot IDs (imported or not)."""
     honeypot_ids: List[str] = []
-    for path_str in glob.glob(str(HONEYPOT_MANIFEST_DIR / "*.yml")):
-        p = Path(path_str)
-        try:
-            with p.open("r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-            if data.get("enabled") is True:
-                honeypot_ids.append(p.stem)
-        except Exception:
-            continue
+    for honeypot_id, _path, data in get_registry().entries():
+        if data.get("enabled") is True:
+            honeypot_ids.append(honeypot_id)
     return sorted(honeypot_ids)
 
 
@@ -85,58 +69,79 @@ def resolve_honeypot_dir_id(honeypot_id: str) -> str:
     return honeypot_id
 
 
-def list_honeypots(detailed: bool = False) -> None:
-    """Print the list of honeypots in a clean table format."""
-    yaml_files = sorted(glob.glob(str(HONEYPOT_MANIFEST_DIR / "*.yml")))
-    if not yaml_files:
-        print(f"No YAML files in the '{HONEYPOT_MANIFEST_DIR}' directory.")
-        return
+# Fields of a honeypot record (`list --output json|ndjson|csv`)
+HONEYPOT_RECORD_FIELDS = ["id", "name", "enabled", "imported", "running", "description", "ports", "volumes"]
 
-    rows_basic: List[List[str]] = []
-    rows_detail: List[List[str]] = []
 
-    for path_str in yaml_files:
-        p = Path(path_str)
+def iter_honeypot_records() -> Iterator[Dict[str, Any]]:
+    """Yield one plain record per honeypot manifest (no ANSI), in id order."""
+    # Import di dalam function untuk avoid circular import
+    from core.config import parse_ports, parse_volumes
+    from core.docker import is_honeypot_running
+    from core.state_cache import current_fleet
+    # At most one Docker round-trip for the whole listing
+    fleet = current_fleet()
+
+    for honeypot_id, _path, data in get_registry().entries():
+        try:
+            ports: Optional[List[Dict[str, str]]] = [
+                {"host": host, "container": container} for host, container in parse_ports(data)
+            ]
+        except Exception:
+            ports = None
         try:
-            with p.open("r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
+            volumes: Optional[List[Dict[str, str]]] = [
+                {"source": src, "target": dst} for src, dst in parse_volumes(data)
+            ]
         except Exception:
-            data = {}
+            volumes = None
+        yield {
+            "id": honeypot_id,
+            "name": str(data.get("name") or honeypot_id),
+            "enabled": bool(data.get("enabled") is True),
+            "imported": (OUTPUT_DOCKER_DIR / honeypot_id).exists(),
+            "running": is_honeypot_running(honeypot_id, fleet=fleet),
+            "description": str(data.get("description") or ""),
+            "ports": ports,
+            "volumes": volumes,
+        }
+
+
+def list_honeypots(detailed: bool = False, output: str = "table") -> None:
+    """Print the list of honeypots in a clean table format (or as json/ndjson/csv records)."""
+    if output != "table":
+        from core.output import write_records
+        write_records(iter_honeypot_records(), output, HONEYPOT_RECORD_FIELDS)
+        return
+
+    if not get_registry().ids():
+        print(f"No YAML files in the '{HONEYPOT_MANIFEST_DIR}' directory.")
+        return
 
-        name = str(data.get("name") or p.stem)
-        description = str(data.get("description") or "")
-        enabled_flag = bool(data.get("enabled") is True)
-        imported_flag = (OUTPUT_DOCKER_DIR / p.stem).exists()
+    rows_basic: List[List[str]] = []
+    rows_detail: List[List[str]] = []
 
-        # Import di dalam function untuk avoid circular import
-        from core.docker import is_honeypot_running
-        running_flag = is_honeypot_running(p.stem)
+    for record in iter_honeypot_records():
+        name = record["name"]
+        description = record["description"]
 
         # Apply ANSI colors using utils constants
-        enabled_str = f"{COLOR_GREEN}True\033[0m" if enabled_flag else f"{COLOR_RED}False\033[0m"
-        imported_str = f"{COLOR_CYAN}Yes\033[0m" if imported_flag else f"{COLOR_GRAY}No\033[0m"
-        status_str = f"{COLOR_GREEN}Up\033[0m" if running_flag else f"{COLOR_RED}Down\033[0m"
+        enabled_str = f"{COLOR_GREEN}True\033[0m" if record["enabled"] else f"{COLOR_RED}False\033[0m"
+        imported_str = f"{COLOR_CYAN}Yes\033[0m" if record["imported"] else f"{COLOR_GRAY}No\033[0m"
+        status_str = f"{COLOR_GREEN}Up\033[0m" if record["running"] else f"{COLOR_RED}Down\033[0m"
 
         rows_basic.append([name, enabled_str, imported_str, status_str, description])
 
         if detailed:
-            ports_info = ""
-            try:
-                from core.config import parse_ports
-                ports = parse_ports(data)
-                if ports:
-                    ports_info = ", ".join([f"{host}:{container}" for host, container in ports])
-            except Exception:
+            if record["ports"] is None:
                 ports_info = "(error parsing)"
+            else:
+                ports_info = ", ".join([f"{p['host']}:{p['container']}" for p in record["ports"]])
             # Volumes
-            volumes_info = ""
-            try:
-                from core.config import parse_volumes
-                vols = parse_volumes(data)
-                if vols:
-                    volumes_info = ", ".join([f"{src}:{dst}" for src, dst in vols])
-            except Exception:
+            if record["volumes"] is None:
                 volumes_info = "(error parsing)"
+            else:
+                volumes_info = ", ".join([f"{v['source']}:{v['target']}" for v in record["volumes"]])
 
             rows_detail.append([name, enabled_str, imported_str, status_str, description, ports_info, volumes_info])
 
@@ -158,3 +163,13 @@ def list_honeypots(detailed: bool = False) -> None:
             table = _format_table(["HONEYPOT", "ENABLE", "IMPORT", "STATUS", "DESCRIPTION"], rows_basic, max_width=LIST_BASIC_MAX_WIDTH)
 
     print(table)
+
+
+def list_main(args) -> int:
+    """Main entry point for the list command."""
+    try:
+        list_honeypots(detailed=bool(args.a), output=getattr(args, "output", "table"))
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} Failed to list honeypots: {exc}", file=sys.stderr)
+        return 1
+    return 0
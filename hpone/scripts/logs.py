@@ -8,20 +8,65 @@ Provides functionality to:
 3. View file contents with various options
 """
 
-import subprocess
+import itertools
 import sys
-import platform
 from pathlib import Path
 from typing import Dict, List, Optional
 
 try:
     import questionary
 except ImportError:
-    print("Error: questionary library not installed. Run: pip install questionary", file=sys.stderr)
-    sys.exit(1)
+    # Only the interactive menu needs it; `logs -f` / `--all` stream without it
+    questionary = None
 
 from core.docker import is_honeypot_running
-from core.utils import PREFIX_ERROR, PREFIX_WARN, PREFIX_OK
+from core.docker_api import get_client, API_ERRORS, STREAM_STDERR
+from core.log_stream import LogSource, stream_logs
+from core.file_search import SearchQuery, search_file
+from core.pager import page_file
+from core.utils import COLOR_GREEN, COLOR_RED, COLOR_RESET, PREFIX_ERROR, PREFIX_WARN, PREFIX_OK
+
+# Search modes offered by the file viewer (label -> core.file_search mode)
+SEARCH_MODE_CHOICES = {
+    '🔤 Text': 'literal',
+    '🔣 Regex': 'regex',
+    '🧾 JSON field (key=value, key~text)': 'field',
+}
+
+
+def _print_api_logs(honeypot_name: str, tail: int, follow: bool = False) -> bool:
+    """Print container logs through the Engine API. Returns False to fall back to the CLI."""
+    client = get_client()
+    if client is None:
+        return False
+    try:
+        frames = client.logs(honeypot_name, tail=tail, follow=follow)
+        # Pull the first frame before printing so request errors can still fall back
+        first = next(frames, None)
+    except API_ERRORS:
+        return False
+    if first is None:
+        return True
+    for stream_id, payload in itertools.chain([first], frames):
+        out = sys.stderr if stream_id == STREAM_STDERR else sys.stdout
+        out.buffer.write(payload)
+        out.flush()
+    return True
+
+
+def _print_compose_logs(honeypot_name: str, tail: int, follow: bool = False) -> None:
+    """Print the honeypot's logs with `docker compose logs` (its project, or its fleet services)."""
+    from core.compose_backend import get_compose_backend
+    from core.compose_fleet import fleet_compose_options, fleet_services
+    from core.constants import OUTPUT_DOCKER_DIR
+    from scripts.list import resolve_honeypot_dir_id
+
+    dir_id = resolve_honeypot_dir_id(honeypot_name)
+    services = fleet_services(dir_id)
+    if services:
+        get_compose_backend().logs(OUTPUT_DOCKER_DIR, services, follow=follow, tail=tail, options=fleet_compose_options())
+    else:
+        get_compose_backend().logs(OUTPUT_DOCKER_DIR / dir_id, follow=follow, tail=tail)
 
 
 def show_docker_logs(honeypot_name: str, follow: bool = False) -> None:
@@ -36,10 +81,9 @@ def show_docker_logs(honeypot_name: str, follow: bool = False) -> None:
             print(f"🔄 Following logs for {honeypot_name} (Ctrl+C to stop)")
             print("=" * 60)
 
-            cmd = ["docker", "logs", "-f", "--tail", "20", honeypot_name]
-
             try:
-                subprocess.run(cmd)
+                if not _print_api_logs(honeypot_name, tail=20, follow=True):
+                    _print_compose_logs(honeypot_name, tail=20, follow=True)
             except KeyboardInterrupt:
                 print(f"\n{PREFIX_OK} Stopped following logs")
 
@@ -48,8 +92,8 @@ def show_docker_logs(honeypot_name: str, follow: bool = False) -> None:
             print(f"📜 Recent logs for {honeypot_name}")
             print("=" * 60)
 
-            cmd = ["docker", "logs", "--tail", "30", honeypot_name]
-            subprocess.run(cmd)
+            if not _print_api_logs(honeypot_name, tail=30):
+                _print_compose_logs(honeypot_name, tail=30)
             print("=" * 60)
 
     except Exception as exc:
@@ -101,36 +145,31 @@ def parse_mounted_volumes(honeypot_name: str) -> List[Dict[str, Path]]:
         return []
 
 
-def get_file_view_command(action: str, file_path: Path) -> List[str]:
-    """Get the appropriate command for file viewing based on platform."""
-    is_windows = platform.system() == "Windows"
-
-    if action == "head":
-        if is_windows:
-            # Use PowerShell Get-Content with -Head parameter
-            return ["powershell", "-Command", f"Get-Content '{file_path}' -Head 50"]
-        else:
-            return ["head", "-50", str(file_path)]
-
-    elif action == "cat":
-        if is_windows:
-            return ["type", str(file_path)]
-        else:
-            return ["cat", str(file_path)]
-
-    elif action == "tail":
-        if is_windows:
-            return ["powershell", "-Command", f"Get-Content '{file_path}' -Tail 50"]
-        else:
-            return ["tail", "-f", str(file_path)]
-
-    elif action == "grep":
-        if is_windows:
-            return ["findstr", "/n", str(file_path)]
-        else:
-            return ["grep", "-n", "--color=always", str(file_path)]
+def search_in_file(file_path: Path, search_term: str, mode: str = "literal") -> int:
+    """Print the lines of a file matching `search_term`, as they are found; returns the match count."""
+    try:
+        from config import LOG_SEARCH_MAX_MATCHES
+    except ImportError:
+        LOG_SEARCH_MAX_MATCHES = 500
 
-    return []
+    try:
+        query = SearchQuery(search_term, mode)
+    except ValueError as exc:
+        print(f"{PREFIX_ERROR} {exc}")
+        return 0
+
+    print(f"🔍 Results for '{search_term}':")
+    print("=" * 50)
+    count = 0
+    for match in search_file(file_path, query, max_matches=LOG_SEARCH_MAX_MATCHES):
+        print(f"{COLOR_GREEN}{match.line}{COLOR_RESET}:{query.highlight(match.text, COLOR_RED, COLOR_RESET)}")
+        count += 1
+    if not count:
+        print(f"No matches found for '{search_term}'")
+    elif count >= LOG_SEARCH_MAX_MATCHES > 0:
+        print(f"{PREFIX_WARN} Stopped after {count} matches (LOG_SEARCH_MAX_MATCHES)")
+    print("=" * 50)
+    return count
 
 
 def view_file_content(file_path: Path) -> None:
@@ -148,7 +187,7 @@ def view_file_content(file_path: Path) -> None:
     size_mb = file_size / (1024 * 1024)
 
     choices = [
-        '📜 View entire file',
+        '📜 View file (pager)',
         '🔍 Search in file',
         '🔙 Back'
     ]
@@ -168,22 +207,8 @@ def view_file_content(file_path: Path) -> None:
                     print("📖 File is empty")
                     return  # Return immediately after showing empty file
 
-                if size_mb > 10:
-                    confirm = questionary.confirm(
-                        f"File is {size_mb:.1f}MB. Continue?"
-                    ).unsafe_ask()
-                    if not confirm:
-                        continue
-
-                print("📖 Full content:")
-                print("=" * 50)
-                cmd = get_file_view_command("cat", file_path)
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.stdout.strip():
-                    print(result.stdout.rstrip())
-                else:
-                    print("(File is empty or contains only whitespace)")
-                print("=" * 50)
+                # Paged through an mmap: only the shown pages are read, whatever the size
+                page_file(file_path)
                 return  # Return immediately after showing file content
 
             elif action.startswith('🔍'):
@@ -191,20 +216,15 @@ def view_file_content(file_path: Path) -> None:
                     print("🔍 Cannot search in empty file")
                     continue
 
+                mode = questionary.select(
+                    "Search mode:",
+                    choices=list(SEARCH_MODE_CHOICES)
+                ).unsafe_ask()
+                if not mode:
+                    continue
                 search_term = questionary.text("Search term:").unsafe_ask()
                 if search_term:
-                    print(f"🔍 Results for '{search_term}':")
-                    print("=" * 50)
-                    if platform.system() == "Windows":
-                        result = subprocess.run(["findstr", "/n", search_term, str(file_path)], capture_output=True, text=True)
-                    else:
-                        result = subprocess.run(["grep", "-n", "--color=always", search_term, str(file_path)], capture_output=True, text=True)
-
-                    if result.stdout.strip():
-                        print(result.stdout.rstrip())
-                    else:
-                        print(f"No matches found for '{search_term}'")
-                    print("=" * 50)
+                    search_in_file(file_path, search_term, SEARCH_MODE_CHOICES[mode])
                     # Continue loop to allow more searches
 
         except KeyboardInterrupt:
@@ -320,8 +340,8 @@ def browse_directory(path: Path, honeypot_name: str) -> bool:
     return browse_level(path, is_root=True)
 
 
-def logs_main(honeypot_name: str) -> None:
-    """Main logs command handler."""
+def logs_menu(honeypot_name: str) -> None:
+    """Interactive logs menu of one honeypot."""
     try:
         while True:  # Loop to allow returning to main menu
             # Get mounted volumes from Docker .env file
@@ -410,3 +430,70 @@ def logs_main(honeypot_name: str) -> None:
         return
     except Exception as exc:
         print(f"{PREFIX_ERROR} Failed to show logs: {exc}", file=sys.stderr)
+
+
+def log_sources(honeypot_ids: List[str], all_running: bool = False) -> List[LogSource]:
+    """
+    Running containers of the given honeypots (or of every running honeypot).
+
+    A honeypot with one container is labelled with its id, otherwise each
+    container is labelled `<id>/<service>`.
+    """
+    from core.state_cache import current_fleet
+
+    fleet = current_fleet()
+    if all_running:
+        honeypot_ids = fleet.running_projects()
+
+    sources: List[LogSource] = []
+    for honeypot_id in honeypot_ids:
+        containers = [c for c in fleet.containers(honeypot_id) if c.running]
+        if not containers:
+            print(f"{PREFIX_WARN} Container '{honeypot_id}' is not running", file=sys.stderr)
+            continue
+        for container in sorted(containers, key=lambda c: (c.service, c.name)):
+            label = honeypot_id if len(containers) == 1 else f"{honeypot_id}/{container.service or container.name}"
+            sources.append(LogSource(label=label, container=container.name))
+    return sources
+
+
+def follow_logs(honeypot_ids: List[str], all_running: bool = False, follow: bool = True, tail: int = 20) -> int:
+    """Merged, timestamp-ordered container logs of several honeypots (non-interactive)."""
+    sources = log_sources(honeypot_ids, all_running=all_running)
+    if not sources:
+        print(f"{PREFIX_ERROR} No running honeypot containers to show logs for", file=sys.stderr)
+        return 1
+    try:
+        stream_logs(sources, tail=tail, follow=follow)
+    except KeyboardInterrupt:
+        print(f"\n{PREFIX_OK} Stopped following logs", file=sys.stderr)
+    return 0
+
+
+def logs_main(args) -> int:
+    """Main entry point for the logs command."""
+    honeypot_ids = list(args.honeypot or [])
+    all_running = bool(getattr(args, "all", False))
+    follow = bool(getattr(args, "follow", False))
+
+    # One honeypot without -f/--all: the interactive menu
+    if len(honeypot_ids) == 1 and not (all_running or follow):
+        if questionary is None:
+            print(f"{PREFIX_ERROR} questionary library not installed. Run: pip install questionary", file=sys.stderr)
+            print("   Or stream the container logs: hpone logs <honeypot> -f", file=sys.stderr)
+            return 1
+        try:
+            logs_menu(honeypot_ids[0])
+        except Exception as exc:
+            print(f"{PREFIX_ERROR} Failed to show logs for '{honeypot_ids[0]}': {exc}", file=sys.stderr)
+            return 1
+        return 0
+
+    if not honeypot_ids and not all_running:
+        print(f"{PREFIX_ERROR} Specify honeypot name(s) or --all", file=sys.stderr)
+        return 2
+    try:
+        return follow_logs(honeypot_ids, all_running=all_running, follow=follow, tail=getattr(args, "tail", 20))
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} Failed to stream logs: {exc}", file=sys.stderr)
+        return 1
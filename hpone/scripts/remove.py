@@ -7,6 +7,7 @@ Functions to remove an imported honeypot.
 import shutil
 from pathlib import Path
 from core.constants import OUTPUT_DOCKER_DIR
+from core.compose_fleet import refresh_fleet_compose
 from core.utils import PREFIX_OK, PREFIX_ERROR
 
 
@@ -29,6 +30,8 @@ def remove_honeypot(honeypot_id: str) -> bool:
 
         # Remove honeypot directory
         shutil.rmtree(honeypot_dir)
+        # Drop it from the fleet file, which would otherwise point at the deleted folder
+        refresh_fleet_compose()
         print(f"{PREFIX_OK}: Removed honeypot {honeypot_id}")
         return True
 
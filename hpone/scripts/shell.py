@@ -0,0 +1,20 @@
+"""
+Shell helper for HPone.
+
+Command handler that opens an interactive shell in a running honeypot.
+"""
+
+import sys
+
+from core.docker import shell_honeypot
+from core.utils import PREFIX_ERROR
+
+
+def shell_main(args) -> int:
+    """Main entry point for the shell command."""
+    try:
+        shell_honeypot(args.honeypot)
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} Failed to open shell in '{args.honeypot}': {exc}", file=sys.stderr)
+        return 1
+    return 0
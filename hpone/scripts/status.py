@@ -6,18 +6,14 @@ Provides a consolidated status output that shows:
 - Ports table: HOST | CONTAINER | SERVICE (for running honeypots)
 """
 
-from typing import List
-import glob
-from pathlib import Path
+import sys
+from typing import Dict, List
 
-try:
-    import yaml  # type: ignore
-except ImportError:
-    yaml = None
-
-from core.constants import HONEYPOT_MANIFEST_DIR, OUTPUT_DOCKER_DIR
-from core.utils import _format_table, COLOR_GREEN, COLOR_RED, COLOR_CYAN
+from core.constants import OUTPUT_DOCKER_DIR
+from core.registry import get_registry
+from core.utils import _format_table, COLOR_GREEN, COLOR_RED, COLOR_CYAN, PREFIX_ERROR
 from core.docker import is_honeypot_running
+from core.state_cache import current_fleet
 from core.yaml import load_honeypot_yaml_by_filename
 from core.config import parse_ports
 
@@ -39,21 +35,11 @@ def _color(text: str, code: str) -> str:
 
 def _gather_services_status() -> List[List[str]]:
     rows: List[List[str]] = []
-    for path_str in sorted(glob.glob(str(HONEYPOT_MANIFEST_DIR / "*.yml"))):
-        p = Path(path_str)
-        honeypot_id = p.stem
-        enabled_flag = False
-        try:
-            if yaml is None:
-                data = {}
-            else:
-                with p.open("r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f) or {}
-            enabled_flag = bool(data.get("enabled") is True)
-        except Exception:
-            data = {}
+    fleet = current_fleet()
+    for honeypot_id, _path, data in get_registry().entries():
+        enabled_flag = bool(data.get("enabled") is True)
 
-        running_flag = is_honeypot_running(honeypot_id)
+        running_flag = is_honeypot_running(honeypot_id, fleet=fleet)
         name = str(data.get("name") or honeypot_id)
         enabled_str = _color("True", "32") if enabled_flag else _color("False", "31")
         status_str = _color("Up", "32") if running_flag else _color("Down", "31")
@@ -62,8 +48,26 @@ def _gather_services_status() -> List[List[str]]:
     return rows
 
 
-def _gather_ports_rows(running_honeypots: List[str]) -> List[List[str]]:
-    rows: List[List[str]] = []
+# Fields of a port record (`status --output json|ndjson|csv`)
+PORT_RECORD_FIELDS = ["host", "container", "honeypot", "description"]
+
+
+def _running_imported_honeypots() -> List[str]:
+    # Ports table: only for running honeypots present under docker/
+    running_honeypots: List[str] = []
+    if OUTPUT_DOCKER_DIR.exists():
+        fleet = current_fleet()
+        for d in sorted(OUTPUT_DOCKER_DIR.iterdir()):
+            if d.is_dir() and (d / "docker-compose.yml").exists():
+                honeypot_id = d.name
+                if is_honeypot_running(honeypot_id, fleet=fleet):
+                    running_honeypots.append(honeypot_id)
+    return running_honeypots
+
+
+def port_records(running_honeypots: List[str]) -> List[Dict[str, str]]:
+    """Port mappings of the given honeypots as plain records, sorted by host port."""
+    records: List[Dict[str, str]] = []
     for t in running_honeypots:
         try:
             _resolved_name, cfg = load_honeypot_yaml_by_filename(t)
@@ -79,36 +83,41 @@ def _gather_ports_rows(running_honeypots: List[str]) -> List[List[str]]:
             if ("/udp" not in lc) and ("/tcp" not in lc):
                 container_str = f"{container_str}/tcp"
 
-            # Separate service name and description
-            service_name = t
-            desc_text = description.strip() if description and description.strip() else "-"
-
-            rows.append([str(host), container_str, service_name, desc_text])
+            records.append({
+                "host": str(host),
+                "container": container_str,
+                "honeypot": t,
+                "description": description.strip() if description else "",
+            })
 
     # Sort by HOST numerically if possible
-    def _key_host(row):
+    def _key_host(record):
         try:
-            return int(str(row[0]).split("/")[0])
+            return int(str(record["host"]).split("/")[0])
         except Exception:
-            return str(row[0])
-    rows.sort(key=_key_host)
-    return rows
+            return str(record["host"])
+    records.sort(key=_key_host)
+    return records
+
 
-def show_status() -> None:
+def _gather_ports_rows(running_honeypots: List[str]) -> List[List[str]]:
+    # Separate service name and description
+    return [[r["host"], r["container"], r["honeypot"], r["description"] or "-"]
+            for r in port_records(running_honeypots)]
+
+def show_status(output: str = "table") -> None:
     # Services table
     # svc_rows = _gather_services_status()
     # svc_table = _format_table(["HONEYPOT", "ENABLED", "STATUS"], svc_rows, max_width=30)
     # if svc_table:
     #     print(svc_table)
 
-    # Ports table: only for running honeypots present under docker/
-    running_honeypots: List[str] = []
-    if OUTPUT_DOCKER_DIR.exists():
-        for d in sorted(OUTPUT_DOCKER_DIR.iterdir()):
-            if d.is_dir() and (d / "docker-compose.yml").exists():
-                honeypot_id = d.name
-                if is_honeypot_running(honeypot_id):
-                    running_honeypots.append(honeypot_id)
+    running_honeypots = _running_imported_honeypots()
+
+    if output != "table":
+        from core.output import write_records
+        write_records(port_records(running_honeypots), output, PORT_RECORD_FIELDS)
+        return
 
     port_rows = _gather_ports_rows(running_honeypots)
     if port_rows:
@@ -119,3 +128,13 @@ def show_status() -> None:
         port_table = _format_table(["HOST", "CONTAINER", "SERVICE", "DESCRIPTION"], colored_rows, max_width=STATUS_TABLE_MAX_WIDTH)
         if port_table:
             print(port_table)
+
+
+def status_main(args) -> int:
+    """Main entry point for the status command."""
+    try:
+        show_status(output=getattr(args, "output", "table"))
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} Failed to show status: {exc}", file=sys.stderr)
+        return 1
+    return 0
@@ -3,10 +3,14 @@ Up command implementation for HPone.
 
 This module handles starting honeypots with auto-import functionality,
 update capabilities, and interactive import prompts for missing honeypots.
+`up --all` starts honeypots in dependency order (`depends_on` in the YAML):
+each one as soon as its own dependencies are up, and never one whose
+dependency failed.
 """
 
 import sys
-from typing import List
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Set
 
 try:
     import questionary
@@ -17,7 +21,8 @@ except ImportError:
 from core import (
     up_honeypot,
     is_honeypot_enabled,
-    find_honeypot_yaml_path
+    find_honeypot_yaml_path,
+    get_honeypot_dependencies
 )
 
 from .list import (
@@ -30,7 +35,11 @@ from .import_cmd import (
     import_honeypot
 )
 
-from core.utils import PREFIX_OK, PREFIX_ERROR, PREFIX_WARN
+from core.compose_fleet import render_fleet_compose, run_fleet_action
+
+from core.utils import PREFIX_OK, PREFIX_ERROR, PREFIX_WARN, COLOR_RED, COLOR_RESET
+from core.log_runner import MultiSlotDisplay
+from core.jobs import check_cancelled
 
 # Import configuration
 try:
@@ -38,13 +47,242 @@ try:
 except ImportError:
     ALWAYS_IMPORT = True
 
+try:
+    from config import FLEET_MODE
+except ImportError:
+    FLEET_MODE = False
+
+
+def _resolve_dependency_id(dependency: str) -> str:
+    """Map a `depends_on` entry (file stem or `name`) to the honeypot ID."""
+    try:
+        return find_honeypot_yaml_path(dependency).stem
+    except FileNotFoundError:
+        return dependency
+
+
+def build_dependency_graph(honeypot_ids: List[str], warn_missing: bool = True) -> Dict[str, Set[str]]:
+    """
+    Build the dependency graph of honeypots from their `depends_on` key.
+
+    Dependencies outside `honeypot_ids` (disabled or not imported) are dropped,
+    so a honeypot never waits on something that is not going to run.
+
+    Args:
+        honeypot_ids: Honeypots to schedule
+        warn_missing: Whether to print a warning for dropped dependencies
+
+    Returns:
+        Mapping of honeypot ID to the IDs it depends on
+    """
+    wanted = set(honeypot_ids)
+    graph: Dict[str, Set[str]] = {}
+    for honeypot_id in honeypot_ids:
+        graph[honeypot_id] = set()
+        for dependency in get_honeypot_dependencies(honeypot_id):
+            dependency_id = _resolve_dependency_id(dependency)
+            if dependency_id in wanted:
+                graph[honeypot_id].add(dependency_id)
+            elif warn_missing:
+                print(f"{PREFIX_WARN} '{honeypot_id}' depends on '{dependency}', which is not enabled; starting without it")
+    return graph
+
+
+def _find_cycle(graph: Dict[str, Set[str]]) -> List[str]:
+    """Return one dependency cycle (first node repeated at the end) from an unresolvable graph."""
+    path: List[str] = []
+    seen: Dict[str, int] = {}
+    node = min(graph)
+    while node not in seen:
+        seen[node] = len(path)
+        path.append(node)
+        # Every unresolved node still depends on another unresolved node
+        node = min(dep for dep in graph[node] if dep in graph)
+    return path[seen[node]:] + [node]
+
+
+def topological_layers(graph: Dict[str, Set[str]]) -> List[List[str]]:
+    """
+    Group a dependency graph into start layers.
+
+    Every honeypot only depends on honeypots from earlier layers, so all
+    honeypots of one layer can be started at the same time.
+
+    Args:
+        graph: Mapping of honeypot ID to the IDs it depends on
+
+    Returns:
+        List of layers, each a sorted list of honeypot IDs
+
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    remaining = dict(graph)
+    done: Set[str] = set()
+    layers: List[List[str]] = []
+    while remaining:
+        layer = sorted(h for h, deps in remaining.items() if deps <= done)
+        if not layer:
+            raise ValueError(f"Dependency cycle: {' -> '.join(_find_cycle(remaining))}")
+        for honeypot_id in layer:
+            del remaining[honeypot_id]
+        done.update(layer)
+        layers.append(layer)
+    return layers
+
+
+def run_in_dependency_order(graph: Dict[str, Set[str]], jobs: int,
+                            start: Callable[[str], List[str]]) -> List[str]:
+    """
+    Call `start` for every honeypot as soon as its own dependencies are done.
+
+    A honeypot does not wait for unrelated ones (e.g. the rest of a layer);
+    with `jobs` > 1 up to `jobs` honeypots run at once on a pool, otherwise
+    they run one after another. `start` returns the failure messages of a
+    honeypot; dependents of a failed (or skipped) honeypot are skipped.
+
+    Returns:
+        Failure messages, in the order they happened
+
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    topological_layers(graph)  # Reject cycles before anything starts
+
+    waiting = {honeypot_id: set(deps) for honeypot_id, deps in graph.items()}
+    dependents: Dict[str, Set[str]] = {honeypot_id: set() for honeypot_id in graph}
+    for honeypot_id, deps in graph.items():
+        for dependency in deps:
+            dependents[dependency].add(honeypot_id)
+    failed: Set[str] = set()
+    messages: List[str] = []
+    ready = sorted(honeypot_id for honeypot_id, deps in waiting.items() if not deps)
+
+    def finish(honeypot_id: str, errors: List[str]) -> None:
+        if errors:
+            failed.add(honeypot_id)
+            messages.extend(errors)
+        for dependent in sorted(dependents[honeypot_id]):
+            waiting[dependent].discard(honeypot_id)
+            if waiting[dependent]:
+                continue
+            blocked = sorted(graph[dependent] & failed)
+            if blocked:
+                finish(dependent, [f"Skipped '{dependent}': dependency '{blocked[0]}' failed"])
+            else:
+                ready.append(dependent)
+
+    if jobs <= 1:
+        while ready:
+            honeypot_id = ready.pop(0)
+            finish(honeypot_id, start(honeypot_id))
+        return messages
+
+    pool = ThreadPoolExecutor(max_workers=jobs)
+    running: Dict[Future, str] = {}
+    try:
+        while ready or running:
+            while ready:
+                honeypot_id = ready.pop(0)
+                running[pool.submit(start, honeypot_id)] = honeypot_id
+            finished, _pending = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                finish(running.pop(future), future.result())
+    finally:
+        # Interrupted (Ctrl+C, cancelled daemon job): do not start the queued honeypots
+        pool.shutdown(wait=True, cancel_futures=True)
+    return messages
+
+
+def _up_graph(graph: Dict[str, Set[str]], jobs: int, auto_import: bool) -> List[str]:
+    """
+    Import (optionally) and start honeypots in dependency order.
+
+    With `jobs` > 1 they run concurrently and each gets one live line in a
+    shared MultiSlotDisplay. A honeypot that failed to import is not started.
+    Returns the failure messages for the caller to report.
+    """
+    display = MultiSlotDisplay() if jobs > 1 else None
+
+    def _fail(honeypot_id: str) -> None:
+        # Failures before docker compose ran never reached the display
+        if display is not None and display.is_active(honeypot_id):
+            display.finish(honeypot_id, f"{COLOR_RED}[FAIL]{COLOR_RESET} {honeypot_id} {COLOR_RED}ERR{COLOR_RESET}")
+
+    def _job(honeypot_id: str) -> List[str]:
+        check_cancelled()
+        if display is not None:
+            display.add(honeypot_id)
+        if auto_import:
+            if display is not None:
+                display.update(honeypot_id, "importing ...")
+            try:
+                import_honeypot(honeypot_id, force=True)
+            except Exception as exc:
+                _fail(honeypot_id)
+                return [f"Failed to auto-import '{honeypot_id}': {exc}"]
+        try:
+            up_honeypot(honeypot_id, force=False, display=display)
+        except Exception as exc:
+            _fail(honeypot_id)
+            return [f"Failed to start '{honeypot_id}': {exc}"]
+        if display is not None:
+            display.discard(honeypot_id)
+        return []
+
+    if display is None:
+        return run_in_dependency_order(graph, jobs, _job)
+    with display.capture_stdout():
+        messages = run_in_dependency_order(graph, jobs, _job)
+    display.close()
+    return messages
+
+
+def _ordered(graph: Dict[str, Set[str]]) -> List[str]:
+    """Flatten the dependency layers into one start order."""
+    return [honeypot_id for layer in topological_layers(graph) for honeypot_id in layer]
 
-def up_all_honeypots(update: bool = False) -> int:
+
+def _up_fleet(honeypot_ids: List[str], graph: Dict[str, Set[str]]) -> int:
+    """
+    Start imported honeypots as one compose project (FLEET_MODE).
+
+    The per-honeypot compose files are merged into docker/docker-compose.fleet.yml
+    and started with a single `docker compose up -d`, so compose resolves,
+    pulls and builds the whole fleet at once. `depends_on` between honeypots
+    becomes service-level depends_on.
+
+    Returns:
+        Exit code (0 for success, 1 for error)
+    """
+    if not honeypot_ids:
+        return 0
+
+    try:
+        from scripts.error_handlers import auto_fix_permissions
+        for honeypot_id in honeypot_ids:
+            auto_fix_permissions(honeypot_id)
+    except Exception:
+        # Continue if permission fixing fails
+        pass
+
+    try:
+        render_fleet_compose(honeypot_ids, graph)
+        print(f"Starting {len(honeypot_ids)} honeypots as one compose project...")
+        run_fleet_action("up")
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} Failed to start fleet: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def up_all_honeypots(update: bool = False, jobs: int = 1) -> int:
     """
     Start all enabled honeypots with optional auto-import and update functionality.
 
     Args:
         update: Whether to update imported honeypots before starting
+        jobs: Number of honeypots to import/start concurrently (1 = sequential)
 
     Returns:
         Exit code (0 for success, 1 for error)
@@ -58,22 +296,27 @@ def up_all_honeypots(update: bool = False) -> int:
                 print("No enabled honeypots.")
                 return 0
 
-            print(f"Auto-importing {len(honeypot_ids)} enabled honeypots...")
-            for t in honeypot_ids:
-                try:
-                    dest = import_honeypot(t, force=True)
-                    # print(f"{PREFIX_OK}: Auto-imported '{t}'")
-                except Exception as exc:
-                    print(f"{PREFIX_ERROR} Failed to auto-import '{t}': {exc}", file=sys.stderr)
-                    continue
-
-            print(f"Starting {len(honeypot_ids)} honeypots...")
-            for t in honeypot_ids:
-                try:
-                    up_honeypot(t, force=False)
-                except Exception as exc:
-                    print(f"{PREFIX_ERROR} Failed to start '{t}': {exc}", file=sys.stderr)
-                    continue
+            graph = build_dependency_graph(honeypot_ids)
+            if FLEET_MODE:
+                print(f"Auto-importing {len(honeypot_ids)} enabled honeypots...")
+                imported_ids: List[str] = []
+                failed: Set[str] = set()
+                for t in _ordered(graph):
+                    blocked = sorted(graph[t] & failed)
+                    try:
+                        if blocked:
+                            raise RuntimeError(f"dependency '{blocked[0]}' failed")
+                        import_honeypot(t, force=True)
+                        imported_ids.append(t)
+                    except Exception as exc:
+                        failed.add(t)
+                        print(f"{PREFIX_ERROR} Failed to auto-import '{t}': {exc}", file=sys.stderr)
+                code = _up_fleet(imported_ids, graph)
+                return 1 if failed else code
+
+            jobs_note = f" ({jobs} jobs)" if jobs > 1 else ""
+            print(f"Importing and starting {len(honeypot_ids)} honeypots{jobs_note}...")
+            failures = _up_graph(graph, jobs, auto_import=True)
         else:
             # Original logic for ALWAYS_IMPORT=false
             # If --update, update all imported honeypots first
@@ -93,10 +336,15 @@ def up_all_honeypots(update: bool = False) -> int:
             honeypot_ids = list_enabled_honeypot_ids()
             if not honeypot_ids:
                 print("No enabled and imported honeypots.")
-            for t in honeypot_ids:
-                up_honeypot(t, force=False)
+                return 0
+            graph = build_dependency_graph(honeypot_ids)
+            if FLEET_MODE:
+                return _up_fleet(_ordered(graph), graph)
+            failures = _up_graph(graph, jobs, auto_import=False)
 
-        return 0
+        for msg in failures:
+            print(f"{PREFIX_ERROR} {msg}", file=sys.stderr)
+        return 1 if failures else 0
 
     except Exception as exc:
         print(f"{PREFIX_ERROR} Failed to start all honeypots: {exc}", file=sys.stderr)
@@ -206,7 +454,8 @@ def up_main(args) -> int:
     try:
         if getattr(args, "all", False):
             return up_all_honeypots(
-                update=getattr(args, "update", False)
+                update=getattr(args, "update", False),
+                jobs=getattr(args, "jobs", 1) or 1
             )
         else:
             if not args.honeypot:
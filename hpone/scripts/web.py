@@ -10,11 +10,15 @@ from pathlib import Path
 from core.constants import PROJECT_ROOT
 from core.utils import PREFIX_ERROR
 
-def web_main() -> int:
+def web_main(args=None) -> int:
     web_app = PROJECT_ROOT / "hpone" / "web" / "app.py"
     if not web_app.exists():
         print(f"{PREFIX_ERROR} HPone Web app not found: {web_app}")
         return 1
 
     cmd = [sys.executable, str(web_app)]
-    return subprocess.call(cmd)
+    try:
+        return subprocess.call(cmd)
+    except Exception as exc:
+        print(f"{PREFIX_ERROR} Failed to start HPone Web: {exc}", file=sys.stderr)
+        return 1
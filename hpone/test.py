@@ -41,13 +41,34 @@ def run_import_self_test() -> bool:
         "set_honeypot_enabled",
         "is_honeypot_enabled",
         "get_custom_template_dir",
+        "get_honeypot_dependencies",
         "is_honeypot_running",
         "run_compose_action",
         "up_honeypot",
         "down_honeypot",
+        "wait_for_honeypot_stopped",
         "shell_honeypot",
         "cleanup_global_images",
         "cleanup_global_volumes",
+        "ManifestRegistry",
+        "get_registry",
+        "FleetState",
+        "ContainerState",
+        "DockerClient",
+        "DockerAPIError",
+        "get_client",
+        "StateCache",
+        "start_state_cache",
+        "get_state_cache",
+        "current_fleet",
+        "ComposeBackend",
+        "get_compose_backend",
+        "render_fleet_compose",
+        "run_fleet_action",
+        "fleet_services",
+        "fleet_honeypot_ids",
+        "fleet_compose_options",
+        "refresh_fleet_compose",
         "parse_ports",
         "parse_ports_with_description",
         "parse_volumes",
@@ -56,10 +77,35 @@ def run_import_self_test() -> bool:
         "generate_env_file",
         "ensure_volume_directories",
         "rewrite_compose_with_env",
+        "apply_compose_env",
+        "render_env_file",
+        "render_compose",
+        "render_compose_file",
+        "cached_preflight",
+        "store_preflight",
+        "clear_preflight",
+        "daemon_call",
+        "daemon_running",
+        "DaemonUnavailable",
+        "DaemonError",
+        "CancelToken",
+        "JobCancelled",
+        "check_cancelled",
+        "run_process",
+        "LogSource",
+        "stream_logs",
+        "MappedFile",
+        "page_file",
+        "SearchQuery",
+        "search_file",
+        "write_records",
+        "complete",
+        "load_completion_table",
         "to_var_prefix",
         "_format_table",
         "run_with_ephemeral_logs",
-        "run_docker_compose_action",
+        "LineFilter",
+        "get_line_filter",
     ]
     for name in core_functions:
         expr = f"from core import {name}"
@@ -75,12 +121,20 @@ def run_import_self_test() -> bool:
         "list_all_enabled_honeypot_ids",
         "list_imported_honeypot_ids",
         "resolve_honeypot_dir_id",
+        "iter_honeypot_records",
+        "list_main",
         "inspect_honeypot",
+        "honeypot_record",
+        "inspect_main",
         "import_honeypot",
+        "format_import_stats",
+        "import_main",
+        "update_main",
         "remove_honeypot",
         "ensure_destination_dir",
         "find_template_dir",
         "copy_template_to_destination",
+        "materialize_file",
         "remove_honeypot_data",
         "check_all_dependencies",
         "check_python_dependencies",
@@ -88,19 +142,38 @@ def run_import_self_test() -> bool:
         "print_dependency_status",
         "get_installation_instructions",
         "require_dependencies",
+        "check_main",
         "handle_yaml_error",
         "handle_docker_error",
         "safe_execute",
         "print_error_with_suggestion",
         "check_file_permissions",
         "show_status",
+        "port_records",
+        "status_main",
         "logs_main",
+        "follow_logs",
+        "search_in_file",
+        "log_sources",
         "clean_main",
         "clean_all_honeypots",
         "clean_single_honeypot",
         "up_main",
         "up_all_honeypots",
         "up_single_honeypot",
+        "build_dependency_graph",
+        "topological_layers",
+        "run_in_dependency_order",
+        "down_main",
+        "down_all_honeypots",
+        "teardown_honeypots",
+        "teardown_layers",
+        "teardown_all",
+        "enable_main",
+        "disable_main",
+        "shell_main",
+        "HponeDaemon",
+        "daemon_main",
     ]
     for name in scripts_functions:
         expr = f"from scripts import {name}"
@@ -115,6 +188,7 @@ def run_import_self_test() -> bool:
         "TEMPLATE_DOCKER_DIR",
         "OUTPUT_DOCKER_DIR",
         "DATA_DIR",
+        "DAEMON_SOCKET",
     ]
     for const_name in constant_names:
         expr = f"from core.constants import {const_name}"
@@ -156,3 +230,144 @@ def run_import_self_test() -> bool:
         print(f"{PREFIX_ERROR} {fail_count} import(s) failed. Check module structure.")
 
     return fail_count == 0
+
+
+def run_permission_self_test() -> bool:
+    """Check that fixing permissions of an imported honeypot leaves hardlinked templates alone.
+
+    Materializes a read-only template file into a scratch docker/<id> tree the
+    way `import` does, runs the permission fixer of `up` over that tree and
+    verifies that the template keeps its mode.
+
+    Returns True if the check passes (or hardlinks are unavailable), False otherwise.
+    """
+    import os
+    import stat
+    import tempfile
+    from pathlib import Path
+
+    from scripts.error_handlers import _fix_tree
+    from scripts.file_ops import materialize_file
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = Path(tmp) / "template" / "Dockerfile"
+        template.parent.mkdir()
+        template.write_text("FROM scratch\n")
+        os.chmod(template, 0o444)
+        output = Path(tmp) / "docker" / "example"
+        output.mkdir(parents=True)
+
+        method, _written = materialize_file(template, output / "Dockerfile", read_only=True)
+        if method != "hardlink":
+            print(f"Permission self-test: skipped (template was {method}ed, not hardlinked)")
+            return True
+
+        _fix_tree(output, 0o2775, 0o664, None, {}, {})
+        mode = stat.S_IMODE(template.stat().st_mode)
+
+    if mode != 0o444:
+        print(f"{PREFIX_ERROR} Permission self-test: fixing docker/ changed a hardlinked template to {mode:o}")
+        return False
+    print("Permission self-test: hardlinked templates keep their mode")
+    return True
+
+
+def run_docker_api_self_test() -> bool:
+    """Exercise DockerClient against the fake daemon of core.docker_fake.
+
+    Checks that plain requests share one keep-alive connection, that
+    multiplexed log frames split across HTTP chunks are demultiplexed into
+    stdout/stderr, that error statuses raise DockerAPIError and that a dead
+    socket raises one of API_ERRORS, so FleetState.snapshot falls back to
+    the CLI instead of failing.
+
+    Returns True if all checks pass, False otherwise.
+    """
+    import os
+    import socket
+    import tempfile
+
+    from core.docker_api import API_ERRORS, STREAM_STDERR, STREAM_STDOUT, DockerAPIError, DockerClient
+    from core.docker_fake import FakeDockerDaemon
+    from core.fleet import FleetState
+
+    failures = []
+
+    def _expect(condition: bool, message: str) -> None:
+        if not condition:
+            failures.append(message)
+
+    containers = [{
+        "Id": "c0ffee",
+        "Names": ["/cowrie-cowrie-1"],
+        "State": "running",
+        "Status": "Up 1 minute",
+        "Labels": {"hpone": "true", "com.docker.compose.project": "cowrie",
+                   "com.docker.compose.service": "cowrie"},
+    }]
+    logs = {"cowrie-cowrie-1": [(STREAM_STDOUT, b"login attempt\n"), (STREAM_STDERR, b"warning\n"),
+                                (STREAM_STDOUT, b"session closed\n")]}
+    saved_host = os.environ.get("DOCKER_HOST")
+    try:
+        with FakeDockerDaemon(containers=containers, logs=logs, chunk_size=3) as fake:
+            client = DockerClient(fake.socket_path)
+            try:
+                _expect(client.ping(), "ping did not answer OK")
+                _expect(len(client.containers(all=True)) == 1, "containers() did not list the container")
+                _expect(client.inspect_container("cowrie-cowrie-1").get("Id") == "c0ffee",
+                        "inspect_container() returned the wrong container")
+                _expect(fake.connections == 1,
+                        f"plain requests used {fake.connections} connections instead of one")
+
+                frames = list(client.logs("cowrie-cowrie-1"))
+                _expect(frames == logs["cowrie-cowrie-1"], f"logs() demultiplexed {frames!r}")
+                frames = list(client.logs("cowrie-cowrie-1", tail=1))
+                _expect(frames == [(STREAM_STDOUT, b"session closed\n")], f"logs(tail=1) returned {frames!r}")
+
+                try:
+                    client.inspect_container("missing")
+                    failures.append("inspect_container() of a missing container did not raise")
+                except DockerAPIError as exc:
+                    _expect(exc.status == 404, f"missing container raised status {exc.status}")
+                _expect(client.ping(), "connection was not usable after an error response")
+
+                os.environ["DOCKER_HOST"] = f"unix://{fake.socket_path}"
+                snapshot = FleetState.snapshot()
+                _expect(snapshot.available and snapshot.is_running("cowrie"),
+                        "FleetState.snapshot() did not read the fake daemon")
+            finally:
+                client.close()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # Stale socket left behind by a daemon that is gone
+            stale = os.path.join(tmp, "docker.sock")
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.bind(stale)
+            sock.close()
+            client = DockerClient(stale, timeout=2)
+            try:
+                client.containers()
+                failures.append("request to a dead socket did not raise")
+            except API_ERRORS:
+                pass
+            finally:
+                client.close()
+            _expect(not client.ping(), "ping() of a dead socket did not return False")
+
+            os.environ["DOCKER_HOST"] = f"unix://{stale}"
+            try:
+                FleetState.snapshot(timeout=5)
+            except API_ERRORS as exc:
+                failures.append(f"FleetState.snapshot() did not fall back to the CLI: {exc}")
+    finally:
+        if saved_host is None:
+            os.environ.pop("DOCKER_HOST", None)
+        else:
+            os.environ["DOCKER_HOST"] = saved_host
+
+    for message in failures:
+        print(f"{PREFIX_ERROR} Docker API self-test: {message}")
+    if failures:
+        return False
+    print("Docker API self-test: connection reuse, log framing and CLI fallback work")
+    return True
@@ -5,7 +5,6 @@ from pathlib import Path
 from typing import Any, Dict, List, Tuple
 import subprocess
 
-import yaml
 
 from core.constants import HONEYPOT_MANIFEST_DIR, OUTPUT_DOCKER_DIR
 from core.yaml import (
@@ -15,7 +14,12 @@ from core.yaml import (
     is_honeypot_enabled,
 )
 from core.config import parse_ports, parse_volumes
+from core.registry import get_registry
+from core import yaml_io
 from core.docker import is_honeypot_running, up_honeypot, down_honeypot
+from core.state_cache import start_state_cache, current_fleet
+from core.docker_api import get_client, API_ERRORS, STREAM_STDERR
+from core.daemon_client import DaemonError, DaemonUnavailable, daemon_call
 from scripts.import_cmd import import_honeypot
 
 try:
@@ -39,19 +43,19 @@ class HoneypotSummary:
 class HoneypotNotFound(Exception):
     pass
 
-def _all_yaml_paths() -> List[Path]:
-    return sorted(HONEYPOT_MANIFEST_DIR.glob("*.yml"))
-
 def list_honeypots() -> List[HoneypotSummary]:
+    try:
+        return [_summary_from_daemon(state) for state in daemon_call("honeypots")]
+    except DaemonUnavailable:
+        pass
     honeypots: List[HoneypotSummary] = []
-    for yaml_path in _all_yaml_paths():
-        data = _read_yaml_safe(yaml_path)
-        honeypot_id = yaml_path.stem
+    fleet = _fleet()
+    for honeypot_id, yaml_path, data in get_registry().entries():
         name = str(data.get("name") or honeypot_id)
         description = str(data.get("description") or "")
         enabled = bool(data.get("enabled") is True)
         imported = (OUTPUT_DOCKER_DIR / honeypot_id).exists()
-        running = is_honeypot_running(honeypot_id)
+        running = is_honeypot_running(honeypot_id, fleet=fleet)
         ports = _safe_ports(data)
         volumes = _safe_volumes(data)
         honeypots.append(
@@ -80,7 +84,7 @@ def get_honeypot_detail(honeypot_id: str) -> Dict[str, Any]:
         "config": config,
         "enabled": is_honeypot_enabled(honeypot_id),
         "imported": imported,
-        "running": is_honeypot_running(honeypot_id),
+        "running": is_honeypot_running(honeypot_id, fleet=_fleet()),
         "ports": _safe_ports(config),
         "volumes": _safe_volumes(config),
         "yaml_path": yaml_path,
@@ -94,6 +98,8 @@ def enable_honeypot(honeypot_id: str, enabled: bool) -> None:
 
 def start_honeypot(honeypot_id: str, force: bool = False) -> None:
     _ensure_exists(honeypot_id)
+    if _call_daemon("up", honeypot_id=honeypot_id, force=force):
+        return
     if ALWAYS_IMPORT:
         import_honeypot(honeypot_id, force=True)
     up_honeypot(honeypot_id, force=force)
@@ -101,6 +107,8 @@ def start_honeypot(honeypot_id: str, force: bool = False) -> None:
 
 def stop_honeypot(honeypot_id: str) -> None:
     _ensure_exists(honeypot_id)
+    if _call_daemon("down", honeypot_id=honeypot_id):
+        return
     down_honeypot(honeypot_id)
 
 
@@ -113,10 +121,24 @@ def write_yaml_text(honeypot_id: str, content: str) -> None:
     yaml_path = find_honeypot_yaml_path(honeypot_id)
     _validate_yaml_content(content)
     yaml_path.write_text(content, encoding="utf-8")
+    get_registry().invalidate(yaml_path)
 
 
 def get_logs(honeypot_id: str, lines: int = 200) -> str:
     _ensure_exists(honeypot_id)
+    client = get_client()
+    if client is not None:
+        try:
+            stdout: List[bytes] = []
+            stderr: List[bytes] = []
+            for stream_id, payload in client.logs(honeypot_id, tail=lines):
+                (stderr if stream_id == STREAM_STDERR else stdout).append(payload)
+            output = b"".join(stdout).decode("utf-8", "replace")
+            if stderr:
+                output += "\n" + b"".join(stderr).decode("utf-8", "replace")
+            return output.strip()
+        except API_ERRORS:
+            pass  # Fall back to the docker CLI
     cmd = ["docker", "logs", "--tail", str(lines), honeypot_id]
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, check=False)
@@ -128,6 +150,38 @@ def get_logs(honeypot_id: str, lines: int = 200) -> str:
         return "Docker is not installed or not in PATH."
 
 
+def _call_daemon(method: str, **params: Any) -> bool:
+    # Route state changes through a running `hpone daemon` so they are serialized
+    # with the CLI; False means no daemon and the caller runs them in-process
+    try:
+        daemon_call(method, params, timeout=None)
+    except DaemonUnavailable:
+        return False
+    except DaemonError as exc:
+        raise RuntimeError(str(exc)) from exc
+    return True
+
+
+def _summary_from_daemon(state: Dict[str, Any]) -> HoneypotSummary:
+    return HoneypotSummary(
+        honeypot_id=state["honeypot_id"],
+        name=state["name"],
+        description=state["description"],
+        enabled=state["enabled"],
+        imported=state["imported"],
+        running=state["running"],
+        ports=[tuple(port) for port in state["ports"]],
+        volumes=[tuple(volume) for volume in state["volumes"]],
+        yaml_path=Path(state["yaml_path"]),
+    )
+
+
+def _fleet():
+    # The web process is long-lived: keep container state current from docker events
+    start_state_cache()
+    return current_fleet()
+
+
 def _ensure_exists(honeypot_id: str) -> None:
     try:
         find_honeypot_yaml_path(honeypot_id)
@@ -135,18 +189,10 @@ def _ensure_exists(honeypot_id: str) -> None:
         raise HoneypotNotFound(str(exc)) from exc
 
 
-def _read_yaml_safe(path: Path) -> Dict[str, Any]:
-    try:
-        with path.open("r", encoding="utf-8") as handle:
-            return yaml.safe_load(handle) or {}
-    except Exception:
-        return {}
-
-
 def _validate_yaml_content(content: str) -> None:
     try:
-        yaml.safe_load(content)
-    except yaml.YAMLError as exc:
+        yaml_io.safe_load(content)
+    except yaml_io.YAMLError as exc:
         raise ValueError(f"Invalid YAML: {exc}") from exc
 
 